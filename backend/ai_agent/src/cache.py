@@ -0,0 +1,107 @@
+import os
+import threading
+import tempfile
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache bounded by the total size of its values in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value, size: int):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache:
+    """Directory-backed byte store that survives restarts (one file per key)."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.bin")
+
+    def get(self, key: str):
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Disk cache read error: {e}")
+            return None
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Disk cache delete error: {e}")
+
+    def put(self, key: str, value: bytes, mtime: float = None):
+        """Store value under key; mtime, if given, is recorded as the file's modification time."""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(value)
+            if mtime is not None:
+                os.utime(tmp_path, (mtime, mtime))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Disk cache write error: {e}")
+
+    def entries(self):
+        """(path, os.stat_result) of every stored entry."""
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".bin"):
+                    try:
+                        yield entry.path, entry.stat()
+                    except FileNotFoundError:
+                        pass
+
+    @staticmethod
+    def remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Disk cache delete error: {e}")
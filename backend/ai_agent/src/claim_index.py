@@ -0,0 +1,166 @@
+import re
+import time
+import zlib
+import threading
+import unicodedata
+import numpy as np
+
+# Mersenne prime for the universal hash family; keeps a * x + b inside uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+# Words that flip a claim's meaning; "t" is what normalization leaves of "isn't", "didn't" ...
+_NEGATIONS = frozenset("not no never none nobody nothing nowhere neither nor without cannot t false fake".split())
+
+
+def normalize_claim(text: str) -> str:
+    """Fold case, Unicode forms, punctuation and whitespace so trivially different phrasings compare equal."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def claim_polarity(text: str) -> tuple:
+    """(number of negation words, numbers mentioned) of a claim, for the near-duplicate veto."""
+    tokens = normalize_claim(text).split()
+    negations = sum(token in _NEGATIONS for token in tokens)
+    numbers = tuple(sorted(token for token in tokens if any(char.isdigit() for char in token)))
+    return negations, numbers
+
+
+def contradicts(claim: str, other: str) -> bool:
+    """True when two similarly worded claims differ in negation or in the numbers they state.
+
+    Character shingles score "prices will rise" and "prices will not rise", or
+    "a 5% rise" and "a 50% rise", as near-duplicates. Everything else, from
+    paraphrases to swapped roles, is left to the workflow's re-check of the
+    earlier verdict against the new claim.
+    """
+    (negations, numbers), (other_negations, other_numbers) = claim_polarity(claim), claim_polarity(other)
+    return negations % 2 != other_negations % 2 or numbers != other_numbers
+
+
+class ClaimIndex:
+    """Near-duplicate index over verified claims: character shingles, MinHash signatures and LSH banding.
+
+    Signatures live in one (N, num_perm) uint32 array; each LSH band maps a hash
+    of its slice of the signature to the rows sharing it, so a lookup only
+    compares the query against rows that collide in at least one band.
+    Removed and expired rows are tombstoned and dropped by compaction, which
+    runs when the array is full, before it grows. Beyond max_entries live rows
+    the soonest to expire are dropped too.
+    """
+
+    def __init__(
+        self, num_perm: int = 128, bands: int = 32, shingle_size: int = 5, seed: int = 1, max_entries: int = 100_000
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+
+        # Fixed seed: signatures must stay comparable across restarts
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._size = 0
+        self._keys = []
+        self._expires = np.empty(0, dtype=np.float64)
+        self._positions = {}
+        self._buckets = [dict() for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        text = normalize_claim(text)
+        k = self.shingle_size
+        if len(text) <= k:
+            grams = {text}
+        else:
+            grams = {text[i:i + k] for i in range(len(text) - k + 1)}
+        return np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a claim, as a (num_perm,) uint32 array."""
+        shingles = self._shingles(text)
+        # (num_perm, 1) * (1, S) -> min over shingles for every permutation at once
+        hashes = (self._a[:, None] * (shingles[None, :] & _PRIME) + self._b[:, None]) % _PRIME
+        return hashes.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> list:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, key: str, signature: np.ndarray, expires_at: float = float("inf")):
+        """Index a signature under key until expires_at (a time.time() value); re-adding a key replaces it."""
+        with self._lock:
+            self._remove(key)
+            if self._size == len(self._signatures):
+                self._compact()
+            if self._size == len(self._signatures):
+                capacity = max(64, 2 * self._size)
+                grown = np.empty((capacity, self.num_perm), dtype=np.uint32)
+                grown[:self._size] = self._signatures[:self._size]
+                self._signatures = grown
+                self._expires = np.resize(self._expires, capacity)
+            row = self._size
+            self._signatures[row] = signature
+            self._expires[row] = expires_at
+            self._size += 1
+            self._keys.append(key)
+            self._positions[key] = row
+            for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+                bucket.setdefault(band_key, []).append(row)
+
+    def _remove(self, key: str):
+        # Rows are tombstoned; lookups skip them until _compact drops them
+        row = self._positions.pop(key, None)
+        if row is not None:
+            self._keys[row] = None
+
+    def _compact(self):
+        """Drop tombstoned and expired rows, then the soonest to expire beyond max_entries, and rebuild the bands."""
+        live = np.fromiter(
+            (row for row in range(self._size) if self._keys[row] is not None), dtype=np.int64
+        )
+        live = live[self._expires[live] > time.time()]
+        if live.size > self.max_entries:
+            live = np.sort(live[np.argsort(-self._expires[live], kind="stable")[:self.max_entries]])
+        if live.size == self._size:
+            return
+
+        keys = [self._keys[row] for row in live]
+        self._signatures = self._signatures[live]
+        self._expires = self._expires[live]
+        self._size = len(keys)
+        self._keys = keys
+        self._positions = {key: row for row, key in enumerate(keys)}
+        self._buckets = [dict() for _ in range(self.bands)]
+        for row in range(self._size):
+            for bucket, band_key in zip(self._buckets, self._band_keys(self._signatures[row])):
+                bucket.setdefault(band_key, []).append(row)
+
+    def remove(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def query(self, signature: np.ndarray, threshold: float, limit: int = 5) -> list:
+        """Return up to `limit` (key, estimated Jaccard similarity) pairs at or above threshold, best first."""
+        with self._lock:
+            candidates = set()
+            for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(bucket.get(band_key, ()))
+            rows = np.fromiter((row for row in candidates if self._keys[row] is not None), dtype=np.int64)
+            rows = rows[self._expires[rows] > time.time()]
+            if rows.size == 0:
+                return []
+            similarity = (self._signatures[rows] == signature).mean(axis=1)
+            keys = [self._keys[row] for row in rows]
+
+        order = np.argsort(-similarity)[:limit]
+        return [(keys[i], float(similarity[i])) for i in order if similarity[i] >= threshold]
@@ -0,0 +1,70 @@
+import time
+import asyncio
+from contextvars import ContextVar
+from contextlib import asynccontextmanager
+from typing import Optional
+from .upstream import UpstreamUnavailable
+from .metrics import upstream_rejections
+
+
+class Deadline:
+    """Point in time by which a verification must have answered."""
+
+    def __init__(self, seconds: float, expires_at: float = None):
+        self.seconds = seconds
+        self.expires_at = expires_at if expires_at is not None else time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def shortened(self, seconds: float) -> "Deadline":
+        """The same deadline, `seconds` earlier: the budget of a stage that must leave time for later ones."""
+        return Deadline(self.seconds, self.expires_at - seconds)
+
+
+class DeadlineExceeded(UpstreamUnavailable):
+    """Raised instead of (or while) calling an upstream once the request's time budget is spent.
+
+    An UpstreamUnavailable, so tools that skip a rejected upstream skip it the same way.
+    """
+
+    def __init__(self, upstream: str):
+        super().__init__(upstream, "deadline exceeded")
+
+
+# Budget of the graph stage running in this context (set per node by the workflow); None means no deadline
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+def remaining(default: float = None) -> Optional[float]:
+    """Seconds left in the current stage's budget, capped at `default`; `default` when there is no deadline."""
+    deadline = current_deadline.get()
+    if deadline is None:
+        return default
+    return deadline.remaining() if default is None else min(default, deadline.remaining())
+
+
+@asynccontextmanager
+async def budget(upstream: str, timeout: float = None):
+    """Bound the enclosed call by `timeout` and by the current deadline, whichever ends first.
+
+    Raises DeadlineExceeded without calling out when the budget is already
+    spent, and when the deadline (not `timeout`) cuts the call short. Place it
+    outside the circuit breaker: a cancelled call says nothing about the upstream.
+    """
+    limit = remaining(timeout)
+    deadline_bound = current_deadline.get() is not None and (timeout is None or limit < timeout)
+    if deadline_bound and limit <= 0:
+        upstream_rejections.inc(upstream=upstream, reason="deadline")
+        raise DeadlineExceeded(upstream)
+    try:
+        async with asyncio.timeout(limit):
+            yield
+    except TimeoutError:
+        if not deadline_bound:
+            raise
+        upstream_rejections.inc(upstream=upstream, reason="deadline")
+        raise DeadlineExceeded(upstream) from None
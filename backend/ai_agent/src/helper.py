@@ -1,3 +1,5 @@
+from .passage_selection import select_passages, NEWS_TOKEN_BUDGET
+
 def format_sources_for_llm(extracted_sources: list) -> str:
     """Format extracted sources into a clear structure for the LLM"""
     if not extracted_sources:
@@ -49,15 +51,17 @@ def extract_sources_from_factcheck_response(fact_result: dict) -> list:
     
     return extracted_sources
 
-def format_search_and_scrape_result(scrape_result, google_news_result, article_url) -> dict:
-    """Extract content and title from a Document object returned by scraping tool"""
+def format_search_and_scrape_result(scrape_result, google_news_result, article_url, claim: str = "", token_budget: int = NEWS_TOKEN_BUDGET) -> dict:
+    """Extract content and title from a Document object returned by scraping tool.
+    Content is reduced to the passages most relevant to the claim, within token_budget.
+    """
 
     structured_data = {    
         "link": google_news_result.get("link"),
         "name": google_news_result.get("source", {}).get("name") if isinstance(google_news_result.get("source"), dict) else None,
         "title": google_news_result.get("title"),
         "date": google_news_result.get("date"),
-        "content": scrape_result.markdown[:2500],
+        "content": select_passages(scrape_result.get("markdown") or "", claim, token_budget),
         "url": article_url
     }
     
@@ -0,0 +1,76 @@
+import os
+import asyncio
+import importlib.util
+import httpx
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); without it every upstream is spoken to over HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class _ReleaseOnClose(httpx.AsyncByteStream):
+    """Response body that frees its per-host slot once the body is closed (read fully or abandoned)."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Caps requests in flight to each host on top of the pool-wide connection limit.
+
+    A slot is held until the response body is closed, so streamed downloads
+    count against their host for as long as they run.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self._transport = transport
+        self.max_per_host = max_per_host
+        self._semaphores = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = self._semaphores.get(request.url.host)
+        if semaphore is None:
+            semaphore = self._semaphores[request.url.host] = asyncio.Semaphore(self.max_per_host)
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        response.stream = _ReleaseOnClose(response.stream, semaphore.release)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def create_client(timeout: float = 20.0) -> httpx.AsyncClient:
+    """Pooled keep-alive client for one event loop: HTTP/2 where the server offers it, per-host limits.
+
+    Tuned with HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS, HTTP_KEEPALIVE_SECONDS,
+    HTTP_MAX_PER_HOST and HTTP2 (set to "false" to force HTTP/1.1).
+    """
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "40")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60")),
+    )
+    http2 = HTTP2_AVAILABLE and os.getenv("HTTP2", "true").lower() == "true"
+    # HTTP/2 is negotiated per host through ALPN, so HTTP/1.1-only upstreams keep working
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2, retries=1)
+    return httpx.AsyncClient(
+        transport=HostLimitedTransport(transport, int(os.getenv("HTTP_MAX_PER_HOST", "20"))),
+        timeout=httpx.Timeout(timeout, connect=5.0),
+    )
@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import uuid
+import tempfile
+import threading
+from typing import Optional, Tuple
+import numpy as np
+import zstandard
+from .cache import LRUCache, DiskCache
+from .image_preprocessing import load_image, to_grayscale
+
+HASH_SIZE = 8
+# pHash keeps the lowest 8x8 DCT frequencies of a 32x32 thumbnail
+PHASH_IMAGE_SIZE = 32
+
+
+def _resize_area(gray: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    """Box-filter resize: every output pixel is the mean of the input pixels it covers."""
+    if gray.shape[0] < rows or gray.shape[1] < cols:
+        # Tiny images: upsample first so every output cell covers at least one pixel
+        gray = np.repeat(np.repeat(gray, -(-rows // gray.shape[0]), axis=0), -(-cols // gray.shape[1]), axis=1)
+    row_edges = np.linspace(0, gray.shape[0], rows + 1).astype(int)
+    col_edges = np.linspace(0, gray.shape[1], cols + 1).astype(int)
+    sums = np.add.reduceat(np.add.reduceat(gray, row_edges[:-1], axis=0), col_edges[:-1], axis=1)
+    return sums / np.outer(np.diff(row_edges), np.diff(col_edges))
+
+
+def _pack(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    return np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+
+
+_DCT = _dct_matrix(PHASH_IMAGE_SIZE)
+
+
+def dhash(gray: np.ndarray) -> int:
+    """Difference hash: sign of the horizontal gradient over a 9x8 thumbnail, as a 64-bit int."""
+    small = _resize_area(gray, HASH_SIZE, HASH_SIZE + 1)
+    return _pack(small[:, 1:] > small[:, :-1])
+
+
+def phash(gray: np.ndarray) -> int:
+    """Perceptual hash: low-frequency DCT coefficients of a 32x32 thumbnail against their median."""
+    small = _resize_area(gray, PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE)
+    low = (_DCT @ small @ _DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    # The DC term only encodes overall brightness
+    return _pack(low > np.median(low.ravel()[1:]))
+
+
+def perceptual_hashes(source) -> Tuple[int, int]:
+    """(pHash, dHash) of an image given as encoded bytes or a path."""
+    gray = to_grayscale(np.asarray(load_image(source)))
+    return phash(gray), dhash(gray)
+
+
+class ImageHashIndex:
+    """Reverse image search results of previously searched images, found by perceptual-hash distance.
+
+    Hashes live in fixed-size NumPy arrays (a ring: the oldest entry is
+    replaced once max_entries is reached) and are compared in one vectorized
+    XOR + popcount. An image matches when both its pHash and dHash are within
+    the Hamming thresholds, so a resized or recompressed copy of a meme reuses
+    the stored results. Results are kept zstd-compressed in a byte-bounded LRU,
+    with the index and results persisted under `directory` when one is set.
+    The index snapshot is rewritten in a background thread at most every
+    IMAGE_SEARCH_CACHE_SAVE_SECONDS while entries are being added, and by flush().
+    """
+
+    def __init__(
+        self,
+        max_entries: int = None,
+        max_bytes: int = None,
+        directory: str = None,
+        ttl_seconds: int = None,
+        max_phash_distance: int = None,
+        max_dhash_distance: int = None,
+        save_seconds: float = None
+    ):
+        self.max_entries = max_entries or int(os.getenv("IMAGE_SEARCH_CACHE_MAX_ENTRIES", "20000"))
+        max_bytes = max_bytes or int(os.getenv("IMAGE_SEARCH_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+        directory = directory if directory is not None else os.getenv("IMAGE_SEARCH_CACHE_DIR", "")
+        self.ttl_seconds = ttl_seconds or int(os.getenv("IMAGE_SEARCH_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+        self.max_phash_distance = max_phash_distance or int(os.getenv("IMAGE_PHASH_MAX_DISTANCE", "8"))
+        self.max_dhash_distance = max_dhash_distance or int(os.getenv("IMAGE_DHASH_MAX_DISTANCE", "10"))
+        self.save_seconds = save_seconds if save_seconds is not None else float(
+            os.getenv("IMAGE_SEARCH_CACHE_SAVE_SECONDS", "30")
+        )
+
+        self.memory = LRUCache(max_bytes=max_bytes)
+        self.directory = directory
+        self.disk = DiskCache(directory) if directory else None
+        self._compressor = zstandard.ZstdCompressor()
+        self._decompressor = zstandard.ZstdDecompressor()
+
+        self._phash = np.zeros(self.max_entries, dtype=np.uint64)
+        self._dhash = np.zeros(self.max_entries, dtype=np.uint64)
+        self._created = np.zeros(self.max_entries, dtype=np.float64)
+        self._keys = np.full(self.max_entries, "", dtype=object)
+        self._next = 0
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        # Entries added since the last snapshot, and the timer that will write the next one
+        self._unsaved = 0
+        self._save_timer = None
+        # Lookups, for the metrics registry
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def __len__(self):
+        return int((self._keys != "").sum())
+
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.directory, "index.npz")
+
+    def _load(self):
+        if not self.directory or not os.path.exists(self._snapshot_path()):
+            return
+        try:
+            with np.load(self._snapshot_path(), allow_pickle=False) as snapshot:
+                count = min(len(snapshot["keys"]), self.max_entries)
+                self._phash[:count] = snapshot["phash"][:count]
+                self._dhash[:count] = snapshot["dhash"][:count]
+                self._created[:count] = snapshot["created"][:count]
+                self._keys[:count] = [key.decode("ascii") for key in snapshot["keys"][:count]]
+                self._next = int(snapshot["next"]) % self.max_entries
+            print(f"Image hash index loaded with {len(self)} searched images")
+        except Exception as e:
+            print(f"Image hash index load error: {e}")
+
+    def _save(self):
+        # One writer at a time, each writing the latest state, so snapshots never go backwards
+        with self._save_lock:
+            with self._lock:
+                unsaved, self._unsaved = self._unsaved, 0
+                if not unsaved:
+                    return
+                snapshot = {
+                    "phash": self._phash.copy(),
+                    "dhash": self._dhash.copy(),
+                    "created": self._created.copy(),
+                    "keys": self._keys.astype("S32"),
+                    "next": np.int64(self._next),
+                }
+            try:
+                # Write to a temp file first so a crash never leaves a torn snapshot
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".npz")
+                with os.fdopen(fd, "wb") as f:
+                    np.savez(f, **snapshot)
+                os.replace(tmp_path, self._snapshot_path())
+            except OSError as e:
+                print(f"Image hash index save error: {e}")
+                with self._lock:
+                    self._unsaved += unsaved
+
+    def _schedule_save(self):
+        """Start the timer for the next snapshot unless one is already pending."""
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_seconds, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Write the index snapshot now if entries were added since the last one (e.g. at shutdown)."""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+        if self.directory:
+            self._save()
+
+    def _results(self, key: str) -> Optional[list]:
+        blob = self.memory.get(key)
+        if blob is None and self.disk:
+            blob = self.disk.get(key)
+            if blob is not None:
+                self.memory.put(key, blob, len(blob))
+        return json.loads(self._decompressor.decompress(blob)) if blob is not None else None
+
+    def get(self, hashes: Tuple[int, int]) -> Optional[list]:
+        """Stored results of the closest previously searched image within both thresholds, or None."""
+        query_phash, query_dhash = (np.uint64(value) for value in hashes)
+        with self._lock:
+            valid = (self._keys != "") & (self._created > time.time() - self.ttl_seconds)
+            phash_distance = np.bitwise_count(self._phash ^ query_phash)
+            dhash_distance = np.bitwise_count(self._dhash ^ query_dhash)
+            matches = valid & (phash_distance <= self.max_phash_distance) & (dhash_distance <= self.max_dhash_distance)
+            candidates = np.flatnonzero(matches)
+            # Closest first
+            order = candidates[np.argsort(phash_distance[candidates] + dhash_distance[candidates], kind="stable")]
+            keys = [self._keys[i] for i in order[:3]]
+
+        for key in keys:
+            results = self._results(key)
+            if results is not None:
+                self.hits += 1
+                return results
+        self.misses += 1
+        return None
+
+    def put(self, hashes: Tuple[int, int], results: list):
+        """Index the results of a paid search; replaces the oldest entry when the index is full."""
+        key = uuid.uuid4().hex
+        blob = self._compressor.compress(json.dumps(results).encode("utf-8"))
+        self.memory.put(key, blob, len(blob))
+        if self.disk:
+            self.disk.put(key, blob)
+
+        with self._lock:
+            slot = self._next
+            evicted = self._keys[slot]
+            self._phash[slot], self._dhash[slot] = (np.uint64(value) for value in hashes)
+            self._created[slot] = time.time()
+            self._keys[slot] = key
+            self._next = (slot + 1) % self.max_entries
+            self._unsaved += 1
+        if self.directory:
+            self._schedule_save()
+        if evicted and self.disk:
+            self.disk.delete(evicted)
+
+
+# Shared by every request in the process
+image_hash_index = ImageHashIndex()
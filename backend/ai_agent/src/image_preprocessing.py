@@ -0,0 +1,109 @@
+import io
+import os
+import numpy as np
+from PIL import Image, ImageOps
+
+# CRAFT detects text comfortably at ~40px line height; taller text only costs detection time
+TARGET_TEXT_HEIGHT = int(os.getenv("OCR_TARGET_TEXT_HEIGHT", "40"))
+MAX_IMAGE_SIDE = int(os.getenv("OCR_MAX_IMAGE_SIDE", "2560"))
+# Guard against a bad text-height estimate shrinking the image into illegibility
+MIN_SCALE = 0.25
+
+# ITU-R BT.601 luma weights
+_LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def load_image(source) -> Image.Image:
+    """Open a path or encoded bytes as an upright RGB image (EXIF orientation applied)."""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    image = Image.open(source)
+    image = ImageOps.exif_transpose(image)
+    return image.convert("RGB")
+
+
+def to_grayscale(rgb: np.ndarray) -> np.ndarray:
+    """Vectorized RGB -> luma conversion, returned as float32."""
+    return rgb.astype(np.float32) @ _LUMA_WEIGHTS
+
+
+def estimate_text_height(gray: np.ndarray, min_height: int = 4):
+    """Estimate the typical text line height from the horizontal ink projection.
+
+    Ink is taken as the minority side of the mean threshold so both dark-on-light
+    and light-on-dark screenshots work. Returns None when no text-like rows are found.
+    """
+    ink = gray < gray.mean()
+    if ink.mean() > 0.5:
+        ink = ~ink
+
+    rows = ink.mean(axis=1) > 0.01
+    edges = np.diff(np.concatenate(([0], rows.astype(np.int8), [0])))
+    runs = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+    runs = runs[runs >= min_height]
+    if runs.size == 0:
+        return None
+    return float(np.median(runs))
+
+
+def normalize_contrast(gray: np.ndarray, low: float = 2.0, high: float = 98.0) -> np.ndarray:
+    """Stretch the [low, high] percentile range to the full 0-255 range."""
+    lo, hi = np.percentile(gray, [low, high])
+    if hi - lo < 1:
+        return np.clip(gray, 0, 255).astype(np.uint8)
+    stretched = (gray - lo) * (255.0 / (hi - lo))
+    return np.clip(stretched, 0, 255).astype(np.uint8)
+
+
+def preprocess_image(source, target_text_height: int = TARGET_TEXT_HEIGHT, max_side: int = MAX_IMAGE_SIDE) -> np.ndarray:
+    """Prepare an image for OCR: orientation fix, grayscale, contrast stretch and downscale.
+
+    Images are only ever shrunk, never upscaled. Returns a uint8 (H, W) array
+    that EasyOCR accepts directly.
+    """
+    image = load_image(source)
+    gray = normalize_contrast(to_grayscale(np.asarray(image)))
+
+    scale = 1.0
+    text_height = estimate_text_height(gray)
+    if text_height:
+        scale = min(scale, max(MIN_SCALE, target_text_height / text_height))
+    scale = min(scale, max_side / max(gray.shape))
+
+    if scale < 1.0:
+        height, width = gray.shape
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        gray = np.asarray(Image.fromarray(gray).resize(size, Image.Resampling.LANCZOS))
+
+    return gray
+
+
+def retry_variant(gray: np.ndarray, upscale: float = 2.0, max_side: int = MAX_IMAGE_SIDE) -> np.ndarray:
+    """A different look at a preprocessed image whose detected text came back unrecognized.
+
+    A harder (10th-90th percentile) contrast stretch and an upscale, capped at
+    max_side, for the small or faint text that usually causes it.
+    """
+    gray = normalize_contrast(gray.astype(np.float32), low=10.0, high=90.0)
+    scale = min(upscale, max_side / max(gray.shape))
+    if scale > 1.0:
+        height, width = gray.shape
+        size = (round(width * scale), round(height * scale))
+        gray = np.asarray(Image.fromarray(gray).resize(size, Image.Resampling.LANCZOS))
+    return gray
+
+
+def pad_batch(images: list) -> list:
+    """Pad grayscale arrays to a common shape so they can share one batched OCR pass.
+
+    Each image is padded bottom/right with its own median value so the padding
+    blends into the background whether the text is dark-on-light or light-on-dark.
+    """
+    height = max(image.shape[0] for image in images)
+    width = max(image.shape[1] for image in images)
+    padded = []
+    for image in images:
+        canvas = np.full((height, width), np.median(image), dtype=np.uint8)
+        canvas[:image.shape[0], :image.shape[1]] = image
+        padded.append(canvas)
+    return padded
@@ -0,0 +1,86 @@
+import os
+import hashlib
+import threading
+from typing import List, Optional, Tuple
+from langchain_core.messages import BaseMessage, SystemMessage
+from .cache import LRUCache, DiskCache
+from .prompts import VerificationCheckPrompts
+from .metrics import registry as metrics_registry
+
+
+class PromptStats:
+    """Hit/miss counters for one prompt type (shape expected by the metrics registry)."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Content-addressed cache of LLM responses: model + system prompt hash + user prompt hash.
+
+    Responses are stored as text (message content, or the structured output as
+    JSON) in a byte-bounded LRU with an optional on-disk tier.
+    """
+
+    def __init__(self, max_bytes: int = None, directory: str = None):
+        max_bytes = max_bytes or int(os.getenv("LLM_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        directory = directory or os.getenv("LLM_CACHE_DIR", "")
+        self.memory = LRUCache(max_bytes=max_bytes)
+        self.disk = DiskCache(directory) if directory else None
+        # System prompt hash -> VerificationCheckPrompts attribute name, for per-prompt stats
+        self._prompt_types = {
+            _sha256(value): name
+            for name, value in vars(VerificationCheckPrompts).items()
+            if name.endswith("_SYSTEM") and isinstance(value, str)
+        }
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def key_for(self, model: str, messages: List[BaseMessage], output: str = "text") -> Tuple[str, str]:
+        """Return (cache key, prompt type) for a system + user message call.
+
+        `output` distinguishes free-form calls from each structured output schema.
+        """
+        system = "".join(message.content for message in messages if isinstance(message, SystemMessage))
+        user = "".join(str(message.content) for message in messages if not isinstance(message, SystemMessage))
+        system_hash = _sha256(system)
+        key = _sha256("\n".join([model, output, system_hash, _sha256(user)]))
+        return key, self._prompt_types.get(system_hash, "OTHER")
+
+    def _stats_for(self, prompt_type: str) -> PromptStats:
+        with self._lock:
+            stats = self.stats.get(prompt_type)
+            if stats is None:
+                stats = self.stats[prompt_type] = PromptStats()
+                metrics_registry.register_cache(f"llm.{prompt_type}", stats)
+            return stats
+
+    def get(self, key: str, prompt_type: str) -> Optional[str]:
+        stats = self._stats_for(prompt_type)
+        value = self.memory.get(key)
+        if value is None and self.disk:
+            data = self.disk.get(key)
+            if data is not None:
+                value = data.decode("utf-8")
+                self.memory.put(key, value, len(data))
+
+        if value is None:
+            stats.misses += 1
+        else:
+            stats.hits += 1
+        return value
+
+    def put(self, key: str, value: str):
+        data = value.encode("utf-8")
+        self.memory.put(key, value, len(data))
+        if self.disk:
+            self.disk.put(key, data)
+
+
+# Shared cache for the whole API process
+llm_cache = LLMCache()
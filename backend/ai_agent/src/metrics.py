@@ -0,0 +1,294 @@
+import time
+import functools
+import threading
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional, Tuple
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Latency buckets in seconds, from cache hits up to slow scrapes and LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Per-request stage timings; set by Workflow for each node so tools and LLM calls can report into it
+request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        return lines + self._samples()
+
+    def _samples(self) -> list:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _samples(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose samples are read from a callback at scrape time."""
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...], callback: Callable[[], dict]):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _samples(self) -> list:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+            for key, value in sorted(self.callback().items())
+        ]
+
+
+class CallbackCounter(CallbackGauge):
+    """Counter whose samples are read from a callback at scrape time; the callback's values must only grow."""
+    type_name = "counter"
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+            entry[len(self.buckets)] += 1
+            entry[-1] += value
+
+    def _samples(self) -> list:
+        with self._lock:
+            items = sorted((key, list(entry)) for key, entry in self._values.items())
+        lines = []
+        for key, entry in items:
+            for i, bound in enumerate(self.buckets):
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {entry[i]}")
+            count = entry[len(self.buckets)]
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {entry[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide collection of metrics rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics = []
+        self._caches = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames))
+
+    def register_cache(self, name: str, cache):
+        """Expose hit/miss counts of any cache with `hits` and `misses` attributes (e.g. LRUCache)."""
+        self._caches[name] = cache
+
+    def cache_stats(self) -> Dict[str, dict]:
+        stats = {}
+        for name, cache in self._caches.items():
+            lookups = cache.hits + cache.misses
+            stats[name] = {
+                "hits": cache.hits,
+                "misses": cache.misses,
+                "hit_ratio": cache.hits / lookups if lookups else 0.0
+            }
+        return stats
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+node_duration = registry.histogram(
+    "verihub_node_duration_seconds", "Wall-clock time spent in each workflow graph node.", ("node",)
+)
+tool_duration = registry.histogram(
+    "verihub_tool_duration_seconds", "Wall-clock time of each VerificationService call.", ("tool",)
+)
+llm_duration = registry.histogram(
+    "verihub_llm_duration_seconds", "Wall-clock time of each chat model call.", ("model",)
+)
+upstream_errors = registry.counter(
+    "verihub_upstream_errors_total", "Failed calls to external services (APIs, scraping, OCR, LLM).", ("upstream",)
+)
+upstream_rejections = registry.counter(
+    "verihub_upstream_rejections_total", "Upstream calls refused locally by a circuit breaker or rate limit.",
+    ("upstream", "reason")
+)
+search_queries = registry.counter(
+    "verihub_search_queries_total", "Search queries sent to X and Google News, by what wrote them.",
+    ("target", "source")
+)
+verifications_deadline_exceeded = registry.counter(
+    "verihub_deadline_exceeded_total", "Verifications answered with a partial result because their deadline ran out.",
+    ("mode",)
+)
+verifications_in_flight = registry.gauge(
+    "verihub_verifications_in_flight", "Workflow runs currently being processed.", ("mode",)
+)
+tools_in_flight = registry.gauge(
+    "verihub_tool_calls_in_flight", "VerificationService calls currently awaiting a result.", ("tool",)
+)
+registry.register(CallbackCounter(
+    "verihub_cache_hits_total", "Lookups answered by each cache since startup.", ("cache",),
+    lambda: {(name,): stats["hits"] for name, stats in registry.cache_stats().items()}
+))
+registry.register(CallbackCounter(
+    "verihub_cache_misses_total", "Lookups each cache could not answer since startup.", ("cache",),
+    lambda: {(name,): stats["misses"] for name, stats in registry.cache_stats().items()}
+))
+registry.register(CallbackGauge(
+    "verihub_cache_hit_ratio", "Hits over total lookups for each cache.", ("cache",),
+    lambda: {(name,): stats["hit_ratio"] for name, stats in registry.cache_stats().items()}
+))
+
+
+def add_request_timing(stage: str, seconds: float):
+    """Accumulate seconds under a stage of the current request's timing breakdown, if any."""
+    timings = request_timings.get()
+    if timings is not None:
+        timings[stage] = round(timings.get(stage, 0.0) + seconds, 3)
+
+
+def record_upstream_error(upstream: str):
+    upstream_errors.inc(upstream=upstream)
+
+
+def instrumented(tool: str):
+    """Decorator for async VerificationService methods: latency histogram, in-flight gauge and errors."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            tools_in_flight.inc(tool=tool)
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                record_upstream_error(tool)
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                tools_in_flight.dec(tool=tool)
+                tool_duration.observe(elapsed, tool=tool)
+                add_request_timing(f"tools.{tool}", elapsed)
+        return wrapper
+    return decorator
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """LangChain callback recording chat model latency and errors."""
+
+    # Run in the caller's context so request_timings reaches the current request
+    run_inline = True
+
+    def __init__(self, model: str):
+        self.model = model
+        self._started = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def _finish(self, run_id) -> Optional[float]:
+        start = self._started.pop(run_id, None)
+        if start is None:
+            return None
+        elapsed = time.perf_counter() - start
+        llm_duration.observe(elapsed, model=self.model)
+        add_request_timing("llm", elapsed)
+        return elapsed
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+        record_upstream_error(self.model)
@@ -42,3 +42,27 @@ class VerificationSummary(BaseModel):
     )
     reasoned_summary: str = Field(default="", description="LLM generated reasoning for the verdict")
     result_from: str = Field(..., description="Tool that provided the successful result")
+    evidence_mode: Literal["sequential", "speculative"] = Field(
+        default="sequential",
+        description="'sequential' falls back fact-check → X → Google News; 'speculative' queries all three at once"
+    )
+    timings: Dict[str, float] = Field(default_factory=dict, description="Wall-clock seconds per verification stage")
+    cached: bool = Field(default=False, description="True when this verdict was served from the verified-claim cache")
+    cached_age_seconds: Optional[float] = Field(
+        None, description="Seconds since the cached verdict was produced (only set when cached)"
+    )
+    matched_claim: Optional[str] = Field(
+        None, description="Previously verified near-duplicate claim whose evidence settled this verdict"
+    )
+    match_similarity: Optional[float] = Field(
+        None, description="Estimated Jaccard similarity between this claim and matched_claim"
+    )
+    near_duplicate_check: Optional[TextCheck] = Field(
+        None, exclude=True, description="Verdict and sources of matched_claim, re-checked against this claim first"
+    )
+    deadline_exceeded: bool = Field(
+        default=False, description="True when the request's deadline cut the verification short and the verdict is partial"
+    )
+    ocr_text: Optional[str] = Field(
+        None, exclude=True, description="OCR text extracted ahead of the graph (batched multi-image OCR)"
+    )
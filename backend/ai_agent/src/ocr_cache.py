@@ -0,0 +1,45 @@
+import os
+import hashlib
+import numpy as np
+from .cache import LRUCache, DiskCache
+
+
+class OCRCache:
+    """OCR results keyed by a hash of the decoded pixels, with an optional on-disk tier."""
+
+    def __init__(self, max_bytes: int = None, directory: str = None):
+        max_bytes = max_bytes or int(os.getenv("OCR_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+        directory = directory or os.getenv("OCR_CACHE_DIR", "")
+        self.memory = LRUCache(max_bytes=max_bytes)
+        self.disk = DiskCache(directory) if directory else None
+
+    @staticmethod
+    def key_for(image: np.ndarray) -> str:
+        """Hash pixel data and shape, so re-encoded copies of the same image share a key."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(image.shape).encode())
+        digest.update(np.ascontiguousarray(image).tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        text = self.memory.get(key)
+        if text is not None:
+            return text
+
+        if self.disk:
+            data = self.disk.get(key)
+            if data is not None:
+                text = data.decode("utf-8")
+                self.memory.put(key, text, len(data))
+                return text
+        return None
+
+    def put(self, key: str, text: str):
+        data = text.encode("utf-8")
+        self.memory.put(key, text, len(data))
+        if self.disk:
+            self.disk.put(key, data)
+
+
+# Shared cache for the whole API process
+ocr_cache = OCRCache()
@@ -0,0 +1,182 @@
+import os
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Per-process EasyOCR reader, created once by the pool initializer
+_reader = None
+
+
+def _easyocr_reader(languages: list):
+    import easyocr
+    return easyocr.Reader(languages)
+
+
+def _init_worker(languages: list, torch_threads: int, reader_factory=_easyocr_reader):
+    """Load EasyOCR weights once per worker and cap its torch thread pools."""
+    global _reader
+    # Must be set before torch is imported so OpenMP/MKL pick them up
+    os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+    os.environ["MKL_NUM_THREADS"] = str(torch_threads)
+
+    import torch
+    torch.set_num_threads(torch_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+    _reader = reader_factory(languages)
+
+
+def _warmup() -> int:
+    return os.getpid()
+
+
+def _read_text(image) -> str:
+    """Run EasyOCR on a path, encoded bytes or numpy array inside a worker."""
+    results = _reader.readtext(image)
+    return " ".join([res[1] for res in results]).strip()
+
+
+def _detect_and_read(image, text_threshold: float) -> tuple:
+    """Run text detection first and only run recognition when it finds text regions.
+
+    Returns (number of detected regions, extracted text).
+    """
+    from easyocr.utils import reformat_input
+
+    img, img_cv_grey = reformat_input(image)
+    horizontal_list, free_list = _reader.detect(img, text_threshold=text_threshold)
+    horizontal_list, free_list = horizontal_list[0], free_list[0]
+    regions = len(horizontal_list) + len(free_list)
+    if regions == 0:
+        return 0, ""
+
+    results = _reader.recognize(img_cv_grey, horizontal_list, free_list)
+    return regions, " ".join([res[1] for res in results]).strip()
+
+
+def _detect_and_read_batch(images: list, text_threshold: float) -> list:
+    """Run one batched text detection over equally sized arrays, then recognition on those with text regions.
+
+    Returns a (number of detected regions, extracted text) pair per image.
+    """
+    from easyocr.utils import reformat_input_batched
+
+    imgs, imgs_cv_grey = reformat_input_batched(images)
+    horizontal_lists, free_lists = _reader.detect(imgs, text_threshold=text_threshold, reformat=False)
+    results = []
+    for img_cv_grey, horizontal_list, free_list in zip(imgs_cv_grey, horizontal_lists, free_lists):
+        regions = len(horizontal_list) + len(free_list)
+        if regions == 0:
+            results.append((0, ""))
+            continue
+        recognized = _reader.recognize(img_cv_grey, horizontal_list, free_list)
+        results.append((regions, " ".join([res[1] for res in recognized]).strip()))
+    return results
+
+
+class OCREngine:
+    """Pool of worker processes that each keep a warm EasyOCR reader."""
+
+    def __init__(self, workers: int = None, torch_threads: int = None, languages: list = None, reader_factory=None):
+        self.workers = workers or int(os.getenv("OCR_WORKERS", "1"))
+        default_threads = max(1, (os.cpu_count() or 1) // self.workers)
+        self.torch_threads = torch_threads or int(os.getenv("OCR_TORCH_THREADS", str(default_threads)))
+        self.languages = languages or ["en"]
+        # Called with the languages in each worker to build its reader; must be picklable (a module-level callable)
+        self.reader_factory = reader_factory or _easyocr_reader
+        # CRAFT text confidence a region needs before recognition is attempted
+        self.text_threshold = float(os.getenv("OCR_TEXT_GATE_THRESHOLD", "0.7"))
+        # images_failed counts images OCR could not run on at all, kept apart from the text-free ones
+        self.gate_stats = {"images_checked": 0, "images_without_text": 0, "images_failed": 0}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn keeps torch/CUDA state out of the forked FastAPI process
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.languages, self.torch_threads, self.reader_factory)
+                )
+            return self._executor
+
+    def start(self):
+        """Spawn every worker and block until each has loaded the models."""
+        executor = self._get_executor()
+        futures = [executor.submit(_warmup) for _ in range(self.workers)]
+        pids = {future.result() for future in futures}
+        print(f"OCR engine ready: {len(pids)} worker(s), {self.torch_threads} torch thread(s) each")
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _reset(self):
+        """Drop a pool whose worker died so the next call respawns it."""
+        print("OCR worker pool broken, restarting")
+        self.shutdown()
+
+    def _count_gate(self, regions: int):
+        with self._lock:
+            self.gate_stats["images_checked"] += 1
+            if regions == 0:
+                self.gate_stats["images_without_text"] += 1
+
+    def _count_failures(self, images: int):
+        with self._lock:
+            self.gate_stats["images_failed"] += images
+
+    async def _asubmit(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool:
+            self._reset()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    async def aread_text(self, image) -> str:
+        """OCR call that leaves the event loop free while a worker runs it."""
+        return await self._asubmit(_read_text, image)
+
+    async def aread_text_gated(self, image, text_threshold: float = None) -> tuple:
+        """Detect text regions first and skip recognition on text-free images.
+
+        Returns (number of detected regions, extracted text).
+        """
+        threshold = self.text_threshold if text_threshold is None else text_threshold
+        try:
+            regions, extracted_text = await self._asubmit(_detect_and_read, image, threshold)
+        except Exception:
+            self._count_failures(1)
+            raise
+        self._count_gate(regions)
+        return regions, extracted_text
+
+    async def aread_text_batch(self, images: list, text_threshold: float = None) -> list:
+        """Batched aread_text_gated; images must share one shape (see pad_batch).
+
+        Returns a (number of detected regions, extracted text) pair per image.
+        """
+        threshold = self.text_threshold if text_threshold is None else text_threshold
+        try:
+            results = await self._asubmit(_detect_and_read_batch, images, threshold)
+        except Exception:
+            self._count_failures(len(images))
+            raise
+        for regions, _ in results:
+            self._count_gate(regions)
+        return results
+
+
+# Shared engine for the whole API process
+ocr_engine = OCREngine()
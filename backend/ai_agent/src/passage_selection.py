@@ -0,0 +1,122 @@
+import os
+import re
+import numpy as np
+
+# Per-source evidence budgets, in estimated LLM tokens (~4 characters each)
+NEWS_TOKEN_BUDGET = int(os.getenv("NEWS_PASSAGE_TOKEN_BUDGET", "600"))
+IMAGE_TOKEN_BUDGET = int(os.getenv("IMAGE_PASSAGE_TOKEN_BUDGET", "400"))
+CHARS_PER_TOKEN = 4
+
+# Longest passage in words; longer paragraphs are split into windows of this size
+PASSAGE_WORDS = 80
+# Headings and one-liners shorter than this are merged into the following paragraph
+MIN_PASSAGE_WORDS = 20
+
+_TOKEN_RE = re.compile(r"\w+")
+_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have he her his in is it its of on or our she that the
+their them they this to was we were which who will with you your not no so if than then there these those
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def tokenize(text: str) -> list:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def _is_boilerplate(block: str) -> bool:
+    """Navigation menus, link lists and image-only lines: little text once links are stripped."""
+    text = _LINK_RE.sub(r"\1", block)
+    words = text.split()
+    if len(words) < 4:
+        return True
+    link_chars = sum(len(match.group(0)) for match in _LINK_RE.finditer(block))
+    return link_chars > 0.6 * len(block)
+
+
+def split_passages(markdown: str, passage_words: int = PASSAGE_WORDS) -> list:
+    """Split scraped markdown into paragraph passages of at most passage_words words, dropping boilerplate blocks."""
+    blocks = [block.strip() for block in re.split(r"\n\s*\n", markdown or "")]
+    passages = []
+    current = []
+    current_words = 0
+    for block in blocks:
+        if not block or _is_boilerplate(block):
+            continue
+        # Keep link text, drop URLs: they cost tokens and don't help the verdict
+        block = _LINK_RE.sub(r"\1", block)
+        words = block.split()
+        if len(words) > passage_words:
+            if current:
+                passages.append(" ".join(current))
+                current, current_words = [], 0
+            for start in range(0, len(words), passage_words):
+                passages.append(" ".join(words[start:start + passage_words]))
+            continue
+        if current and (current_words >= MIN_PASSAGE_WORDS or current_words + len(words) > passage_words):
+            passages.append(" ".join(current))
+            current, current_words = [], 0
+        current.append(block)
+        current_words += len(words)
+    if current:
+        passages.append(" ".join(current))
+    return passages
+
+
+def bm25_scores(query: str, passages: list, k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """Okapi BM25 score of every passage for the query, computed over a (passages x query terms) matrix."""
+    terms = sorted(set(tokenize(query)))
+    if not terms or not passages:
+        return np.zeros(len(passages))
+
+    column = {term: j for j, term in enumerate(terms)}
+    tf = np.zeros((len(passages), len(terms)), dtype=np.float32)
+    lengths = np.empty(len(passages), dtype=np.float32)
+    for i, passage in enumerate(passages):
+        tokens = tokenize(passage)
+        lengths[i] = len(tokens)
+        for token in tokens:
+            j = column.get(token)
+            if j is not None:
+                tf[i, j] += 1
+
+    df = (tf > 0).sum(axis=0)
+    idf = np.log1p((len(passages) - df + 0.5) / (df + 0.5))
+    norm = k1 * (1 - b + b * lengths / max(lengths.mean(), 1.0))
+    return ((tf * (k1 + 1)) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+
+def select_passages(markdown: str, claim: str, token_budget: int) -> str:
+    """Keep the passages most relevant to the claim that fit in token_budget, in page order.
+
+    Passages sharing no term with the claim are skipped; when nothing in the page
+    matches the claim, the leading passages are kept instead.
+    """
+    passages = split_passages(markdown)
+    if not passages:
+        return ""
+
+    scores = bm25_scores(claim, passages)
+    # Stable sort: ties (including the all-zero no-match case) keep page order
+    order = np.argsort(-scores, kind="stable")
+    if scores.max() > 0:
+        # Don't spend budget on passages that share no term with the claim
+        order = order[scores[order] > 0]
+
+    selected = []
+    used = 0
+    for i in order:
+        cost = estimate_tokens(passages[i])
+        if used + cost > token_budget:
+            if not selected:
+                # Even the best passage is over budget: keep a trimmed copy
+                selected.append((i, passages[i][:token_budget * CHARS_PER_TOKEN]))
+                break
+            continue
+        selected.append((i, passages[i]))
+        used += cost
+    return "\n...\n".join(text for _, text in sorted(selected))
@@ -0,0 +1,258 @@
+import os
+import re
+import unicodedata
+from typing import List, Tuple
+
+# Confidence a locally built query needs to be used instead of asking the LLM for one
+MIN_CONFIDENCE = float(os.getenv("QUERY_BUILDER_MIN_CONFIDENCE", "0.6"))
+# X recent search rejects queries over 512 characters
+X_QUERY_MAX_CHARS = 512
+
+MAX_ANCHORS = 2
+MAX_KEYWORDS = 4
+
+_MONTHS = {
+    "january": "jan", "february": "feb", "march": "mar", "april": "apr", "may": "may", "june": "jun",
+    "july": "jul", "august": "aug", "september": "sep", "october": "oct", "november": "nov", "december": "dec",
+}
+_MONTH_NAMES = {short: full for full, short in _MONTHS.items()}
+_MONTH_PATTERN = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+_DATE_RES = (
+    # "January 15", "Jan 15th"
+    re.compile(rf"\b(?P<month>{_MONTH_PATTERN})\.?\s+(?P<day>\d{{1,2}})(?:st|nd|rd|th)?\b", re.IGNORECASE),
+    # "15 January", "15th of Jan"
+    re.compile(rf"\b(?P<day>\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?(?P<month>{_MONTH_PATTERN})\b\.?", re.IGNORECASE),
+)
+_NUMBER_RE = re.compile(
+    r"(?<!\w)[$€£₹]?\d[\d,]*(?:\.\d+)?\s*(?:%|percent\b|million\b|billion\b|trillion\b|crore\b|lakh\b|k\b)?", re.IGNORECASE
+)
+_QUOTED_RE = re.compile(r"[\"“”]([^\"“”]{3,80})[\"“”]")
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+_WORD_RE = re.compile(r"#?[^\W\d_][\w'’\-]*")
+_POSSESSIVE_RE = re.compile(r"['’]s$", re.IGNORECASE)
+
+# Words that link the parts of one name ("Bank of England", "Leonardo da Vinci"); "and" joins two names
+_NAME_JOINERS = frozenset({"of", "the", "de", "da", "del", "van", "von", "bin", "al"})
+_STOPWORDS = frozenset("""
+a an and are as at be been being but by can could did do does for from had has have he her hers him his how i if in
+into is it its just me more most my no nor not now of on or our out over own she should so some such than that the
+their theirs them then there these they this those through to too under until up very was we were what when where
+which while who whom why will with would you your yours about after again against all also am any because before
+below between both during each few further here itself off once only other ourselves same themselves yet
+""".split())
+# Words common in viral claims that say nothing about what to search for
+_FILLER = frozenset("""
+breaking viral news latest update report reports reported reportedly says said claim claims claimed according
+video photo image picture pic clip post tweet shows showing seen see watch share shared sharing true fake real
+people everyone someone today yesterday tomorrow officially confirmed alert urgent must know
+""".split())
+
+
+def _normalize(claim: str) -> str:
+    claim = unicodedata.normalize("NFKC", claim)
+    claim = _URL_RE.sub(" ", claim)
+    return " ".join(claim.split())
+
+
+def _is_latin(text: str) -> bool:
+    """Whether most letters are Latin; capitalization says nothing about names in other scripts."""
+    letters = [char for char in text if char.isalpha()]
+    if not letters:
+        return False
+    latin = sum(1 for char in letters if "LATIN" in unicodedata.name(char, ""))
+    return latin / len(letters) >= 0.8
+
+
+def _dates(claim: str) -> List[Tuple[str, str]]:
+    """(full month name, day) of every day-and-month date in the claim."""
+    dates = []
+    for pattern in _DATE_RES:
+        for match in pattern.finditer(claim):
+            month = match.group("month").lower().rstrip(".")
+            full = month if month in _MONTHS else _MONTH_NAMES.get(month[:3], month)
+            date = (full, str(int(match.group("day"))))
+            if date not in dates:
+                dates.append(date)
+    return dates
+
+
+def _tokens(claim: str) -> List[Tuple[str, bool]]:
+    """(word, whether only whitespace separates it from the previous word) for every word of the claim."""
+    tokens = []
+    end = 0
+    for match in _WORD_RE.finditer(claim):
+        tokens.append((match.group(0), not claim[end:match.start()].strip()))
+        end = match.end()
+    return tokens
+
+
+def _bare(word: str) -> Tuple[str, bool]:
+    """The word without a possessive "'s", and whether it had one."""
+    stripped = _POSSESSIVE_RE.sub("", word)
+    return stripped, stripped != word
+
+
+def _names(tokens: List[Tuple[str, bool]], sentence_starts: set, case_informative: bool) -> List[str]:
+    """Runs of capitalized words: "Elon Musk", "Bank of England", "NASA".
+
+    A run ends at punctuation ("Joe Biden, Barack Obama"), "and", a possessive
+    ("Donald Trump's"), a hashtag, a contraction or a stopword.
+    """
+    names = []
+    current = []
+
+    def flush():
+        # Joiners can't end a name: "Bank of" -> "Bank"
+        while current and current[-1][1].lower() in _NAME_JOINERS:
+            current.pop()
+        # A lone capitalized word opening a sentence is usually just capitalized, not a name
+        if len(current) > 1 or current and (current[0][1].isupper() or current[0][0] not in sentence_starts):
+            names.append(" ".join(word for _, word in current))
+        current.clear()
+
+    if not case_informative:
+        return names
+    for index, (word, joined) in enumerate(tokens):
+        if index in sentence_starts or not joined:
+            flush()
+        bare, possessive = _bare(word)
+        acronym = len(bare) >= 2 and bare.isupper()
+        if word.startswith("#") or "'" in bare or "’" in bare or bare.lower() in _FILLER:
+            flush()
+        elif bare[:1].isupper() and (acronym or bare.lower() not in _STOPWORDS):
+            current.append((index, bare))
+        elif current and bare.lower() in _NAME_JOINERS:
+            current.append((index, bare))
+        else:
+            flush()
+        if possessive:
+            flush()
+    flush()
+    return names
+
+
+def extract_terms(claim: str) -> dict:
+    """Search terms of a claim, without an LLM.
+
+    Returns {"phrases", "names", "dates", "numbers", "keywords", "word_count",
+    "case_informative", "latin"}: quoted phrases, capitalized names and
+    acronyms, day-month dates as (month, day), figures ("$5 billion", "40%"),
+    and the remaining content words in order of appearance.
+    """
+    claim = _normalize(claim)
+    tokens = _tokens(claim)
+    words = [word for word, _ in tokens]
+    latin = _is_latin(claim)
+
+    sentence_starts = {0}
+    for match in re.finditer(r"[.!?:]\s+", claim):
+        sentence_starts.add(len(_WORD_RE.findall(claim[:match.end()])))
+
+    alpha_words = [word for index, word in enumerate(words) if word.isalpha() and index not in sentence_starts]
+    all_caps = sum(1 for word in alpha_words if len(word) >= 2 and word.isupper())
+    capitalized = sum(1 for word in alpha_words if word[:1].isupper())
+    # ALL CAPS or Title Case Everywhere (typical of meme text) carries no name information
+    case_informative = latin and bool(alpha_words) and (
+        all_caps / len(alpha_words) < 0.5 and capitalized / len(alpha_words) < 0.8
+    )
+
+    phrases = [phrase.strip() for phrase in _QUOTED_RE.findall(claim)]
+    dates = _dates(claim)
+    names = [
+        name for name in _names(tokens, sentence_starts, case_informative)
+        if not any(name.lower() in phrase.lower() for phrase in phrases)
+        and name.lower().rstrip(".") not in _MONTHS and name.lower()[:3] not in _MONTH_NAMES
+    ]
+    numbers = []
+    for match in _NUMBER_RE.finditer(claim):
+        number = match.group(0).strip()
+        # Day numbers of dates are searched as part of the date
+        if number not in numbers and not any(number == day for _, day in dates):
+            numbers.append(number)
+
+    covered = {token.lower() for term in phrases + names + numbers for token in _WORD_RE.findall(term)}
+    keywords = []
+    for word in words:
+        lowered = _bare(word)[0].lower().strip("'’-")
+        # Contractions ("it's", "don't") say nothing a search can use
+        if "'" in lowered or "’" in lowered:
+            continue
+        if (
+            len(lowered) >= 3 and lowered not in _STOPWORDS and lowered not in _FILLER
+            and lowered not in covered and lowered[:3] not in _MONTH_NAMES and lowered not in keywords
+        ):
+            keywords.append(lowered)
+
+    return {
+        "phrases": phrases,
+        "names": names,
+        "dates": dates,
+        "numbers": numbers,
+        "keywords": keywords,
+        "word_count": len(words),
+        "case_informative": case_informative,
+        "latin": latin,
+    }
+
+
+def query_confidence(terms: dict) -> float:
+    """How likely a keyword query is to find the same evidence an LLM-written one would, from 0 to 1.
+
+    Highest for short claims naming who or what they are about; low for
+    claims without names, long OCR dumps and scripts the extractor can't read.
+    """
+    if not terms["latin"] or not terms["keywords"] and not terms["names"] and not terms["phrases"]:
+        return 0.0
+    if terms["word_count"] < 3 or terms["word_count"] > 60:
+        return 0.3
+    anchors = len(terms["phrases"]) + len(terms["names"])
+    if anchors == 0:
+        confidence = 0.4
+    elif not terms["keywords"]:
+        confidence = 0.6
+    else:
+        confidence = 0.7 if anchors == 1 else 0.85
+    if terms["dates"] or terms["numbers"]:
+        confidence += 0.05
+    return min(confidence, 1.0)
+
+
+def _quote(term: str) -> str:
+    return f'"{term}"' if " " in term or "-" in term else term
+
+
+def _anchors(terms: dict) -> List[str]:
+    # Multi-word names first: "Elon Musk" narrows a search far more than "Tesla"
+    names = sorted(terms["names"], key=lambda name: -len(name.split()))
+    return (terms["phrases"] + names)[:MAX_ANCHORS]
+
+
+def build_x_query(claim: str) -> Tuple[str, float]:
+    """X recent-search query for a claim and its confidence (see query_confidence).
+
+    Names and quoted phrases must match; one of the content words, figures or
+    date spellings must match too, so reworded posts are still found.
+    """
+    terms = extract_terms(claim)
+    parts = [_quote(anchor) for anchor in _anchors(terms)]
+    optional = [_quote(keyword) for keyword in terms["keywords"][:MAX_KEYWORDS]]
+    optional += [f'"{number}"' for number in terms["numbers"][:2]]
+    for month, day in terms["dates"][:1]:
+        optional += [f'"{month.title()} {day}"', f'"{_MONTHS[month].title()} {day}"', f'"{day} {month.title()}"']
+    if len(optional) == 1:
+        parts.append(optional[0])
+    elif optional:
+        parts.append("(" + " OR ".join(optional) + ")")
+
+    query = " ".join(parts + ["-is:retweet"])
+    if len(query) > X_QUERY_MAX_CHARS:
+        query = " ".join(parts[:-1] + ["-is:retweet"])
+    return query, query_confidence(terms)
+
+
+def build_news_query(claim: str) -> Tuple[str, float]:
+    """Google News query for a claim (names, content words, date and figures) and its confidence."""
+    terms = extract_terms(claim)
+    parts = [_quote(anchor) for anchor in _anchors(terms)] + terms["keywords"][:MAX_KEYWORDS]
+    parts += [f"{month.title()} {day}" for month, day in terms["dates"][:1]] + terms["numbers"][:1]
+    return " ".join(parts), query_confidence(terms)
@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from typing import Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import zstandard
+from .cache import LRUCache, DiskCache
+
+# Query parameters that only track where a click came from; they never change the page
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "gclsrc", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "_gl",
+    "ref", "ref_src", "ref_url", "cmpid", "ocid", "smid", "smtyp", "guccounter", "guce_referrer",
+    "guce_referrer_sig", "spm", "share", "utm", "taid", "at_medium", "at_campaign",
+})
+TRACKING_PREFIXES = ("utm_", "mkt_", "pk_", "at_", "hsa_")
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so links to the same article share a cache key.
+
+    Lower-cases scheme and host, drops "www.", default ports, fragments and
+    tracking parameters, and sorts the remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    port = parts.port
+    if port and not (scheme == "http" and port == 80) and not (scheme == "https" and port == 443):
+        host = f"{host}:{port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    # http and https copies of a page are the same article
+    return urlunsplit(("https" if scheme == "http" else scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def _parse_domain_ttls(spec: str) -> dict:
+    """"reuters.com=3600,wikipedia.org=86400" -> {"reuters.com": 3600, "wikipedia.org": 86400}"""
+    ttls = {}
+    for item in spec.split(","):
+        domain, _, seconds = item.strip().partition("=")
+        if domain and seconds:
+            ttls[domain.strip().lower().lstrip(".")] = int(seconds)
+    return ttls
+
+
+class DiskScrapeStore:
+    """Compressed scrape entries in a DiskCache directory, bounded by age and total size.
+
+    As in the MongoDB store, an entry is kept SCRAPE_CACHE_STALE_SECONDS past its
+    expiry so it can still be revalidated; that purge time is stored as the file's
+    mtime. Purged files are swept at startup and whenever writes take the
+    directory past SCRAPE_CACHE_DISK_MAX_BYTES, which also drops the entries
+    closest to their purge time until it is back under 90% of the cap.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = None, stale_seconds: int = None):
+        self.disk = DiskCache(directory)
+        self.max_bytes = max_bytes or int(os.getenv("SCRAPE_CACHE_DISK_MAX_BYTES", str(1024 * 1024 * 1024)))
+        self.stale_seconds = stale_seconds if stale_seconds is not None else int(
+            os.getenv("SCRAPE_CACHE_STALE_SECONDS", str(7 * 24 * 60 * 60))
+        )
+        self._lock = threading.Lock()
+        self._sweeping = threading.Lock()
+        self._bytes = 0
+        self._sweep()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self.disk.get, key)
+
+    async def put(self, key: str, blob: bytes, expires_at: float):
+        await asyncio.to_thread(self._put, key, blob, expires_at + self.stale_seconds)
+
+    def _put(self, key: str, blob: bytes, purge_at: float):
+        self.disk.put(key, blob, mtime=purge_at)
+        with self._lock:
+            # Overwrites are counted twice until the next sweep recounts, which only makes it come sooner
+            self._bytes += len(blob)
+            over = self._bytes > self.max_bytes
+        if over:
+            self._sweep()
+
+    def _sweep(self):
+        """Delete purged entries, then the soonest-to-purge ones while over 90% of max_bytes."""
+        if not self._sweeping.acquire(blocking=False):
+            return
+        try:
+            now = time.time()
+            kept, total = [], 0
+            for path, stat in self.disk.entries():
+                if stat.st_mtime <= now:
+                    self.disk.remove(path)
+                else:
+                    kept.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+            if total > self.max_bytes:
+                kept.sort()
+                for _, size, path in kept:
+                    if total <= self.max_bytes * 0.9:
+                        break
+                    self.disk.remove(path)
+                    total -= size
+            with self._lock:
+                self._bytes = total
+        finally:
+            self._sweeping.release()
+
+
+class ScrapeCache:
+    """Scraped pages keyed by canonical URL, zstd-compressed, with a byte-bounded in-memory hot tier.
+
+    Each entry records when it expires (per-domain TTL) and the origin's ETag /
+    Last-Modified validators, so an expired page can be revalidated with a
+    conditional request instead of being scraped again. The persistent tier is
+    a directory (SCRAPE_CACHE_DIR) or any store with async get/put, e.g. the
+    API's MongoDB store.
+    """
+
+    def __init__(self, max_bytes: int = None, directory: str = None):
+        max_bytes = max_bytes or int(os.getenv("SCRAPE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        directory = directory if directory is not None else os.getenv("SCRAPE_CACHE_DIR", "")
+        self.memory = LRUCache(max_bytes=max_bytes)
+        self.store = DiskScrapeStore(directory) if directory else None
+        self.default_ttl = int(os.getenv("SCRAPE_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+        self.domain_ttls = _parse_domain_ttls(os.getenv("SCRAPE_CACHE_DOMAIN_TTLS", ""))
+        self._compressor = zstandard.ZstdCompressor(level=int(os.getenv("SCRAPE_CACHE_ZSTD_LEVEL", "6")))
+        self._decompressor = zstandard.ZstdDecompressor()
+        # Fresh-entry lookups (for the metrics registry) and pages confirmed unchanged by their origin
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(canonicalize_url(url).encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url: str) -> int:
+        """TTL of the most specific configured domain suffix of the URL's host, else the default."""
+        host = (urlsplit(url).hostname or "").lower()
+        labels = host.split(".")
+        for i in range(len(labels)):
+            ttl = self.domain_ttls.get(".".join(labels[i:]))
+            if ttl is not None:
+                return ttl
+        return self.default_ttl
+
+    def _encode(self, entry: dict) -> bytes:
+        return self._compressor.compress(json.dumps(entry).encode("utf-8"))
+
+    def _decode(self, blob: bytes) -> dict:
+        return json.loads(self._decompressor.decompress(blob))
+
+    async def get(self, url: str) -> Tuple[Optional[dict], bool]:
+        """Return (entry, fresh). entry is None on a miss; a stale entry can still be revalidated."""
+        key = self.key_for(url)
+        blob = self.memory.get(key)
+        if blob is None and self.store is not None:
+            try:
+                blob = await self.store.get(key)
+            except Exception as e:
+                print(f"Scrape cache read error: {e}")
+                blob = None
+            if blob is not None:
+                self.memory.put(key, blob, len(blob))
+
+        entry = self._decode(blob) if blob is not None else None
+        fresh = entry is not None and entry["expires_at"] > time.time()
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry, fresh
+
+    async def put(self, url: str, page: dict, etag: str = None, last_modified: str = None) -> dict:
+        now = time.time()
+        entry = {
+            "url": canonicalize_url(url),
+            # Revalidation goes to the link as scraped; the canonical form may have changed its scheme
+            "source_url": url,
+            "page": page,
+            "fetched_at": now,
+            "expires_at": now + self.ttl_for(url),
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        await self._write(entry)
+        return entry
+
+    async def refresh(self, entry: dict) -> dict:
+        """The origin confirmed the page is unchanged: keep it for another TTL."""
+        self.revalidated += 1
+        entry = {**entry, "expires_at": time.time() + self.ttl_for(entry["url"])}
+        await self._write(entry)
+        return entry
+
+    async def _write(self, entry: dict):
+        key = self.key_for(entry["url"])
+        blob = self._encode(entry)
+        self.memory.put(key, blob, len(blob))
+        if self.store is not None:
+            try:
+                await self.store.put(key, blob, entry["expires_at"])
+            except Exception as e:
+                print(f"Scrape cache write error: {e}")
+
+
+# Shared by the Google News and reverse image search scrapes of every request
+scrape_cache = ScrapeCache()
@@ -1,41 +1,167 @@
 import os
-import requests
+import socket
+import asyncio
+import weakref
+import ipaddress
+from urllib.parse import urlsplit
+import httpx
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from firecrawl import FirecrawlApp
-import easyocr
-from serpapi import GoogleSearch
+from .ocr_engine import ocr_engine
+from .image_preprocessing import preprocess_image, retry_variant, pad_batch
+from .ocr_cache import ocr_cache
+from .scrape_cache import scrape_cache
+from .image_hash_index import image_hash_index, perceptual_hashes
+from .http_pool import create_client
+from .metrics import instrumented, record_upstream_error, registry as metrics_registry
+from .upstream import governor, UpstreamUnavailable
+from .deadline import budget, remaining
 load_dotenv()
 
+
+class BlockedURL(ValueError):
+    """A URL that may not be fetched: not http(s), or its host resolves to a non-public address."""
+
+
 class VerificationService:
 
     def __init__(self):
+        # Warm EasyOCR worker pool shared by every request
+        self.ocr_engine = ocr_engine
+        self.ocr_cache = ocr_cache
+        metrics_registry.register_cache("ocr", ocr_cache.memory)
+        # Scraped pages shared by the Google News and reverse image search scrapes
+        self.scrape_cache = scrape_cache
+        metrics_registry.register_cache("scrape", scrape_cache)
+        # Reverse image search results of perceptually similar images already searched
+        self.image_hash_index = image_hash_index
+        metrics_registry.register_cache("reverse_image", image_hash_index)
+
         # API keys
         self.SERPAPI_KEY = os.getenv("SERPAPI_KEY")
         self.FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY")
         self.FACTCHECK_API_KEY = os.getenv("FACTCHECK_API_KEY")
         self.X_BEARER_TOKEN = os.getenv("X_BEARER_TOKEN")
 
-        # Initialize Firecrawl client
-        if self.FIRECRAWL_API_KEY:
-            self.firecrawl = FirecrawlApp(api_key=self.FIRECRAWL_API_KEY)
-        else:
-            raise ValueError("Missing FIRECRAWL_API_KEY environment variable")
+        # Concurrent scraping limits
+        self.SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "5"))
+        self.SCRAPE_TIMEOUT_SECONDS = float(os.getenv("SCRAPE_TIMEOUT_SECONDS", "15"))
+        # Ask origins for ETag / Last-Modified so expired cached pages can be revalidated instead of re-scraped
+        self.SCRAPE_REVALIDATE = os.getenv("SCRAPE_CACHE_REVALIDATE", "true").lower() == "true"
+        self.REVALIDATE_TIMEOUT_SECONDS = float(os.getenv("SCRAPE_REVALIDATE_TIMEOUT_SECONDS", "5"))
+
+        # Process-wide cap on concurrent calls to each upstream, shared by every request;
+        # <NAME>_CONCURRENCY overrides UPSTREAM_CONCURRENCY for one upstream
+        default_limit = os.getenv("UPSTREAM_CONCURRENCY", "8")
+        self.UPSTREAM_LIMITS = {
+            name: int(os.getenv(f"{name.upper()}_CONCURRENCY", default_limit))
+            for name in ("serpapi", "firecrawl", "factcheck", "x_api", "gemini", "image_download", "origin")
+        }
+        self.MAX_IMAGE_DOWNLOAD_BYTES = int(os.getenv("MAX_IMAGE_DOWNLOAD_BYTES", str(10 * 1024 * 1024)))
+        self.MAX_IMAGE_REDIRECTS = int(os.getenv("MAX_IMAGE_REDIRECTS", "5"))
+        # Rate limits and circuit breakers are tracked per API key (see upstream.governor)
+        self.governor = governor
+
+        # Shared async HTTP clients and upstream semaphores, one set per event loop (neither can cross loops)
+        self._http_clients = weakref.WeakKeyDictionary()
+        self._upstream_semaphores = weakref.WeakKeyDictionary()
+        # Fire-and-forget work (e.g. scrape cache validator lookups), referenced until done
+        self._background_tasks = set()
+
+        # SerpAPI and Firecrawl are called over their REST APIs through the pooled client
+        self.SERPAPI_URL = os.getenv("SERPAPI_URL", "https://serpapi.com/search.json")
+        self.FIRECRAWL_API_URL = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev").rstrip("/")
 
         # Validate required keys
+        if not self.FIRECRAWL_API_KEY:
+            raise ValueError("Missing FIRECRAWL_API_KEY environment variable")
         if not self.SERPAPI_KEY:
             raise ValueError("Missing SERPAPI_KEY environment variable")
         if not self.X_BEARER_TOKEN:
             raise ValueError("Missing X_BEARER_TOKEN environment variable")
 
-    def reverse_image_search(self, img_url: str, num_results: int = 10):
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client shared by every upstream call made on the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._http_clients.get(loop)
+        if client is None:
+            client = create_client(timeout=20)
+            self._http_clients[loop] = client
+        return client
+
+    def upstream_limit(self, name: str) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent calls to one upstream (see UPSTREAM_LIMITS)."""
+        semaphores = self._upstream_semaphores.setdefault(asyncio.get_running_loop(), {})
+        semaphore = semaphores.get(name)
+        if semaphore is None:
+            semaphore = semaphores[name] = asyncio.Semaphore(self.UPSTREAM_LIMITS[name])
+        return semaphore
+
+    def _api_key(self, name: str):
+        return {
+            "serpapi": self.SERPAPI_KEY,
+            "firecrawl": self.FIRECRAWL_API_KEY,
+            "factcheck": self.FACTCHECK_API_KEY,
+            "x_api": self.X_BEARER_TOKEN,
+        }.get(name)
+
+    @asynccontextmanager
+    async def upstream(self, name: str, key: str = None):
+        """Concurrency limit, rate limit, circuit breaker and request deadline around one call to an external API.
+
+        Rate limits and circuits are per API key; `key` replaces the key for
+        upstreams without one (the "origin" sites are keyed by host).
+        Raises UpstreamUnavailable without calling out while the circuit is open,
+        and DeadlineExceeded (an UpstreamUnavailable) once the request is out of time.
+        """
+        async with budget(name):
+            async with self.upstream_limit(name):
+                async with self.governor.guard(name, key or self._api_key(name)):
+                    yield
+
+    def upstream_available(self, name: str, key: str = None) -> bool:
+        """False while calls to this upstream would be rejected by its circuit breaker."""
+        return self.governor.available(name, key or self._api_key(name))
+
+    def upstream_admits(self, name: str, key: str = None) -> bool:
+        """False while a call to this upstream would be rejected by its circuit breaker or rate limit."""
+        return self.governor.admits(name, key or self._api_key(name))
+
+    async def aclose(self):
+        """Close the HTTP client of the running event loop."""
+        client = self._http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def _serpapi_search(self, params: dict) -> dict:
+        async with self.upstream("serpapi"):
+            response = await self.http.get(self.SERPAPI_URL, params=params)
+            response.raise_for_status()
+        return response.json()
+
+    async def image_hashes(self, image_bytes: bytes):
+        """(pHash, dHash) of an encoded image, or None if it can't be decoded."""
+        try:
+            return await asyncio.to_thread(perceptual_hashes, image_bytes)
+        except Exception as e:
+            print(f"Image hashing error: {e}")
+            return None
+
+    def lookup_reverse_image(self, image_hashes):
+        """Reverse image search results of a near-identical image searched before, or None."""
+        return None if image_hashes is None else self.image_hash_index.get(image_hashes)
+
+    @instrumented("reverse_image_search")
+    async def reverse_image_search(self, img_url: str, num_results: int = 10, image_hashes=None):
+        """Google reverse image search; results are indexed under image_hashes (see lookup_reverse_image) when given."""
         try:
             params = {
                 "engine": "google_reverse_image",
                 "image_url": img_url,
                 "api_key": self.SERPAPI_KEY
             }
-            search = GoogleSearch(params)
-            results = search.get_dict()
+            results = await self._serpapi_search(params)
             image_result = results["image_results"]
             
             structured_results = []
@@ -49,27 +175,39 @@ class VerificationService:
                     "thumbnail": item.get("thumbnail"),
                 })
 
+            if image_hashes is not None and structured_results:
+                await asyncio.to_thread(self.image_hash_index.put, image_hashes, structured_results)
             return structured_results
 
+        except UpstreamUnavailable as e:
+            print(f"Reverse Image Search skipped: {e}")
+            return []
         except Exception as e:
             print(f"Reverse Image Search error: {e}")
+            record_upstream_error("reverse_image_search")
             return []
 
-    def search_google_news(self, query: str, num_results: int = 10):
+    @instrumented("search_google_news")
+    async def search_google_news(self, query: str, num_results: int = 10):
+        """Google News results for a query; [] when there are none, None when the search was skipped or failed."""
         try:
             params = {
                 "engine": "google_news",
                 "q": query,
                 "api_key": self.SERPAPI_KEY
             }
-            search = GoogleSearch(params)
-            results = search.get_dict()
+            results = await self._serpapi_search(params)
             return results.get("news_results", [])[:num_results]
+        except UpstreamUnavailable as e:
+            print(f"Google News Search skipped: {e}")
+            return None
         except Exception as e:
             print(f"Google News Search error: {e}")
-            return []
+            record_upstream_error("search_google_news")
+            return None
 
-    def fact_check(self, query: str, page_size: int = 10):
+    @instrumented("fact_check")
+    async def fact_check(self, query: str, page_size: int = 10):
         """Verify text claims using Google's FactCheck API."""
         try:
             url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
@@ -79,27 +217,165 @@ class VerificationService:
                 "pageSize": page_size,
                 "key": self.FACTCHECK_API_KEY
             }
-            response = requests.get(url, params=params, timeout=20)
-            response.raise_for_status()
+            async with self.upstream("factcheck"):
+                response = await self.http.get(url, params=params)
+                response.raise_for_status()
             return response.json()
+        except UpstreamUnavailable as e:
+            print(f"FactCheck API skipped: {e}")
+            return {}
         except Exception as e:
             print(f"FactCheck API error: {e}")
+            record_upstream_error("fact_check")
             return {}
 
-    def scrape_page(self, url: str):
-        """Scrape a webpage using Firecrawl."""
-        if not self.firecrawl:
-            print("Firecrawl API not initialized.")
-            return None
+    @instrumented("scrape_page")
+    async def scrape_page(self, url: str, timeout: float = None):
+        """Scrape a webpage to markdown; returns the page dict ("markdown", "metadata").
+
+        Served from the scrape cache while fresh. An expired page whose origin
+        answers a conditional request with 304 is kept without calling Firecrawl.
+        """
+        entry, fresh = await self.scrape_cache.get(url)
+        if fresh:
+            return entry["page"]
+        if entry and await self._unchanged(entry):
+            await self.scrape_cache.refresh(entry)
+            return entry["page"]
+
+        revalidate = self.SCRAPE_REVALIDATE and self.upstream_available("origin", urlsplit(url).hostname)
+        validators = asyncio.create_task(self._page_validators(url)) if revalidate else None
+        try:
+            page = await self._firecrawl_scrape(url, timeout)
+        except BaseException:
+            if validators:
+                validators.cancel()
+            raise
+        if not page:
+            if validators:
+                validators.cancel()
+            return page
+
+        await self.scrape_cache.put(url, page)
+        if validators:
+            # Don't hold the scrape up for a slow origin: add the validators to the entry once they arrive
+            task = asyncio.create_task(self._remember_validators(validators, url, page))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        return page
+
+    async def _remember_validators(self, validators: asyncio.Task, url: str, page: dict):
+        etag, last_modified = await validators
+        if etag or last_modified:
+            await self.scrape_cache.put(url, page, etag=etag, last_modified=last_modified)
+
+    async def _page_validators(self, url: str):
+        """(ETag, Last-Modified) the origin reports for a page, from a HEAD request."""
+        try:
+            response = await self._origin_head(url)
+            if response.status_code == 200:
+                return response.headers.get("etag"), response.headers.get("last-modified")
+        except Exception as e:
+            print(f"Validator lookup failed for {url}: {e}")
+        return None, None
+
+    async def _unchanged(self, entry: dict) -> bool:
+        """Conditional HEAD against the origin: True if it answers 304 Not Modified."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        if not headers or not self.SCRAPE_REVALIDATE:
+            return False
+        if not self.upstream_available("origin", urlsplit(entry["source_url"]).hostname):
+            return False
         try:
-            res = self.firecrawl.scrape(url, formats=["markdown"])
-            return res
+            response = await self._origin_head(entry["source_url"], headers)
+            return response.status_code == 304
+        except Exception as e:
+            print(f"Revalidation failed for {entry['source_url']}: {e}")
+            return False
+
+    async def _origin_head(self, url: str, headers: dict = None) -> httpx.Response:
+        """HEAD request to a scraped page's own site, under the "origin" upstream's limits for its host.
+
+        Redirects are not followed: a moved page simply has no usable validators.
+        """
+        await self._check_public_url(url)
+        async with self.upstream("origin", urlsplit(url).hostname):
+            return await self.http.head(url, headers=headers, timeout=self.REVALIDATE_TIMEOUT_SECONDS)
+
+    async def _firecrawl_scrape(self, url: str, timeout: float = None):
+        try:
+            payload = {"url": url, "formats": ["markdown"]}
+            if timeout:
+                # Firecrawl expects the timeout in milliseconds
+                payload["timeout"] = int(timeout * 1000)
+            async with self.upstream("firecrawl"):
+                response = await self.http.post(
+                    f"{self.FIRECRAWL_API_URL}/v2/scrape",
+                    json=payload,
+                    headers={"Authorization": f"Bearer {self.FIRECRAWL_API_KEY}"},
+                    timeout=timeout + 5 if timeout else 60
+                )
+                response.raise_for_status()
+            result = response.json()
+            if not result.get("success"):
+                raise ValueError(result.get("error") or "Firecrawl scrape failed")
+            return result.get("data") or {}
+        except UpstreamUnavailable as e:
+            print(f"Firecrawl scrape skipped: {e}")
+            return None
         except Exception as e:
             print(f"Firecrawl scrape error: {e}")
+            record_upstream_error("scrape_page")
             return None
 
-    def search_tweets(self, query: str, max_results: int = 10):
-        """Search recent tweets using Twitter/X API."""
+    @instrumented("scrape_pages")
+    async def scrape_pages(self, urls: list, max_success: int, concurrency: int = None, timeout: float = None):
+        """Scrape ranked URLs concurrently and stop once max_success pages succeeded.
+
+        At most `concurrency` scrapes are in flight; a URL that takes longer than
+        `timeout` seconds (or than the request's deadline leaves) is cancelled.
+        Returns (rank, scrape_result) pairs in rank order.
+        """
+        concurrency = concurrency or self.SCRAPE_CONCURRENCY
+        timeout = timeout or self.SCRAPE_TIMEOUT_SECONDS
+        scrape_timeout = remaining(timeout)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def scrape_ranked(rank: int, url: str):
+            async with semaphore:
+                try:
+                    return rank, await asyncio.wait_for(self.scrape_page(url, scrape_timeout), scrape_timeout)
+                except asyncio.TimeoutError:
+                    print(f"Scrape timed out after {scrape_timeout:.1f}s: {url}")
+                    # A scrape cut short by the request's deadline is not an upstream error
+                    if scrape_timeout >= timeout:
+                        record_upstream_error("scrape_page")
+                    return rank, None
+
+        tasks = [asyncio.create_task(scrape_ranked(rank, url)) for rank, url in enumerate(urls) if url]
+        scraped = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                rank, result = await next_done
+                if result:
+                    scraped[rank] = result
+                else:
+                    print(f"Warning: Failed to scrape content from {urls[rank]}")
+                if len(scraped) >= max_success:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return [(rank, scraped[rank]) for rank in sorted(scraped)][:max_success]
+
+    @instrumented("search_tweets")
+    async def search_tweets(self, query: str, max_results: int = 10):
+        """Search recent tweets using Twitter/X API; [] when none match, None when the search was skipped or failed."""
         print("query", query)
         try:
             url = "https://api.x.com/2/tweets/search/recent"
@@ -111,8 +387,9 @@ class VerificationService:
                 "user.fields": "id,name,username,verified,verified_type"
             }
             headers = {"Authorization": f"Bearer {self.X_BEARER_TOKEN}"}
-            response = requests.get(url, headers=headers, params=params, timeout=20)
-            response.raise_for_status()
+            async with self.upstream("x_api"):
+                response = await self.http.get(url, headers=headers, params=params)
+                response.raise_for_status()
             tweet_result = response.json()
             users = {user["id"]: user for user in tweet_result.get("includes", {}).get("users", [])}
 
@@ -132,27 +409,176 @@ class VerificationService:
                 }
                 structured_tweets.append(structured_data)
             return structured_tweets
+        except UpstreamUnavailable as e:
+            print(f"Twitter/X search skipped: {e}")
+            return None
         except Exception as e:
             print(f"Twitter/X search error: {e}")
-            return []
+            record_upstream_error("search_tweets")
+            return None
+
+    @instrumented("fetch_image")
+    async def fetch_image(self, url: str):
+        """Download a user-supplied image URL for OCR.
+
+        Every hop, redirects included, must resolve to public addresses only
+        (see _check_public_url). Non-images and anything over
+        MAX_IMAGE_DOWNLOAD_BYTES are refused.
+        """
+        try:
+            async with self.upstream_limit("image_download"):
+                for _ in range(self.MAX_IMAGE_REDIRECTS + 1):
+                    await self._check_public_url(url)
+                    async with self.http.stream("GET", url, follow_redirects=False) as response:
+                        if response.is_redirect:
+                            url = str(response.url.join(response.headers["location"]))
+                            continue
+                        response.raise_for_status()
+                        return await self._read_image(response)
+                raise ValueError(f"More than {self.MAX_IMAGE_REDIRECTS} redirects")
+        except BlockedURL as e:
+            print(f"Image download refused: {e}")
+            return None
+        except Exception as e:
+            print(f"Image download error: {e}")
+            record_upstream_error("fetch_image")
+            return None
+
+    async def _read_image(self, response: httpx.Response) -> bytes:
+        if not response.headers.get("content-type", "").startswith("image/"):
+            raise ValueError(f"Not an image: {response.headers.get('content-type')}")
+        declared = response.headers.get("content-length", "")
+        if declared.isdigit() and int(declared) > self.MAX_IMAGE_DOWNLOAD_BYTES:
+            raise ValueError(f"Image too large: {declared} bytes")
+        content = bytearray()
+        async for chunk in response.aiter_bytes():
+            content.extend(chunk)
+            if len(content) > self.MAX_IMAGE_DOWNLOAD_BYTES:
+                raise ValueError("Image too large")
+        return bytes(content)
+
+    @staticmethod
+    async def _check_public_url(url: str):
+        """Raise BlockedURL unless url is http(s) and every address its host resolves to is public.
+
+        Private, loopback, link-local (cloud metadata), multicast and reserved
+        ranges are all refused, IPv4-mapped IPv6 included.
+        """
+        target = httpx.URL(url)
+        if target.scheme not in ("http", "https") or not target.host:
+            raise BlockedURL(f"Unsupported URL: {url}")
+        port = target.port or (443 if target.scheme == "https" else 80)
+        infos = await asyncio.get_running_loop().getaddrinfo(target.host, port, type=socket.SOCK_STREAM)
+        for *_, sockaddr in infos:
+            address = ipaddress.ip_address(sockaddr[0].split("%", 1)[0])
+            if getattr(address, "ipv4_mapped", None):
+                address = address.ipv4_mapped
+            if not address.is_global or address.is_multicast:
+                raise BlockedURL(f"{target.host} resolves to non-public address {address}")
 
     # ---------------- OCR ---------------- #
-    def run_ocr(self, img_path: str):
-        """Extract text from image using EasyOCR."""
+    @instrumented("prepare_image")
+    async def prepare_image(self, image):
+        """Load and preprocess an image (raw bytes or a path relative to src/) once so every OCR pass reuses the same array."""
         try:
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            abs_path = os.path.join(base_dir, img_path)
+            if image is None:
+                raise ValueError("No image content provided")
+            if isinstance(image, str):
+                base_dir = os.path.dirname(os.path.abspath(__file__))
+                image = os.path.join(base_dir, image)
+
+                if not os.path.exists(image):
+                    raise FileNotFoundError(f"Image not found at: {image}")
+
+            # NumPy/PIL work is CPU-bound; keep it off the event loop
+            return await asyncio.to_thread(preprocess_image, image)
 
-            if not os.path.exists(abs_path):
-                raise FileNotFoundError(f"Image not found at: {abs_path}")
+        except Exception as e:
+            print(f"Image preprocessing error: {e}")
+            return None
+
+    def ocr_cache_key(self, image):
+        """Content hash of a preprocessed image, or None if there is no image."""
+        return None if image is None else self.ocr_cache.key_for(image)
 
-            # Load reader once for performance (optional: move to __init__)
-            ocr_reader = easyocr.Reader(['en'])
-            results = ocr_reader.readtext(abs_path)
+    def lookup_ocr(self, cache_key: str):
+        """Return previously extracted text for this image, if any."""
+        return self.ocr_cache.get(cache_key) if cache_key else None
+
+    @instrumented("run_ocr")
+    async def run_ocr(self, image, cache_key: str = None):
+        """Extract text from a preprocessed image array using the warm EasyOCR worker pool."""
+        if image is None:
+            return ""
+        try:
+            extracted_text = await self.ocr_engine.aread_text(image)
+            # "" is a result too (no text); only failures are left uncached
+            if extracted_text is not None and cache_key:
+                self.ocr_cache.put(cache_key, extracted_text)
+            return extracted_text
 
-            extracted_text = " ".join([res[1] for res in results])
-            return extracted_text.strip()      
-              
         except Exception as e:
             print(f"OCR error: {e}")
+            record_upstream_error("run_ocr")
+            return ""
+
+    @instrumented("retry_ocr")
+    async def retry_ocr(self, image, cache_key: str = None):
+        """Second OCR pass for an image whose detected text regions came back unrecognized.
+
+        Runs on retry_variant (harder contrast, upscaled) rather than repeating
+        the same deterministic call on the same array.
+        """
+        if image is None:
+            return ""
+        try:
+            variant = await asyncio.to_thread(retry_variant, image)
+        except Exception as e:
+            print(f"OCR retry preprocessing error: {e}")
             return ""
+        return await self.run_ocr(variant, cache_key=cache_key)
+
+    @instrumented("run_gated_ocr")
+    async def run_gated_ocr(self, image, cache_key: str = None):
+        """OCR behind a cheap text-detection gate.
+
+        Returns (number of detected text regions, extracted text); regions is 0
+        when the gate skipped recognition and None when OCR could not run.
+        """
+        if image is None:
+            return None, ""
+        try:
+            regions, extracted_text = await self.ocr_engine.aread_text_gated(image)
+            # Detected-but-unread text is left for retry_ocr to cache; a gated-out image caches as ""
+            if cache_key and (extracted_text or regions == 0):
+                self.ocr_cache.put(cache_key, extracted_text)
+            return regions, extracted_text
+
+        except Exception as e:
+            print(f"OCR error: {e}")
+            record_upstream_error("run_gated_ocr")
+            return None, ""
+
+    @instrumented("run_ocr_batch")
+    async def run_ocr_batch(self, images: list):
+        """Extract text from several images, sending only cache misses through one gated, batched OCR pass.
+
+        Returns the text per image: "" when the image has no text, None when
+        there is no image or OCR could not run on it.
+        """
+        cache_keys = [self.ocr_cache_key(image) for image in images]
+        texts = [self.lookup_ocr(cache_key) for cache_key in cache_keys]
+
+        pending = [i for i, text in enumerate(texts) if text is None and images[i] is not None]
+        if pending:
+            try:
+                results = await self.ocr_engine.aread_text_batch(pad_batch([images[i] for i in pending]))
+                for i, (_, extracted_text) in zip(pending, results):
+                    texts[i] = extracted_text
+                    if extracted_text is not None and cache_keys[i]:
+                        self.ocr_cache.put(cache_keys[i], extracted_text)
+            except Exception as e:
+                print(f"Batched OCR error: {e}")
+                record_upstream_error("run_ocr_batch")
+
+        return texts
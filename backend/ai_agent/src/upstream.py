@@ -0,0 +1,282 @@
+import os
+import time
+import asyncio
+import hashlib
+import threading
+from email.utils import parsedate_to_datetime
+from contextlib import asynccontextmanager
+from typing import Optional
+import httpx
+from .metrics import CallbackGauge, upstream_rejections, registry as metrics_registry
+
+# Requests per second and burst size per API key, overridable with <NAME>_RATE_PER_SECOND / <NAME>_BURST.
+# X recent search allows 450 requests per 15 minutes per app. "origin" is per site
+# (the validator HEADs scrape caching sends to the scraped pages' own hosts).
+DEFAULT_RATES = {
+    "serpapi": (5.0, 10),
+    "firecrawl": (5.0, 10),
+    "factcheck": (10.0, 20),
+    "x_api": (0.5, 5),
+    "origin": (1.0, 5),
+}
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class UpstreamUnavailable(Exception):
+    """Raised instead of calling an upstream whose circuit is open or whose rate limit is exhausted."""
+
+    def __init__(self, upstream: str, reason: str, retry_in: float = 0.0):
+        super().__init__(f"{upstream} unavailable ({reason}, retry in {retry_in:.1f}s)")
+        self.upstream = upstream
+        self.reason = reason
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second up to `burst`.
+
+    Tokens can be reserved ahead of time (the balance goes negative), so each
+    caller knows exactly how long to sleep without a wake-up race.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait_time(self) -> float:
+        """Seconds a call made now would wait for its token, without taking one."""
+        with self._lock:
+            tokens = min(self.burst, self._tokens + (time.monotonic() - self._updated) * self.rate)
+            return max(0.0, (1 - tokens) / self.rate)
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Take a token; return the seconds to wait before using it, or None if that exceeds max_wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures (or one 429).
+
+    While open every call is rejected. Once the cooldown passes the breaker is
+    half-open and lets a single probe through: success closes it, failure
+    re-opens it with twice the previous cooldown (capped at max_cooldown).
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float, max_cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _refresh(self, now: float):
+        if self.state == OPEN and now >= self._open_until:
+            self.state = HALF_OPEN
+            self._probing = False
+
+    def retry_in(self) -> float:
+        """Seconds until a call would be let through (0 when one would be now)."""
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            if self.state == OPEN:
+                return self._open_until - now
+            if self.state == HALF_OPEN and self._probing:
+                return self._cooldown
+            return 0.0
+
+    def allow(self) -> bool:
+        """Whether a call may proceed; in half-open state only one probe at a time is allowed."""
+        with self._lock:
+            self._refresh(time.monotonic())
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._cooldown = self.base_cooldown
+            self._probing = False
+
+    def record_failure(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                # The probe failed: back off further before the next one
+                self._cooldown = min(self._cooldown * 2, self.max_cooldown)
+            elif retry_after is None and self.failures < self.failure_threshold:
+                return
+            self.state = OPEN
+            self._probing = False
+            cooldown = self._cooldown if retry_after is None else min(max(retry_after, 1.0), self.max_cooldown)
+            self._open_until = time.monotonic() + cooldown
+
+    def release_probe(self):
+        """The probe ended without a verdict (e.g. cancelled): let another one through."""
+        with self._lock:
+            self._probing = False
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None) or getattr(exc, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds the upstream asked us to back off, from Retry-After or X's x-rate-limit-reset."""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+    reset = headers.get("x-rate-limit-reset")
+    if reset:
+        try:
+            return float(reset) - time.time()
+        except ValueError:
+            return None
+    return None
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Errors that say the upstream itself is unhealthy, as opposed to a bad request or bad target page."""
+    status = _status_code(exc)
+    if status is not None:
+        return status in (408, 429) or status >= 500
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError, TimeoutError, ConnectionError))
+
+
+class UpstreamGovernor:
+    """Process-wide rate limiting and circuit breaking for every upstream API, per API key.
+
+    Every web and worker process has its own buckets, so each one gets an
+    equal share of the configured rate and burst: UPSTREAM_PROCESSES, which
+    defaults to WEB_CONCURRENCY (uvicorn workers, 1) plus WORKER_PROCESSES (2).
+    """
+
+    def __init__(self, processes: int = None):
+        self.processes = max(1, processes or int(os.getenv("UPSTREAM_PROCESSES") or (
+            int(os.getenv("WEB_CONCURRENCY", "1")) + int(os.getenv("WORKER_PROCESSES", "2"))
+        )))
+        self.failure_threshold = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.cooldown = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "30"))
+        self.max_cooldown = float(os.getenv("CIRCUIT_MAX_COOLDOWN_SECONDS", "300"))
+        # Longest a call queues for a rate-limit token before giving up on that upstream
+        self.max_rate_wait = float(os.getenv("UPSTREAM_MAX_RATE_WAIT_SECONDS", "5"))
+        self._buckets = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(upstream: str, api_key: Optional[str]) -> tuple:
+        # Never keep the secret itself around as a dict key
+        return upstream, hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+
+    def _bucket(self, key: tuple) -> Optional[TokenBucket]:
+        upstream = key[0]
+        with self._lock:
+            if key not in self._buckets:
+                rate, burst = DEFAULT_RATES.get(upstream, (0.0, 0))
+                rate = float(os.getenv(f"{upstream.upper()}_RATE_PER_SECOND", str(rate))) / self.processes
+                burst = int(os.getenv(f"{upstream.upper()}_BURST", str(burst))) // self.processes
+                self._buckets[key] = TokenBucket(rate, max(burst, 1)) if rate > 0 else None
+            return self._buckets[key]
+
+    def breaker(self, upstream: str, api_key: Optional[str] = None) -> CircuitBreaker:
+        key = self._key(upstream, api_key)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(self.failure_threshold, self.cooldown, self.max_cooldown)
+            return breaker
+
+    def available(self, upstream: str, api_key: Optional[str] = None) -> bool:
+        """False while the upstream's circuit would reject a call, so callers can route around it."""
+        return self.breaker(upstream, api_key).retry_in() <= 0
+
+    def admits(self, upstream: str, api_key: Optional[str] = None) -> bool:
+        """True when a call made now would get past both the circuit breaker and the rate limit."""
+        if not self.available(upstream, api_key):
+            return False
+        bucket = self._bucket(self._key(upstream, api_key))
+        return bucket is None or bucket.wait_time() <= self.max_rate_wait
+
+    @asynccontextmanager
+    async def guard(self, upstream: str, api_key: Optional[str] = None):
+        """Fail fast if the circuit is open, wait for a rate-limit token, and record the call's outcome."""
+        breaker = self.breaker(upstream, api_key)
+        if not breaker.allow():
+            upstream_rejections.inc(upstream=upstream, reason="circuit_open")
+            raise UpstreamUnavailable(upstream, "circuit open", breaker.retry_in())
+
+        try:
+            bucket = self._bucket(self._key(upstream, api_key))
+            if bucket is not None:
+                wait = bucket.reserve(self.max_rate_wait)
+                if wait is None:
+                    upstream_rejections.inc(upstream=upstream, reason="rate_limited")
+                    raise UpstreamUnavailable(upstream, "rate limited", self.max_rate_wait)
+                if wait:
+                    await asyncio.sleep(wait)
+            yield
+        except UpstreamUnavailable:
+            breaker.release_probe()
+            raise
+        except asyncio.CancelledError:
+            # Cancelled by a deadline or a winning sibling: says nothing about the upstream
+            breaker.release_probe()
+            raise
+        except Exception as e:
+            if is_upstream_failure(e):
+                breaker.record_failure(_retry_after(e) if _status_code(e) == 429 else None)
+            else:
+                breaker.record_success()
+            raise
+        else:
+            breaker.record_success()
+
+    def states(self) -> dict:
+        with self._lock:
+            breakers = list(self._breakers.items())
+        states = {}
+        for (upstream, _), breaker in breakers:
+            breaker.retry_in()  # moves an expired open circuit to half-open
+            states[(upstream,)] = max(states.get((upstream,), 0), _STATE_VALUES[breaker.state])
+        return states
+
+
+# Shared by every VerificationService in the process
+governor = UpstreamGovernor()
+
+metrics_registry.register(CallbackGauge(
+    "verihub_upstream_circuit_state", "Circuit breaker state per upstream: 0 closed, 1 half-open, 2 open.",
+    ("upstream",), governor.states
+))
@@ -1,55 +1,183 @@
-from typing import Dict, Any
+import os
+import time
+import json
+import asyncio
+import inspect
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from langgraph.graph import StateGraph, END
+from langgraph.config import get_stream_writer
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langchain.chat_models import init_chat_model
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
 from .tools import VerificationService
+from .llm_cache import llm_cache
 from .prompts import VerificationCheckPrompts
 from .models import VerificationSummary, TextCheck, ImageCheck
+from . import metrics
+from .deadline import Deadline, DeadlineExceeded, current_deadline, remaining, budget
+from .query_builder import build_x_query, build_news_query, MIN_CONFIDENCE
+from .passage_selection import select_passages, IMAGE_TOKEN_BUDGET
 from .helper import format_sources_for_llm, extract_sources_from_factcheck_response, format_search_and_scrape_result
 
+class ResumeInputMismatch(ValueError):
+    """A thread_id's checkpoints belong to a run of different input than the one being resumed."""
+
+
 class Workflow:
-    def __init__(self):
+    # Successful scrapes needed before the remaining links are skipped
+    NEWS_SCRAPE_TARGET = 5
+    IMAGE_SCRAPE_TARGET = 5
+    MODEL = "gemini-2.5-flash"
+    # Seconds before an LLM call is abandoned, deadline or not
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    # Deadline mode: time every earlier stage leaves for the summary, the least worth starting an LLM summary
+    # with, the least worth trying the next evidence source with, and the scrape time assumed per page
+    SUMMARY_RESERVE_SECONDS = float(os.getenv("DEADLINE_SUMMARY_RESERVE_SECONDS", "1.5"))
+    SUMMARY_MIN_SECONDS = float(os.getenv("DEADLINE_SUMMARY_MIN_SECONDS", "1.0"))
+    FALLBACK_MIN_SECONDS = float(os.getenv("DEADLINE_FALLBACK_MIN_SECONDS", "2.0"))
+    SECONDS_PER_SCRAPE = float(os.getenv("DEADLINE_SECONDS_PER_SCRAPE", "1.0"))
+    # VerificationSummary fields describing how a run was served rather than what it found
+    RUN_METADATA_FIELDS = {
+        "evidence_mode", "timings", "cached", "cached_age_seconds", "matched_claim", "match_similarity", "deadline_exceeded"
+    }
+    # Text evidence sources in fallback order, with the upstreams each one cannot work without
+    EVIDENCE_CHAIN = (
+        ("fact_check_node", ("factcheck",)),
+        ("twitter_node", ("x_api",)),
+        ("google_news_node", ("serpapi",)),
+    )
+
+    def __init__(self, checkpointer: Optional[BaseCheckpointSaver] = None):
         self.tool = VerificationService()
-        self.llm = init_chat_model(model="gemini-2.5-flash", model_provider="google-genai")
-        self.ocr_llm = init_chat_model(model="gemini-2.5-flash", model_provider="google-genai")
+        self.llm_cache = llm_cache
+        llm_metrics = metrics.LLMMetricsHandler(self.MODEL)
+        self.llm = init_chat_model(model=self.MODEL, model_provider="google-genai", callbacks=[llm_metrics])
+        self.ocr_llm = init_chat_model(model=self.MODEL, model_provider="google-genai", callbacks=[llm_metrics])
         self.prompts = VerificationCheckPrompts()
         self.workflow = self._build_workflow()
-        
-    def _build_workflow(self):
+        # Same graph with a checkpoint after every node, for runs given a thread_id
+        self.resumable_workflow = self._build_workflow(checkpointer) if checkpointer else None
+
+    def attach_checkpointer(self, checkpointer: BaseCheckpointSaver):
+        """Checkpoint runs given a thread_id, so a rerun with the same thread_id resumes instead of starting over."""
+        self.resumable_workflow = self._build_workflow(checkpointer)
+
+    def _build_workflow(self, checkpointer: Optional[BaseCheckpointSaver] = None):
         graph = StateGraph(VerificationSummary)
-        graph.add_node("router", self._input_router)
-        graph.add_node("img_check", self._img_check_node)
-        graph.add_node("fact_check_node", self._fact_check_node)
-        graph.add_node("twitter_node", self._twitter_node)
-        graph.add_node("google_news_node", self._google_news_node)
-        graph.add_node("summary", self._summary_node)  
+        graph.add_node("router", self._instrumented_node("router", self._input_router))
+        graph.add_node("img_check", self._instrumented_node("img_check", self._img_check_node))
+        graph.add_node("fact_check_node", self._instrumented_node("fact_check_node", self._fact_check_node))
+        graph.add_node("twitter_node", self._instrumented_node("twitter_node", self._twitter_node))
+        graph.add_node("google_news_node", self._instrumented_node("google_news_node", self._google_news_node))
+        graph.add_node("evidence_fanout", self._instrumented_node("evidence_fanout", self._evidence_fanout_node))
+        graph.add_node("near_duplicate_node", self._instrumented_node("near_duplicate_node", self._near_duplicate_node))
+        graph.add_node("summary", self._instrumented_node("summary", self._summary_node))  
         
         graph.set_entry_point("router")
         
         graph.add_conditional_edges("router", self._route_input, {
             "img_check": "img_check",
-            "fact_check_node": "fact_check_node"
+            "near_duplicate_node": "near_duplicate_node",
+            "fact_check_node": "fact_check_node",
+            "twitter_node": "twitter_node",
+            "google_news_node": "google_news_node",
+            "evidence_fanout": "evidence_fanout"
+        })
+
+        graph.add_conditional_edges("near_duplicate_node", self._near_duplicate_router, {
+            "success": "summary",
+            "fact_check_node": "fact_check_node",
+            "twitter_node": "twitter_node",
+            "google_news_node": "google_news_node",
+            "evidence_fanout": "evidence_fanout"
         })
         
         graph.add_conditional_edges("img_check",self._is_extracted_text, {
-            "success": "fact_check_node",
+            "fact_check_node": "fact_check_node",
+            "twitter_node": "twitter_node",
+            "google_news_node": "google_news_node",
+            "speculative": "evidence_fanout",
             "failure": "summary"
         })   
         
-        graph.add_conditional_edges("fact_check_node", self._result_router, {
+        graph.add_conditional_edges("fact_check_node", self._fallback_router("fact_check_node"), {
             "success": "summary",   
-            "failure": "twitter_node"  
+            "twitter_node": "twitter_node",
+            "google_news_node": "google_news_node"
         })
 
-        graph.add_conditional_edges("twitter_node", self._result_router, {
+        graph.add_conditional_edges("twitter_node", self._fallback_router("twitter_node"), {
             "success": "summary",   
-            "failure": "google_news_node"  
+            "google_news_node": "google_news_node"  
         })
 
         graph.add_edge("google_news_node", "summary")
+        graph.add_edge("evidence_fanout", "summary")
         graph.add_edge("summary", END)
-        return graph.compile()
+        return graph.compile(checkpointer=checkpointer)
     
+    def _instrumented_node(self, name: str, node: Callable) -> Callable:
+        """Wrap a graph node to record its latency, process-wide and in the run's timings.
+
+        Tool and LLM time spent inside the node is added to the run's timings as
+        well (see metrics.request_timings), e.g. "tools.fact_check" or "llm".
+        With a deadline, the node runs under its stage's budget (see
+        deadline.current_deadline): every stage but the summary leaves
+        SUMMARY_RESERVE_SECONDS for it.
+        """
+        wants_config = "config" in inspect.signature(node).parameters
+
+        async def instrumented(state: VerificationSummary, config: RunnableConfig) -> Dict[str, Any]:
+            deadline = config.get("configurable", {}).get("deadline")
+            stage_deadline = deadline
+            if deadline is not None and name != "summary":
+                stage_deadline = deadline.shortened(self.SUMMARY_RESERVE_SECONDS)
+            stage_timings = {}
+            token = metrics.request_timings.set(stage_timings)
+            deadline_token = current_deadline.set(stage_deadline)
+            start = time.perf_counter()
+            try:
+                update = node(state, config) if wants_config else node(state)
+                if inspect.isawaitable(update):
+                    update = await update
+            except DeadlineExceeded as e:
+                # Out of time before the node had anything: keep what earlier stages found
+                print(f"{name} stopped: {e}")
+                update = {"deadline_exceeded": True}
+            finally:
+                elapsed = time.perf_counter() - start
+                metrics.request_timings.reset(token)
+                current_deadline.reset(deadline_token)
+                metrics.node_duration.observe(elapsed, node=name)
+
+            update = update or {}
+            if stage_deadline is not None and self._cut_short(name, update, stage_deadline):
+                update = {**update, "deadline_exceeded": True}
+            timings = {**state.timings, **update.get("timings", {})}
+            for stage, seconds in stage_timings.items():
+                timings[stage] = round(timings.get(stage, 0.0) + seconds, 3)
+            timings[name] = round(elapsed, 3)
+            return {**update, "timings": timings}
+
+        return instrumented
+
+    def _cut_short(self, name: str, update: Dict[str, Any], stage_deadline: Deadline) -> bool:
+        """Whether the deadline left this node's result less thorough than a run without one.
+
+        True once the stage's budget is spent, or when an evidence node with a
+        fallback found no confident verdict and too little time is left to try
+        the next source (its conditional edge then goes straight to the summary).
+        """
+        if stage_deadline.expired():
+            return True
+        has_fallback = name == "near_duplicate_node" or name in [node for node, _ in self.EVIDENCE_CHAIN[:-1]]
+        return (
+            has_fallback
+            and stage_deadline.remaining() < self.FALLBACK_MIN_SECONDS
+            and not self._is_confident(update.get("text_check"))
+        )
+
     def _input_router(self, state: VerificationSummary) -> Dict[str, Any]:
         """Process input and return state updates (not routing decision)."""
         # This node just passes through the state - routing is handled by _route_input
@@ -60,49 +188,36 @@ class Workflow:
         if state.input_type == "image":
             return "img_check"
         elif state.input_type == "text":
-            return "fact_check_node"
+            if state.near_duplicate_check:
+                return "near_duplicate_node"
+            return "evidence_fanout" if state.evidence_mode == "speculative" else self._next_evidence_node()
         else:
             raise ValueError(f"Unknown input type: {state.input_type}")
   
     """Image verification stages"""
-    def _img_check_node(self, state: VerificationSummary) -> Dict[str, Any]:
-        """Process image verification - extract text and perform reverse image search."""
+    async def _img_check_node(self, state: VerificationSummary, config: RunnableConfig) -> Dict[str, Any]:
+        """Process image verification - extract text and perform reverse image search.
+
+        The claim branch (OCR → generalization LLM) and the evidence branch
+        (Cloudinary upload → reverse image search → scraping) do not depend on
+        each other, so they run concurrently and are joined for the verification LLM.
+        """
+        image_uploader = config.get("configurable", {}).get("image_uploader")
+        image_bytes = config.get("configurable", {}).get("image_bytes")
+        timings = dict(state.timings)
         llm_generated_claim = ""   
         extracted_text = ""        
+        img_url = state.raw_input
 
         try:
-            # Run OCR
-            extracted_text = self.tool.run_ocr("image.png") or ""
-            tools_used = state.tools_used + ["ocr"]
-            if not extracted_text.strip():
-                # print("\nre-running easyocr")
-                tools_used.append("2nd_ocr")
-                extracted_text = self.tool.run_ocr("image.png") or ""
-
-            # If OCR fails completely → return error
-            if not extracted_text.strip():
-                return self._create_img_error_response(
-                    state=state,
-                    llm_generated_claim="[OCR failed: no text]",
-                    extracted_text="",
-                    result_from="img_check_no_text",
-                    img_found=False
-                )
-
-            print("\n Extracted_text: ", extracted_text)
-            # Send OCR result to LLM for generalization
-            ocr_messages = [
-                SystemMessage(content=self.prompts.TEXT_GENERALIZATION_SYSTEM),
-                HumanMessage(content=self.prompts.text_generation_user(extracted_text=extracted_text))
-            ]
-            
-            llm_resp = self.ocr_llm.invoke(ocr_messages)
-            llm_generated_claim = (getattr(llm_resp, "content", "") or "").strip() or extracted_text.strip()
-            print("\n llm generated claim: ", llm_generated_claim)
-            
-            # Reverse image search
-            image_search_results = self.tool.reverse_image_search(state.raw_input)
-            tools_used.append("reverse_image_search")
+            (extracted_text, llm_generated_claim, tools_used), (
+                img_url, image_search_results, image_verification_result, evidence_tools
+            ) = await asyncio.gather(
+                self._image_claim_branch(state, image_bytes, timings),
+                self._image_evidence_branch(state, image_bytes, image_uploader, timings)
+            )
+            tools_used = state.tools_used + tools_used + evidence_tools
+            has_text = bool(extracted_text.strip())
             
             if not image_search_results:
                 print("no img result")
@@ -110,50 +225,46 @@ class Workflow:
                     state=state,
                     llm_generated_claim=llm_generated_claim,
                     extracted_text=extracted_text,
-                    result_from="img_check_no_results",
-                    img_found=False
+                    result_from="img_check_no_results" if has_text else "img_check_no_text",
+                    img_found=False,
+                    img_url=img_url,
+                    tools_used=tools_used,
+                    timings=timings
                 )
 
-            # Scrape image URLs content
-            total_page_scraped = 0
-            image_verification_result = []
-            for image_search_result in image_search_results:
-                url = image_search_result.get('link')
-                if url: 
-                    print("\n Scrapping link: ", url)
-                    scrape_image_url_result = self.tool.scrape_page(url)
-                    if "firecrawl_api" not in tools_used:
-                        tools_used.append("firecrawl_api")
-                    if scrape_image_url_result:
-                        if total_page_scraped == 5:  
-                            print("scraped all links")
-                            break
-                        total_page_scraped = total_page_scraped + 1
-                        structured_data = {
-                            **image_search_result,
-                            "image_scrape_content": scrape_image_url_result.markdown[:1500]
-                        }
-                        image_verification_result.append(structured_data)
-            print("Done generating verification results")
+            # Keep only the passages of each page that bear on the claim (or, without text, on its title)
+            image_verification_result = [
+                {
+                    **page,
+                    "image_scrape_content": select_passages(
+                        page["image_scrape_content"],
+                        llm_generated_claim if has_text else (page.get("title") or ""),
+                        IMAGE_TOKEN_BUDGET
+                    )
+                }
+                for page in image_verification_result
+            ]
             
             # Verification LLM
             messages = [
                 SystemMessage(content=self.prompts.IMAGE_VERIFICATION_SYSTEM),
                 HumanMessage(content=self.prompts.img_verification_user(
                     claim=llm_generated_claim,
-                    img_url=state.raw_input,
+                    img_url=img_url,
                     image_metadata=image_verification_result
                 ))
             ]
 
-            structured_llm = self.llm.with_structured_output(ImageCheck)
-            result: ImageCheck = structured_llm.invoke(messages)
+            result: ImageCheck = await self._timed(timings, "img_check.verification_llm", self._ainvoke(messages, schema=ImageCheck))
             # print("Match result of img_node: ", result)
             return {
+                "raw_input": img_url,
                 "claim": llm_generated_claim,
                 "img_check": result,
                 "tools_used":tools_used,
-                "result_from": "img_check"
+                # Text-free images have no claim to fact-check, so they go straight to the summary
+                "result_from": "img_check" if has_text else "img_check_no_text",
+                "timings": timings
             }
 
         except Exception as e:
@@ -163,8 +274,136 @@ class Workflow:
                 llm_generated_claim=llm_generated_claim,
                 extracted_text=extracted_text,
                 result_from="img_check_error",
-                img_found=False
+                img_found=False,
+                img_url=img_url,
+                timings=timings
+            )
+
+    async def _image_claim_branch(self, state: VerificationSummary, image_bytes: Optional[bytes], timings: Dict[str, float]):
+        """OCR the image and turn the text into a fact-checkable claim.
+
+        Returns (extracted_text, llm_generated_claim, tools_used).
+        """
+        if state.ocr_text is not None:
+            # Text already extracted by a batched multi-image OCR pass
+            extracted_text = state.ocr_text
+            tools_used = ["batched_ocr"]
+        else:
+            start = time.perf_counter()
+            # Preprocess once, then run OCR on the in-memory array
+            ocr_image = await self.tool.prepare_image(image_bytes)
+            ocr_key = self.tool.ocr_cache_key(ocr_image)
+            cached_text = self.tool.lookup_ocr(ocr_key)
+            if cached_text is not None:
+                # A cached "" is a known text-free image, not a miss
+                extracted_text = cached_text
+                tools_used = ["ocr_cache"]
+            else:
+                # Cheap text detection first; recognition only runs when text regions exist
+                text_regions, extracted_text = await self.tool.run_gated_ocr(ocr_image, cache_key=ocr_key)
+                tools_used = ["ocr"]
+                if text_regions == 0:
+                    tools_used.append("text_gate")
+                elif text_regions is None:
+                    # Not the same as an image without text; a retry would hit the same error
+                    tools_used.append("ocr_failed")
+                elif not extracted_text.strip():
+                    # Text was detected but not read: retry on an upscaled, harder-contrast copy
+                    tools_used.append("2nd_ocr")
+                    extracted_text = await self.tool.retry_ocr(ocr_image, cache_key=ocr_key) or ""
+            timings["img_check.ocr"] = round(time.perf_counter() - start, 3)
+
+        # No text in the image → skip claim generation and verify the image alone
+        if not extracted_text.strip():
+            return "", "[No text detected in image]", tools_used
+
+        print("\n Extracted_text: ", extracted_text)
+        # Send OCR result to LLM for generalization
+        ocr_messages = [
+            SystemMessage(content=self.prompts.TEXT_GENERALIZATION_SYSTEM),
+            HumanMessage(content=self.prompts.text_generation_user(extracted_text=extracted_text))
+        ]
+
+        llm_resp = await self._timed(timings, "img_check.generalization_llm", self._ainvoke(ocr_messages, llm=self.ocr_llm))
+        llm_generated_claim = (llm_resp or "").strip() or extracted_text.strip()
+        print("\n llm generated claim: ", llm_generated_claim)
+        return extracted_text, llm_generated_claim, tools_used
+
+    async def _image_evidence_branch(
+        self, state: VerificationSummary, image_bytes: Optional[bytes], image_uploader, timings: Dict[str, float]
+    ):
+        """Host the image, reverse-search it and scrape the matching pages.
+
+        Returns (img_url, image_search_results, image_verification_result, tools_used).
+        """
+        tools_used = []
+        img_url = state.raw_input
+        if image_uploader:
+            tools_used.append("cloudinary_upload")
+            try:
+                img_url = await self._timed(timings, "img_check.upload", image_uploader()) or ""
+            except Exception as e:
+                print(f"Image upload error: {e}")
+                img_url = ""
+        if not img_url:
+            return img_url, [], [], tools_used
+
+        # Reverse image search, unless a resized or recompressed copy of this image was searched before
+        image_hashes = None
+        if image_bytes is not None:
+            image_hashes = await self._timed(timings, "img_check.image_hash", self.tool.image_hashes(image_bytes))
+        image_search_results = self.tool.lookup_reverse_image(image_hashes)
+        if image_search_results:
+            tools_used.append("reverse_image_cache")
+        else:
+            image_search_results = await self._timed(
+                timings, "img_check.reverse_image_search",
+                self.tool.reverse_image_search(img_url, image_hashes=image_hashes)
             )
+            tools_used.append("reverse_image_search")
+        if not image_search_results:
+            return img_url, [], [], tools_used
+
+        # Scrape image URLs content
+        tools_used.append("firecrawl_api")
+        max_success, scrape_timeout = self._scrape_budget(self.IMAGE_SCRAPE_TARGET)
+        scraped_pages = await self._timed(timings, "img_check.scrape", self.tool.scrape_pages(
+            [image_search_result.get('link') for image_search_result in image_search_results],
+            max_success=max_success,
+            timeout=scrape_timeout
+        ))
+        image_verification_result = []
+        for rank, scrape_image_url_result in scraped_pages:
+            structured_data = {
+                **image_search_results[rank],
+                # Full page for now; trimmed to relevant passages once the claim is known
+                "image_scrape_content": scrape_image_url_result.get("markdown") or ""
+            }
+            image_verification_result.append(structured_data)
+        print("Done generating verification results")
+        return img_url, image_search_results, image_verification_result, tools_used
+
+    def _scrape_budget(self, target: int):
+        """(pages to wait for, per-page timeout) of a scrape stage.
+
+        Without a deadline that is `target` pages and the default timeout. With
+        one, the scrape gets half of the stage's remaining time (the verification
+        LLM needs the rest) and waits for about one page per SECONDS_PER_SCRAPE of it.
+        """
+        left = remaining()
+        if left is None:
+            return target, None
+        scrape_seconds = max(left / 2, 0.1)
+        return max(1, min(target, int(scrape_seconds / self.SECONDS_PER_SCRAPE))), scrape_seconds
+
+    @staticmethod
+    async def _timed(timings: Dict[str, float], stage: str, awaitable: Awaitable):
+        """Await a stage and record its wall-clock seconds under timings[stage]."""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = round(time.perf_counter() - start, 3)
 
     def _create_img_error_response(
         self,
@@ -172,39 +411,47 @@ class Workflow:
         llm_generated_claim: str = "",
         extracted_text: str = "",
         result_from: str = "img_check_error",
-        img_found: bool = False
+        img_found: bool = False,
+        img_url: Optional[str] = None,
+        tools_used: Optional[List[str]] = None,
+        timings: Optional[Dict[str, float]] = None
     ) -> Dict[str, Any]:
         """Helper for consistent error responses."""
+        img_url = img_url if img_url is not None else state.raw_input
         return {
+            "raw_input": img_url,
             "claim": llm_generated_claim or extracted_text or "",
             "img_check": ImageCheck(
-                img_url=state.raw_input,
+                img_url=img_url,
                 img_found=img_found,
                 extracted_text=llm_generated_claim or extracted_text or "",
                 match_status=None,
                 img_metadata=None
             ),
-            "tools_used": state.tools_used + ["ocr", "reverse_image_search"],
-            "result_from": result_from
+            "tools_used": tools_used if tools_used is not None else state.tools_used + ["ocr", "reverse_image_search"],
+            "result_from": result_from,
+            "timings": timings if timings is not None else state.timings
         }
       
     def _is_extracted_text(self, state: VerificationSummary) -> str:
         """Route based on whether we got results from previous tool."""
         
         result_from = state.result_from if state and state.result_from else "" 
-        if result_from == "img_check_no_text":
+        if result_from == "img_check_no_text" or state.deadline_exceeded:
             return "failure"
+        elif state.evidence_mode == "speculative":
+            return "speculative"
         else:
-            return "success"
+            return self._next_evidence_node()
 
     """Text verification stages"""
-    def _fact_check_node(self, state: VerificationSummary) -> Dict[str, Any]:
+    async def _fact_check_node(self, state: VerificationSummary) -> Dict[str, Any]:
         query = (state.img_check.extracted_text 
                 if state.img_check and state.img_check.extracted_text 
                 else state.raw_input)
         
         # print(f"🔍 Fact-checking query: {query}")
-        fact_result = self.tool.fact_check(query=query)
+        fact_result = await self.tool.fact_check(query=query)
         
         tools_used = state.tools_used + ["fact_check_api"]  
         
@@ -220,9 +467,8 @@ class Workflow:
                 ))
             ]
             
-            structured_llm = self.llm.with_structured_output(TextCheck)
             try:
-                result: TextCheck = structured_llm.invoke(messages)
+                result: TextCheck = await self._ainvoke(messages, schema=TextCheck)
                 
                 return {
                     "tools_used": tools_used,
@@ -237,16 +483,24 @@ class Workflow:
             print("⚠️ No fact check results returned")
             return self._create_unverified_response(query, tools_used,state)
 
-    def _twitter_node(self, state: VerificationSummary) -> Dict[str, Any]:
+    async def _twitter_node(self, state: VerificationSummary) -> Dict[str, Any]:
         query = state.img_check.extracted_text if state.img_check and state.img_check.extracted_text else state.raw_input
-        advanced_query_message = [
-            SystemMessage(content=self.prompts.QUERY_GENERATION_TWEET_SEARCH_SYSTEM),
-            HumanMessage(content=self.prompts.query_generation_tweet(query=query))
-        ]
-        
-        advanced_query_response = self.llm.invoke(advanced_query_message)
-        advanced_query = advanced_query_response.content
-        tweet_results = self.tool.search_tweets(query=advanced_query)
+        # A query built from the claim's names and keywords saves an LLM round trip; unclear claims still get one,
+        # and so do claims whose built query finds nothing. A search that was rate-limited or failed (None) is not
+        # retried with an LLM query, and neither is one X would not admit right now.
+        built_query, confidence = build_x_query(query)
+        tweet_results = []
+        if confidence >= MIN_CONFIDENCE:
+            metrics.search_queries.inc(target="x", source="builder")
+            tweet_results = await self.tool.search_tweets(query=built_query)
+        if tweet_results == [] and self.tool.upstream_admits("x_api"):
+            advanced_query_message = [
+                SystemMessage(content=self.prompts.QUERY_GENERATION_TWEET_SEARCH_SYSTEM),
+                HumanMessage(content=self.prompts.query_generation_tweet(query=query))
+            ]
+            advanced_query = await self._ainvoke(advanced_query_message)
+            metrics.search_queries.inc(target="x", source="llm")
+            tweet_results = await self.tool.search_tweets(query=advanced_query)
         tools_used = state.tools_used + ["twitter-api"]  
         
         if tweet_results:
@@ -259,9 +513,8 @@ class Workflow:
                 ))
             ]
                 
-            structured_llm = self.llm.with_structured_output(TextCheck)
             try:
-                result: TextCheck = structured_llm.invoke(messages)      
+                result: TextCheck = await self._ainvoke(messages, schema=TextCheck)      
                 # print("\n\ntweet result: ", result)              
                 return {
                     "tools_used": tools_used,
@@ -276,42 +529,41 @@ class Workflow:
             print("No tweets found related to this")
             return self._create_unverified_response(query, tools_used, state)
             
-    def _google_news_node(self, state: VerificationSummary) -> Dict[str, Any]:
+    async def _google_news_node(self, state: VerificationSummary) -> Dict[str, Any]:
         """Google News verification with content scraping"""
         query = (state.img_check.extracted_text 
                 if state.img_check and state.img_check.extracted_text 
                 else state.raw_input)
         
-        google_news_results = self.tool.search_google_news(query=query)  
+        search_query, confidence = build_news_query(query)
+        google_news_results = []
+        if confidence >= MIN_CONFIDENCE:
+            metrics.search_queries.inc(target="google_news", source="builder")
+            google_news_results = await self.tool.search_google_news(query=search_query)
+        # Only an empty result set is retried with the claim itself (see _twitter_node)
+        if google_news_results == [] and self.tool.upstream_admits("serpapi"):
+            metrics.search_queries.inc(target="google_news", source="claim")
+            google_news_results = await self.tool.search_google_news(query=query)
         tools_used = state.tools_used + ["google-news-api"]
         
         if google_news_results:
             
             formatted_result = []
             max_articles = min(10, len(google_news_results))
-            
-            for i, google_news_result in enumerate(google_news_results[:max_articles]):
-                try:
-                    if "firecrawl-api" not in tools_used:
-                        tools_used.append('firecrawl-api')
-                    
-                    # print(f"Scraping article {i+1}/{max_articles}: {google_news_result.get('title', 'Unknown')}")
-                    
-                    article_url = google_news_result.get('link') 
-                    if not article_url:
-                        # print(f"Warning: No URL found for article {i+1}")
-                        continue
-                    
-                    scrape_result = self.tool.scrape_page(url=article_url)
-                    if scrape_result:
-                        structured_data = format_search_and_scrape_result(scrape_result, google_news_result, article_url)
-                        formatted_result.append(structured_data)
-                    else:
-                        print(f"Warning: Failed to scrape content from {article_url}")
-                        
-                except Exception as e:
-                    print(f"Error scraping article {i+1}: {e}")
-                    continue
+            ranked_articles = google_news_results[:max_articles]
+            tools_used.append('firecrawl-api')
+
+            max_success, scrape_timeout = self._scrape_budget(self.NEWS_SCRAPE_TARGET)
+            scraped_articles = await self.tool.scrape_pages(
+                [article.get('link') for article in ranked_articles],
+                max_success=max_success,
+                timeout=scrape_timeout
+            )
+            for rank, scrape_result in scraped_articles:
+                google_news_result = ranked_articles[rank]
+                article_url = google_news_result.get('link')
+                structured_data = format_search_and_scrape_result(scrape_result, google_news_result, article_url, claim=query)
+                formatted_result.append(structured_data)
             
             if formatted_result:
                 messages = [
@@ -323,9 +575,8 @@ class Workflow:
                     ))
                 ]
                             
-                structured_llm = self.llm.with_structured_output(TextCheck)
                 try:
-                    result: TextCheck = structured_llm.invoke(messages)        
+                    result: TextCheck = await self._ainvoke(messages, schema=TextCheck)        
                     return {
                         "tools_used": tools_used,
                         "text_check": result,
@@ -342,40 +593,272 @@ class Workflow:
             print("No Google News results found")
             return self._create_unverified_response(query, tools_used,state)        
     
+    async def _near_duplicate_node(self, state: VerificationSummary) -> Dict[str, Any]:
+        """Re-check the claim against the verdict and sources of an already verified near-duplicate.
+
+        The earlier verdict is evidence, not the answer: only a confident verdict
+        on this claim ends the search. Otherwise the claim is verified from
+        scratch and matched_claim is cleared.
+        """
+        prior = state.near_duplicate_check
+        tools_used = state.tools_used + ["verdict-cache"]
+        sources = (
+            f"EARLIER VERIFICATION OF A SIMILARLY WORDED CLAIM: \"{state.matched_claim}\"\n"
+            f"Verdict: {prior.verified_status} (confidence {prior.confidence_score})\n"
+            f"Reasoning: {prior.reasoning or 'not given'}\n"
+            f"Sources: {', '.join(prior.verified_from or []) or 'none'}"
+        )
+        messages = [
+            SystemMessage(content=self.prompts.TEXT_VERIFICATION_SYSTEM),
+            HumanMessage(content=self.prompts.text_verification_user(
+                claim=state.raw_input,
+                sources=sources,
+                tools_used=tools_used
+            ))
+        ]
+
+        try:
+            result: TextCheck = await self._ainvoke(messages, schema=TextCheck)
+        except Exception as e:
+            print(f"Error in near-duplicate LLM: {e}")
+            result = None
+        if not self._is_confident(result):
+            return {"matched_claim": None, "match_similarity": None, "near_duplicate_check": None}
+        return {
+            "tools_used": tools_used,
+            "text_check": result,
+            "result_from": "verdict-cache"
+        }
+
+    def _near_duplicate_router(self, state: VerificationSummary) -> str:
+        if state.result_from == "verdict-cache" or state.deadline_exceeded:
+            return "success"
+        return "evidence_fanout" if state.evidence_mode == "speculative" else self._next_evidence_node()
+
+    def _available_evidence_nodes(self, after: Optional[str] = None) -> List[str]:
+        """Evidence nodes after `after` (all of them if None) whose upstreams' circuits are not open.
+
+        If every remaining circuit is open the last node is still returned: its
+        calls fail fast and it records the unverified verdict.
+        """
+        names = [name for name, _ in self.EVIDENCE_CHAIN]
+        remaining = self.EVIDENCE_CHAIN[names.index(after) + 1:] if after else self.EVIDENCE_CHAIN
+        available = [
+            name for name, upstreams in remaining
+            if all(self.tool.upstream_available(upstream) for upstream in upstreams)
+        ]
+        for name, upstreams in remaining:
+            if name in available:
+                break
+            print(f"Skipping {name}: circuit open for {', '.join(upstreams)}")
+        return available or [remaining[-1][0]]
+
+    def _next_evidence_node(self, after: Optional[str] = None) -> str:
+        return self._available_evidence_nodes(after)[0]
+
+    def _fallback_router(self, node: str) -> Callable[[VerificationSummary], str]:
+        """Conditional edge after an evidence node: summarize a confident verdict, else try the next available source."""
+        def route(state: VerificationSummary) -> str:
+            # Out of time for another source: summarize the best verdict so far
+            if self._result_router(state) == "success" or state.deadline_exceeded:
+                return "success"
+            return self._next_evidence_node(after=node)
+        return route
+
     def _result_router(self, state: VerificationSummary) -> str:
         """Route based on whether we got results from previous tool."""
         
         if not getattr(state, "result_from", None):
             return "failure"
         
-        confidence = getattr(getattr(state, "text_check", None), "confidence_score", 0)
-        if confidence > 0.7:
+        if self._is_confident(getattr(state, "text_check", None)):
             return "success"
         return "failure"
+
+    async def _ainvoke(self, messages: list, schema=None, llm=None):
+        """Call the chat model through the LLM response cache.
+
+        Returns an instance of `schema` for structured calls, otherwise the message content.
+        """
+        cache_key, prompt_type = self.llm_cache.key_for(self.MODEL, messages, schema.__name__ if schema else "text")
+        cached = self.llm_cache.get(cache_key, prompt_type)
+        if cached is not None:
+            return schema.model_validate_json(cached) if schema else cached
+
+        llm = llm or self.llm
+        if schema:
+            async with budget("gemini", self.LLM_TIMEOUT_SECONDS), self.tool.upstream_limit("gemini"):
+                result = await llm.with_structured_output(schema).ainvoke(messages)
+            if result is not None:
+                self.llm_cache.put(cache_key, result.model_dump_json())
+            return result
+
+        async with budget("gemini", self.LLM_TIMEOUT_SECONDS), self.tool.upstream_limit("gemini"):
+            response = await llm.ainvoke(messages)
+        content = response.content if hasattr(response, 'content') else str(response)
+        if isinstance(content, str) and content:
+            self.llm_cache.put(cache_key, content)
+        return content
+
+    @staticmethod
+    def _is_confident(text_check: Optional[TextCheck]) -> bool:
+        """Confidence threshold a text verdict must clear to end the evidence search."""
+        confidence = getattr(text_check, "confidence_score", 0) or 0
+        return confidence > 0.7
+
+    async def _evidence_fanout_node(self, state: VerificationSummary) -> Dict[str, Any]:
+        """Speculative mode: query fact-check, X and Google News at once.
+
+        Results are inspected in the sequential fallback's priority order; the
+        first one that clears the confidence threshold wins and the remaining
+        sources are cancelled. If none clears it, the most confident result wins.
+        Each source's time, including the cancelled ones', is recorded under its
+        node name as in sequential mode.
+        """
+        nodes = {
+            "fact_check_node": self._fact_check_node,
+            "twitter_node": self._twitter_node,
+            "google_news_node": self._google_news_node,
+        }
+        branch_timings = {}
+        # Sources behind an open circuit are not started at all
+        tasks = [
+            (name, asyncio.create_task(self._fanout_branch(name, nodes[name], state, branch_timings)))
+            for name in self._available_evidence_nodes()
+        ]
+
+        completed = []
+        winner = None
+        try:
+            for name, task in tasks:
+                try:
+                    update = await task
+                except Exception as e:
+                    print(f"Error in speculative {name}: {e}")
+                    continue
+                completed.append(update)
+                if update.get("result_from") and self._is_confident(update.get("text_check")):
+                    winner = update
+                    break
+        finally:
+            # Cancel the losers, including their in-flight upstream and LLM calls, and wait until
+            # they have released their connections and upstream permits
+            for _, task in tasks:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+
+        if winner is None and completed:
+            winner = max(
+                completed,
+                key=lambda update: getattr(update.get("text_check"), "confidence_score", 0) or 0
+            )
+
+        tools_used = list(state.tools_used)
+        for update in completed:
+            tools_used += [tool for tool in update.get("tools_used", []) if tool not in tools_used]
+        timings = {**state.timings, **branch_timings}
+
+        if winner is None:
+            query = (state.img_check.extracted_text
+                    if state.img_check and state.img_check.extracted_text
+                    else state.raw_input)
+            return {**self._create_unverified_response(query, tools_used, state), "timings": timings}
+        return {**winner, "tools_used": tools_used, "timings": timings}
+
+    @staticmethod
+    async def _fanout_branch(name: str, node: Callable, state: VerificationSummary, timings: Dict[str, float]):
+        """Run one speculative source, recording its latency like _instrumented_node does for a graph node."""
+        start = time.perf_counter()
+        try:
+            return await node(state)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.node_duration.observe(elapsed, node=name)
+            timings[name] = round(elapsed, 3)
     
-    def _summary_node(self, state: VerificationSummary) -> Dict[str, Any]:
-        """Generate final verification summary."""
+    async def _summary_node(self, state: VerificationSummary) -> Dict[str, Any]:
+        """Generate final verification summary.
+
+        Tokens are emitted on the graph's "custom" stream as {"summary_delta": text}
+        while the LLM generates them; callers that don't stream it just get the full summary.
+        Too close to the deadline the LLM is skipped (see _deadline_summary), and
+        a summary the deadline or an error interrupts is returned as far as it
+        got, so it matches the deltas already streamed.
+        """
         # print("Generating final recommendations")
         
         messages = [
             SystemMessage(content=self.prompts.VERIFICATION_SUMMARY_REASONING_SYSTEM),
             HumanMessage(content=self.prompts.verification_summary_reasoning_user(
-                structured_verification=state.model_dump()
+                # Per-run bookkeeping stays out so identical evidence gives an identical prompt
+                structured_verification=state.model_dump(exclude=self.RUN_METADATA_FIELDS)
             ))
         ]
         
+        summary_content = ""
         try:
-            result = self.llm.invoke(messages)
-            summary_content = result.content if hasattr(result, 'content') else str(result)
+            writer = get_stream_writer()
+            cache_key, prompt_type = self.llm_cache.key_for(self.MODEL, messages)
+            summary_content = self.llm_cache.get(cache_key, prompt_type)
+            if summary_content is not None:
+                writer({"summary_delta": summary_content})
+                return {"reasoned_summary": summary_content}
+
+            left = remaining()
+            if left is not None and left < self.SUMMARY_MIN_SECONDS:
+                return self._deadline_summary(state, writer)
+
+            summary_content = ""
+            try:
+                async with budget("gemini", self.LLM_TIMEOUT_SECONDS), self.tool.upstream_limit("gemini"):
+                    async for chunk in self.llm.astream(messages):
+                        delta = chunk.content if hasattr(chunk, 'content') else str(chunk)
+                        if isinstance(delta, str) and delta:
+                            summary_content += delta
+                            writer({"summary_delta": delta})
+            except DeadlineExceeded:
+                if not summary_content:
+                    return self._deadline_summary(state, writer)
+                return {"reasoned_summary": summary_content, "deadline_exceeded": True}
+            if summary_content:
+                self.llm_cache.put(cache_key, summary_content)
             return {
                 "reasoned_summary": summary_content         
             }
         except Exception as e:
             print(f"Error generating summary: {e}")
+            if summary_content:
+                # Part of it already reached streaming clients; not cached
+                return {"reasoned_summary": summary_content}
             return {
                 "reasoned_summary": "Could not generate summary due to processing error."         
             }
     
+    def _deadline_summary(self, state: VerificationSummary, writer: Callable) -> Dict[str, Any]:
+        """Summary written without the LLM when the deadline leaves no time for one: the best verdict so far."""
+        text_check = state.text_check
+        if text_check is None and state.input_type == "text":
+            text_check = TextCheck(
+                claim=state.raw_input,
+                verified_status="unverified",
+                confidence_score=0.0,
+                reasoning="No evidence could be gathered before the deadline."
+            )
+
+        parts = []
+        if state.img_check:
+            parts.append("The image was found online." if state.img_check.img_found else "The image was not found online.")
+        if text_check:
+            parts.append(
+                f"Claim status: {text_check.verified_status.upper()} (confidence {text_check.confidence_score:.0%})."
+            )
+            if text_check.reasoning:
+                parts.append(text_check.reasoning)
+        parts.append("This is a partial result: the verification reached its deadline before every source was checked.")
+        summary_content = " ".join(parts)
+        writer({"summary_delta": summary_content})
+        return {"reasoned_summary": summary_content, "text_check": text_check, "deadline_exceeded": True}
+
     def _create_unverified_response(self, query: str, tools_used: list, state: VerificationSummary) -> Dict[str, Any]:
         """Helper method to create unverified response.
         If confidence < 0.7 and no new results, fallback to previous state results instead of resetting everything.
@@ -403,65 +886,239 @@ class Workflow:
             "result_from": state.result_from if state and state.result_from else ""
         }
 
-    def run(self, input_type: str, raw_input: str) -> VerificationSummary:
-        """Run the verification workflow."""
-        initial_state = VerificationSummary(
+    def _initial_state(
+        self,
+        input_type: str,
+        raw_input: str,
+        ocr_text: Optional[str] = None,
+        evidence_mode: str = "sequential",
+        near_duplicate: Optional[VerificationSummary] = None
+    ) -> VerificationSummary:
+        return VerificationSummary(
             raw_input=raw_input,
             input_type=input_type,
             tools_used=[],
             text_check=None,
             img_check=None,
             reasoned_summary="",
-            result_from=""
+            result_from="",
+            ocr_text=ocr_text,
+            evidence_mode=evidence_mode,
+            matched_claim=near_duplicate.raw_input if near_duplicate else None,
+            match_similarity=near_duplicate.match_similarity if near_duplicate else None,
+            near_duplicate_check=near_duplicate.text_check if near_duplicate else None
         )
-        final_state = self.workflow.invoke(initial_state)
-        return VerificationSummary(**final_state)
-    
-    def stream(self, input_type: str, raw_input: str):
+
+    def _run_config(
+        self,
+        image_uploader: Optional[Callable[[], Awaitable[str]]] = None,
+        image_bytes: Optional[bytes] = None,
+        thread_id: Optional[str] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> RunnableConfig:
+        """Per-run values that must not live in the graph state (callables, clients, the uploaded image, the deadline).
+
+        Keeping the image bytes out of the state keeps them out of checkpoints;
+        a resumed run is handed them again by its caller. The deadline starts now.
+        """
+        configurable = {
+            "image_uploader": image_uploader,
+            "image_bytes": image_bytes,
+            "deadline": Deadline(deadline_seconds) if deadline_seconds else None
+        }
+        if thread_id and self.resumable_workflow is not None:
+            configurable["thread_id"] = thread_id
+        return {"configurable": configurable}
+
+    async def _prepare_run(self, initial_state: VerificationSummary, config: RunnableConfig):
+        """Graph, graph input and state so far for a run.
+
+        With a thread_id that already has a checkpoint, the input is None: the
+        graph continues after the last node that completed (or, for a run that
+        already finished, just returns its final state) instead of starting over.
+        A finished run the deadline cut short is discarded and run again; a
+        thread whose input differs from this run's raises ResumeInputMismatch.
+        """
+        thread_id = config["configurable"].get("thread_id")
+        if not thread_id:
+            return self.workflow, initial_state, initial_state
+        try:
+            snapshot = await self.resumable_workflow.aget_state(config)
+        except Exception as e:
+            print(f"Checkpoint read error, running {thread_id} without checkpoints: {e}")
+            del config["configurable"]["thread_id"]
+            return self.workflow, initial_state, initial_state
+        if not snapshot.values:
+            return self.resumable_workflow, initial_state, initial_state
+        stored = VerificationSummary(**snapshot.values)
+        if (stored.input_type, stored.raw_input, stored.evidence_mode) != (
+            initial_state.input_type, initial_state.raw_input, initial_state.evidence_mode
+        ):
+            raise ResumeInputMismatch(f"{thread_id} was started for a different input")
+        if not snapshot.next and stored.deadline_exceeded:
+            print(f"Rerunning {thread_id}: its last run was cut short by its deadline")
+            await self.resumable_workflow.checkpointer.adelete_thread(thread_id)
+            return self.resumable_workflow, initial_state, initial_state
+        print(f"Resuming {thread_id} at {', '.join(snapshot.next) or 'its final state'}")
+        return self.resumable_workflow, None, stored
+
+    async def arun(
+        self,
+        input_type: str,
+        raw_input: str,
+        image_bytes: Optional[bytes] = None,
+        ocr_text: Optional[str] = None,
+        image_uploader: Optional[Callable[[], Awaitable[str]]] = None,
+        evidence_mode: str = "sequential",
+        near_duplicate: Optional[VerificationSummary] = None,
+        thread_id: Optional[str] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> VerificationSummary:
+        """Run the verification workflow on the caller's event loop.
+
+        image_uploader, if given, is awaited inside the image check to host the
+        image and must return its public URL; it runs concurrently with OCR.
+        evidence_mode="speculative" trades extra upstream calls for latency.
+        near_duplicate, a cached verdict of a near-identical text claim (see
+        verdict_cache.get_near_duplicate), is re-checked before any search.
+        thread_id, once a checkpointer is attached, identifies the request:
+        calling again with the same thread_id reuses the nodes already completed.
+        deadline_seconds, if given, bounds the run: close to it scrapes are
+        trimmed, fallback sources skipped and the best partial verdict is
+        returned with deadline_exceeded set.
+        """
+        initial_state = self._initial_state(
+            input_type, raw_input, ocr_text=ocr_text, evidence_mode=evidence_mode, near_duplicate=near_duplicate
+        )
+        config = self._run_config(image_uploader, image_bytes, thread_id, deadline_seconds)
+        metrics.verifications_in_flight.inc(mode="run")
+        start = time.perf_counter()
+        try:
+            graph, graph_input, _ = await self._prepare_run(initial_state, config)
+            final_state = await graph.ainvoke(graph_input, config=config)
+        finally:
+            metrics.verifications_in_flight.dec(mode="run")
+        result = VerificationSummary(**final_state)
+        result.timings["total"] = round(time.perf_counter() - start, 3)
+        if result.deadline_exceeded:
+            metrics.verifications_deadline_exceeded.inc(mode="run")
+        return result
+
+    def run(self, *args, **kwargs) -> VerificationSummary:
+        """Blocking wrapper around arun for scripts; must not be called from a running event loop."""
+        return asyncio.run(self.arun(*args, **kwargs))
+
+    async def arun_images(self, images: List[bytes], img_urls: List[str]) -> List[VerificationSummary]:
+        """Verify several images: one batched OCR pass, then one workflow run per image concurrently.
+
+        An image the batched pass could not OCR gets its bytes passed on, so its
+        run does its own OCR instead of treating it as an image without text.
+        """
+        ocr_images = await asyncio.gather(*(self.tool.prepare_image(image) for image in images))
+        ocr_texts = await self.tool.run_ocr_batch(list(ocr_images))
+
+        return list(await asyncio.gather(*(
+            self.arun(
+                input_type="image", raw_input=img_url, ocr_text=ocr_text,
+                image_bytes=image if ocr_text is None else None
+            )
+            for image, img_url, ocr_text in zip(images, img_urls, ocr_texts)
+        )))
+
+    async def astream(
+        self,
+        input_type: str,
+        raw_input: str,
+        image_bytes: Optional[bytes] = None,
+        image_uploader: Optional[Callable[[], Awaitable[str]]] = None,
+        evidence_mode: str = "sequential",
+        near_duplicate: Optional[VerificationSummary] = None,
+        thread_id: Optional[str] = None,
+        deadline_seconds: Optional[float] = None
+    ):
         """Streaming execution (yields intermediate events)."""
-        initial_state = VerificationSummary(
-            raw_input=raw_input,
-            input_type=input_type,
-            tools_used=[],
-            text_check=None,
-            img_check=None,
-            reasoned_summary="",
-            result_from=""
+        initial_state = self._initial_state(
+            input_type, raw_input, evidence_mode=evidence_mode, near_duplicate=near_duplicate
         )
-        for event in self.workflow.stream(initial_state, stream_mode="updates"):
+        config = self._run_config(image_uploader, image_bytes, thread_id, deadline_seconds)
+        graph, graph_input, _ = await self._prepare_run(initial_state, config)
+        async for event in graph.astream(graph_input, config=config, stream_mode="updates"):
             yield event
     
-    def stream_response(self, input_type: str, raw_input: str):
-        """Generator function that yields incremental results for each verification step."""
-        import json
-        import time
-        
+    async def astream_events(
+        self,
+        input_type: str,
+        raw_input: str,
+        image_bytes: Optional[bytes] = None,
+        image_uploader: Optional[Callable[[], Awaitable[str]]] = None,
+        evidence_mode: str = "sequential",
+        near_duplicate: Optional[VerificationSummary] = None,
+        on_result: Optional[Callable[[VerificationSummary], Awaitable[None]]] = None,
+        thread_id: Optional[str] = None,
+        deadline_seconds: Optional[float] = None
+    ):
+        """Async generator that yields an event dict for each verification step.
+
+        on_result, if given, is awaited with the final VerificationSummary before
+        the completion event is sent (e.g. to cache the verdict). With a
+        thread_id an interrupted run is resumed (see arun); only the steps that
+        still had to run are streamed. deadline_seconds works as in arun.
+        """
         # Yield initial status
-        yield f"data: {json.dumps({
+        yield {
             'type': 'step_start', 
             'step': 'initializing',
             'title': 'Starting Verification Process',
             'content': 'Initializing verification workflow...',
             'progress': 10
-        })}\n\n"
+        }
         
+        metrics.verifications_in_flight.inc(mode="stream")
+        start = time.perf_counter()
         try:
             # Execute the workflow with streaming updates
-            initial_state = VerificationSummary(
-                raw_input=raw_input,
-                input_type=input_type,
-                tools_used=[],
-                text_check=None,
-                img_check=None,
-                reasoned_summary="",
-                result_from=""
+            initial_state = self._initial_state(
+                input_type, raw_input, evidence_mode=evidence_mode, near_duplicate=near_duplicate
             )
-            
+            config = self._run_config(image_uploader, image_bytes, thread_id, deadline_seconds)
+            graph, graph_input, current_state = await self._prepare_run(initial_state, config)
+            if graph_input is None:
+                yield {
+                    'type': 'step_progress',
+                    'step': 'resume',
+                    'title': 'Resuming Verification',
+                    'content': 'Continuing an interrupted run after its last completed step...',
+                    'progress': 20
+                }
+
             # Stream each step with detailed progress
-            current_state = initial_state
             progress = 20
             
-            for event in self.workflow.stream(initial_state, stream_mode="updates"):
+            summary_started = False
+
+            async for mode, event in graph.astream(
+                graph_input, config=config, stream_mode=["updates", "custom"]
+            ):
+                if mode == "custom":
+                    delta = event.get("summary_delta") if isinstance(event, dict) else None
+                    if not delta:
+                        continue
+                    if not summary_started:
+                        summary_started = True
+                        yield {
+                            'type': 'step_progress',
+                            'step': 'summary',
+                            'title': 'Generating Summary',
+                            'content': 'Creating comprehensive verification report...',
+                            'progress': 90
+                        }
+                    yield {
+                        'type': 'summary_delta',
+                        'step': 'summary',
+                        'content': delta
+                    }
+                    continue
+
                 if event:
                     node_name = list(event.keys())[0] if event else "processing"
                     node_data = event.get(node_name, {})
@@ -473,19 +1130,19 @@ class Workflow:
                     
                     # Yield step-specific results immediately
                     if node_name == "router":
-                        yield f"data: {json.dumps({
+                        yield {
                             'type': 'step_complete',
                             'step': 'router',
                             'title': 'Input Analysis Complete',
                             'content': f'Detected input type: {input_type}',
                             'progress': 25,
                             'data': {'input_type': input_type, 'raw_input': raw_input[:100] + '...' if len(raw_input) > 100 else raw_input}
-                        })}\n\n"
+                        }
                         
                     elif node_name == "img_check":
                         img_check = getattr(current_state, 'img_check', None)
                         if img_check:
-                            yield f"data: {json.dumps({
+                            yield {
                                 'type': 'step_complete',
                                 'step': 'image_analysis',
                                 'title': 'Image Analysis Complete',
@@ -494,22 +1151,47 @@ class Workflow:
                                 'data': {
                                     'extracted_text': img_check.extracted_text,
                                     'img_found': img_check.img_found,
-                                    'match_status': img_check.match_status
+                                    'match_status': img_check.match_status,
+                                    'timings': current_state.timings
                                 }
-                            })}\n\n"
+                            }
                         else:
-                            yield f"data: {json.dumps({
+                            yield {
                                 'type': 'step_progress',
                                 'step': 'image_analysis',
                                 'title': 'Processing Image',
                                 'content': 'Extracting text and analyzing image content...',
                                 'progress': 35
-                            })}\n\n"
+                            }
                             
+                    elif node_name == "near_duplicate_node":
+                        text_check = getattr(current_state, 'text_check', None)
+                        if current_state.result_from == "verdict-cache" and text_check:
+                            yield {
+                                'type': 'step_complete',
+                                'step': 'near_duplicate',
+                                'title': 'Similar Claim Check Complete',
+                                'content': f'Settled by an earlier verification of a similar claim - Status: {text_check.verified_status.upper()}',
+                                'progress': 60,
+                                'data': {
+                                    'matched_claim': current_state.matched_claim,
+                                    'verified_status': text_check.verified_status,
+                                    'confidence_score': text_check.confidence_score
+                                }
+                            }
+                        else:
+                            yield {
+                                'type': 'step_progress',
+                                'step': 'near_duplicate',
+                                'title': 'Similar Claim Check',
+                                'content': 'An earlier verification of a similar claim was not conclusive; searching for evidence...',
+                                'progress': 30
+                            }
+
                     elif node_name == "fact_check_node":
                         text_check = getattr(current_state, 'text_check', None)
                         if text_check:
-                            yield f"data: {json.dumps({
+                            yield {
                                 'type': 'step_complete',
                                 'step': 'fact_check',
                                 'title': 'Fact Check Complete',
@@ -521,20 +1203,20 @@ class Workflow:
                                     'verified_from': text_check.verified_from,
                                     'reasoning': text_check.reasoning[:200] + '...' if text_check.reasoning and len(text_check.reasoning) > 200 else text_check.reasoning
                                 }
-                            })}\n\n"
+                            }
                         else:
-                            yield f"data: {json.dumps({
+                            yield {
                                 'type': 'step_progress',
                                 'step': 'fact_check',
                                 'title': 'Fact Checking',
                                 'content': 'Cross-referencing with reliable sources...',
                                 'progress': 50
-                            })}\n\n"
+                            }
                             
                     elif node_name == "twitter_node":
                         text_check = getattr(current_state, 'text_check', None)
                         if text_check:
-                            yield f"data: {json.dumps({
+                            yield {
                                 'type': 'step_complete',
                                 'step': 'social_media',
                                 'title': 'Social Media Analysis Complete',
@@ -546,20 +1228,20 @@ class Workflow:
                                     'source': 'Twitter/X',
                                     'reasoning': text_check.reasoning[:200] + '...' if text_check.reasoning and len(text_check.reasoning) > 200 else text_check.reasoning
                                 }
-                            })}\n\n"
+                            }
                         else:
-                            yield f"data: {json.dumps({
+                            yield {
                                 'type': 'step_progress',
                                 'step': 'social_media',
                                 'title': 'Social Media Search',
                                 'content': 'Searching Twitter/X for related posts...',
                                 'progress': 65
-                            })}\n\n"
+                            }
                             
                     elif node_name == "google_news_node":
                         text_check = getattr(current_state, 'text_check', None)
                         if text_check:
-                            yield f"data: {json.dumps({
+                            yield {
                                 'type': 'step_complete',
                                 'step': 'news_analysis',
                                 'title': 'News Analysis Complete',
@@ -571,60 +1253,80 @@ class Workflow:
                                     'source': 'Google News',
                                     'reasoning': text_check.reasoning[:200] + '...' if text_check.reasoning and len(text_check.reasoning) > 200 else text_check.reasoning
                                 }
-                            })}\n\n"
+                            }
                         else:
-                            yield f"data: {json.dumps({
+                            yield {
                                 'type': 'step_progress',
                                 'step': 'news_analysis',
                                 'title': 'News Search',
                                 'content': 'Analyzing news articles and reports...',
                                 'progress': 80
-                            })}\n\n"
-                            
-                    elif node_name == "summary":
-                        yield f"data: {json.dumps({
-                            'type': 'step_progress',
-                            'step': 'summary',
-                            'title': 'Generating Summary',
-                            'content': 'Creating comprehensive verification report...',
-                            'progress': 90
-                        })}\n\n"
-                        
-                    # Small delay for visual effect
-                    time.sleep(0.2)
+                            }
+
+                    elif node_name == "evidence_fanout":
+                        text_check = getattr(current_state, 'text_check', None)
+                        if text_check:
+                            yield {
+                                'type': 'step_complete',
+                                'step': 'evidence_fanout',
+                                'title': 'Parallel Evidence Search Complete',
+                                'content': f'Status: {text_check.verified_status.upper()} (Confidence: {text_check.confidence_score:.1%})',
+                                'progress': 85,
+                                'data': {
+                                    'verified_status': text_check.verified_status,
+                                    'confidence_score': text_check.confidence_score,
+                                    'verified_from': text_check.verified_from,
+                                    'source': current_state.result_from,
+                                    'reasoning': text_check.reasoning[:200] + '...' if text_check.reasoning and len(text_check.reasoning) > 200 else text_check.reasoning
+                                }
+                            }
+
             
             # Get final result
             final_result = VerificationSummary(**current_state.__dict__)
+            final_result.timings["total"] = round(time.perf_counter() - start, 3)
+            if final_result.deadline_exceeded:
+                metrics.verifications_deadline_exceeded.inc(mode="stream")
+            if on_result:
+                await on_result(final_result)
             
             # Stream final summary
             if final_result.reasoned_summary:
-                yield f"data: {json.dumps({
+                yield {
                     'type': 'step_complete',
                     'step': 'summary',
                     'title': 'Verification Summary',
                     'content': final_result.reasoned_summary[:300] + '...' if len(final_result.reasoned_summary) > 300 else final_result.reasoned_summary,
                     'progress': 95,
                     'data': {'summary': final_result.reasoned_summary}
-                })}\n\n"
+                }
             
             # Send final completion with full result
-            yield f"data: {json.dumps({
+            yield {
                 'type': 'complete',
                 'progress': 100,
                 'title': 'Verification Complete',
-                'content': 'All verification steps completed successfully!',
+                'content': (
+                    'Deadline reached: returning the best partial result.' if final_result.deadline_exceeded
+                    else 'All verification steps completed successfully!'
+                ),
                 'result': final_result.model_dump()
-            })}\n\n"
+            }
             
         except Exception as e:
             error_msg = f"Error during verification: {str(e)}"
-            yield f"data: {json.dumps({
+            yield {
                 'type': 'error',
                 'step': 'error',
                 'title': 'Verification Error',
                 'content': error_msg,
                 'progress': 0
-            })}\n\n"
-        
-        # End the stream
+            }
+        finally:
+            metrics.verifications_in_flight.dec(mode="stream")
+
+    async def astream_response(self, *args, **kwargs):
+        """Server-Sent Events stream of astream_events, terminated by [DONE]."""
+        async for event in self.astream_events(*args, **kwargs):
+            yield f"data: {json.dumps(event)}\n\n"
         yield "data: [DONE]\n\n"
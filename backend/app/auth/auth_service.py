@@ -14,6 +14,7 @@ warnings.filterwarnings("ignore", category=UserWarning, module="passlib")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -75,6 +76,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise credentials_exception
     return user
 
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> Optional[UserInDB]:
+    """The authenticated user, or None when no token is sent; an invalid token is still rejected."""
+    if credentials is None:
+        return None
+    return await get_current_user(credentials)
+
 def user_to_response(user: UserInDB, user_id: str) -> UserResponse:
     return UserResponse(
         id=user_id,
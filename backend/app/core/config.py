@@ -16,5 +16,41 @@ class Settings:
     CLOUDINARY_API_SECRET: str = os.getenv("CLOUDINARY_API_SECRET", "")
     CLOUDINARY_SECURE: bool = os.getenv("CLOUDINARY_SECURE", "true").lower() == "true"
 
+    # Verified-claim cache
+    VERDICT_CACHE_TTL_SECONDS: int = int(os.getenv("VERDICT_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+    VERDICT_CACHE_MAX_BYTES: int = int(os.getenv("VERDICT_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+    # Estimated Jaccard similarity (character 5-grams) a reworded claim needs to start from a verdict's evidence;
+    # the workflow re-checks that verdict against the new claim, so this only has to find candidates
+    CLAIM_SIMILARITY_THRESHOLD: float = float(os.getenv("CLAIM_SIMILARITY_THRESHOLD", "0.6"))
+    # Verified claims kept in the near-duplicate index per process
+    CLAIM_INDEX_MAX_ENTRIES: int = int(os.getenv("CLAIM_INDEX_MAX_ENTRIES", "100000"))
+
+    # Batch verification
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "8"))
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "200"))
+
+    # Scrape cache persistent tier: "disk" (SCRAPE_CACHE_DIR) or "mongo"
+    SCRAPE_CACHE_BACKEND: str = os.getenv("SCRAPE_CACHE_BACKEND", "disk").lower()
+    # How long MongoDB keeps an expired page around for conditional revalidation
+    SCRAPE_CACHE_STALE_SECONDS: int = int(os.getenv("SCRAPE_CACHE_STALE_SECONDS", str(7 * 24 * 60 * 60)))
+
+    # Background verification jobs (run by `python -m app.worker`)
+    WORKER_PROCESSES: int = int(os.getenv("WORKER_PROCESSES", "2"))
+    WORKER_CONCURRENCY: int = int(os.getenv("WORKER_CONCURRENCY", "4"))
+    JOB_POLL_SECONDS: float = float(os.getenv("JOB_POLL_SECONDS", "1.0"))
+    # A running job whose worker stops renewing its lease is handed to another worker
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "120"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RESULT_TTL_SECONDS: int = int(os.getenv("JOB_RESULT_TTL_SECONDS", str(24 * 60 * 60)))
+    # Finished jobs averaged into the wait/run time metrics
+    JOB_STATS_WINDOW_SECONDS: int = int(os.getenv("JOB_STATS_WINDOW_SECONDS", "300"))
+
+    # Graph checkpoints in MongoDB: runs given a request/job id resume after an interruption
+    GRAPH_CHECKPOINTS: bool = os.getenv("GRAPH_CHECKPOINTS", "true").lower() == "true"
+    CHECKPOINT_TTL_SECONDS: int = int(os.getenv("CHECKPOINT_TTL_SECONDS", str(24 * 60 * 60)))
+
+    # Shortest deadline_seconds a caller may ask for; below it even a partial answer is unlikely
+    MIN_DEADLINE_SECONDS: float = float(os.getenv("MIN_DEADLINE_SECONDS", "2.0"))
+
 settings = Settings()
     
\ No newline at end of file
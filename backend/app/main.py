@@ -1,18 +1,38 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 from app.core.database import connect_to_mongo, close_mongo_connection
+from ai_agent.src.ocr_engine import ocr_engine
+from ai_agent.src.metrics import registry as metrics_registry
+from app.utils.verdict_cache import verdict_cache
+from app.utils.job_queue import job_queue
+from app.utils.scrape_store import attach_scrape_store
+from app.utils.checkpoint_store import attach_checkpointer
 from app.routes.auth import router as auth_router
 from app.routes.uploads import router as uploads_router
-from app.routes.verify import router as verify_router
+from app.routes.verify import router as verify_router, workflow as verify_workflow
 
 # FastAPI lifespan event
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await connect_to_mongo()
+    await verdict_cache.ensure_indexes()
+    await verdict_cache.load_index()
+    await job_queue.ensure_indexes()
+    await attach_scrape_store()
+    await attach_checkpointer(verify_workflow)
+    metrics_registry.register_cache("verdict", verdict_cache)
+    # Load EasyOCR weights in the worker pool before serving requests
+    await run_in_threadpool(ocr_engine.start)
     try:
         yield
     finally:
+        ocr_engine.shutdown()
+        await run_in_threadpool(verify_workflow.tool.image_hash_index.flush)
+        # Close the pooled HTTP client shared by the verification tools
+        await verify_workflow.tool.aclose()
         await close_mongo_connection()
 
 app = FastAPI(title="VeriHub API", version="1.0.0", lifespan=lifespan)
@@ -33,4 +53,10 @@ app.include_router(verify_router, prefix="/ai", tags=["File Uploads and text"])
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to VeriHub API!", "status": "success"}
\ No newline at end of file
+    return {"message": "Welcome to VeriHub API!", "status": "success"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint: node/tool latencies, upstream errors, cache hit ratios, in-flight runs, job queue."""
+    await job_queue.refresh_metrics()
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
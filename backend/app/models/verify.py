@@ -0,0 +1,7 @@
+from typing import List, Literal
+from pydantic import BaseModel, Field
+
+class BatchVerifyRequest(BaseModel):
+    claims: List[str] = Field(default_factory=list, description="Text claims to verify")
+    image_urls: List[str] = Field(default_factory=list, description="Publicly reachable image URLs to verify")
+    evidence_mode: Literal["sequential", "speculative"] = "sequential"
@@ -1,54 +1,121 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Request
 from fastapi.responses import StreamingResponse
-from ai_agent.src.workflow import Workflow
-import os
-import shutil
-import inspect
-import ai_agent.src.workflow as wf  # to locate workflow.py dynamically
+import json
+import asyncio
+import hashlib
+from functools import partial
+from typing import List, Optional
+from ai_agent.src.workflow import Workflow, ResumeInputMismatch
+from ai_agent.src.models import VerificationSummary
+from ai_agent.src.claim_index import normalize_claim
+from ..core.config import settings
 from ..utils.cloudinary_service import cloudinary_service
+from ..utils.verdict_cache import verdict_cache
+from ..utils.job_queue import job_queue, FINISHED, FAILED
 from ..utils.check_input_type import get_input_with_type
-from ..auth.auth_service import get_current_user
+from ..auth.auth_service import get_current_user, get_optional_user
 from ..models.user import UserInDB
+from ..models.verify import BatchVerifyRequest
 
 router = APIRouter()
 workflow = Workflow()
 
-# Dynamically get the real src/ directory where workflow.py lives
-SRC_DIR = os.path.dirname(inspect.getfile(wf))
+EVIDENCE_MODES = ("sequential", "speculative")
 
-# Fixed filename for OCR (workflow expects "image.png")
-IMAGE_PATH = os.path.join(SRC_DIR, "image.png")
+# Workflow runs in flight across every batch request in this process
+batch_semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+# How often a job's SSE stream re-reads its progress from MongoDB
+JOB_EVENTS_POLL_SECONDS = 0.5
+
+
+def make_image_uploader(file_content: bytes, filename: str):
+    """Build the coroutine function the workflow uses to host an uploaded image on Cloudinary."""
+    async def upload() -> str:
+        upload_result = await cloudinary_service.upload_file(
+            file_content=file_content,
+            filename=filename,
+            folder="verihub/verify"
+        )
+        if not upload_result["success"]:
+            raise RuntimeError(upload_result["error"])
+        return upload_result.get("url") or upload_result.get("secure_url")
+    return upload
+
+
+def caller_scope(request: Optional[Request], user: Optional[UserInDB]) -> str:
+    """Who a resumable request belongs to: the signed-in user, else the client address."""
+    if user is not None:
+        return f"user:{user.email}"
+    return f"client:{request.client.host if request and request.client else 'unknown'}"
+
+
+def checkpoint_thread_id(
+    scope: str, request_id: Optional[str], raw_input: Optional[str], file_content: Optional[bytes], evidence_mode: str
+) -> Optional[str]:
+    """Checkpoint thread of a resumable request: the caller's scope, their request_id and a hash of the input.
+
+    A request_id reused by another caller, or for another input, names a
+    different thread, so it can never return someone else's verification.
+    """
+    if not request_id:
+        return None
+    digest = hashlib.sha256(file_content if file_content is not None else (raw_input or "").encode("utf-8"))
+    digest.update(evidence_mode.encode("utf-8"))
+    return f"{scope}:{request_id}:{digest.hexdigest()[:32]}"
+
+
+def validate_deadline(deadline_seconds: Optional[float]):
+    if deadline_seconds is not None and deadline_seconds < settings.MIN_DEADLINE_SECONDS:
+        raise HTTPException(status_code=400, detail=f"deadline_seconds must be at least {settings.MIN_DEADLINE_SECONDS}")
 
 
 @router.post("/verify")
 async def verify_content(
+    request: Request,
     input_type: str = Form(...),
     raw_input: str = Form(None),
-    file: UploadFile = File(None)
+    file: UploadFile = File(None),
+    evidence_mode: str = Form("sequential"),
+    request_id: str = Form(None),
+    deadline_seconds: float = Form(None),
+    current_user: Optional[UserInDB] = Depends(get_optional_user)
 ):
+    """
+    Verify one claim or image. A client that retries the same input with the
+    same request_id after a dropped connection resumes the interrupted
+    verification; the id is scoped to the signed-in user, or to the client
+    address for anonymous calls.
+    With deadline_seconds the answer comes back in about that time, partial
+    (deadline_exceeded) if the full verification would take longer.
+    """
+    if evidence_mode not in EVIDENCE_MODES:
+        raise HTTPException(status_code=400, detail=f"evidence_mode must be one of {EVIDENCE_MODES}")
+    validate_deadline(deadline_seconds)
+
     try:
         if file:  # Case: Image file uploaded
-            # Always save as "image.png" in src/ so workflow.py can pick it up
-            with open(IMAGE_PATH, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-
-            # Upload to Cloudinary (optional, for external URL storage)
-            with open(IMAGE_PATH, "rb") as f:
-                file_content = f.read()
-
-            upload_result = await cloudinary_service.upload_file(
-                file_content=file_content,
-                filename=file.filename,
-                folder="verihub/verify"
-            )
-
-            if not upload_result["success"]:
-                raise HTTPException(status_code=500, detail=upload_result["error"])
+            # Keep the upload in memory; OCR reads these bytes directly
+            file_content = await file.read()
 
-            img_link = upload_result.get("url") or upload_result.get("secure_url")
+            cache_key = verdict_cache.key_for_image(file_content)
+            cached = await verdict_cache.get(cache_key)
+            if cached:
+                return cached.model_dump()
 
-            # Run workflow (depends on image.png existing)
-            result = workflow.run(input_type="image", raw_input=img_link)
+            # Cloudinary upload runs inside the image check, concurrently with OCR
+            thread_id = checkpoint_thread_id(
+                caller_scope(request, current_user), request_id, None, file_content, evidence_mode
+            )
+            result = await workflow.arun(
+                input_type="image",
+                raw_input=file.filename,
+                image_bytes=file_content,
+                image_uploader=make_image_uploader(file_content, file.filename),
+                evidence_mode=evidence_mode,
+                thread_id=thread_id,
+                deadline_seconds=deadline_seconds
+            )
 
         else:  # Case: Text input
             if not raw_input:
@@ -56,20 +123,205 @@ async def verify_content(
 
             # Detect proper input type
             query, detected_type = get_input_with_type(query=raw_input)
-            result = workflow.run(input_type=detected_type, raw_input=query)
 
+            # Exact match of an already verified claim; a near-duplicate's evidence is re-checked instead
+            cached = await verdict_cache.get_claim(query)
+            if cached:
+                return cached.model_dump()
+            near_duplicate = await verdict_cache.get_near_duplicate(query)
+
+            cache_key = verdict_cache.key_for_text(query)
+            thread_id = checkpoint_thread_id(caller_scope(request, current_user), request_id, query, None, evidence_mode)
+            result = await workflow.arun(
+                input_type=detected_type, raw_input=query, evidence_mode=evidence_mode,
+                near_duplicate=near_duplicate, thread_id=thread_id, deadline_seconds=deadline_seconds
+            )
+
+        await verdict_cache.put(cache_key, result, claim=query if not file else None)
         return result.model_dump()
 
+    except ResumeInputMismatch as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/verify/multiple")
+async def verify_multiple_images(
+    files: List[UploadFile] = File(...)
+):
+    """
+    Verify up to 10 images at once.
+    OCR runs as one batched pass over all images, then each image's claim
+    goes through the workflow concurrently.
+    """
+    try:
+        if len(files) > 10:  # Same limit as /uploads/upload/multiple
+            raise HTTPException(status_code=400, detail="Maximum 10 files allowed per request")
+
+        file_data_list = []
+        for file in files:
+            file_content = await file.read()
+            validation = cloudinary_service.validate_file(file.filename, len(file_content))
+            if not validation["valid"]:
+                raise HTTPException(status_code=400, detail=validation["error"])
+            file_data_list.append({"content": file_content, "filename": file.filename})
+
+        upload_results = await cloudinary_service.upload_multiple_files(file_data_list, folder="verihub/verify")
+        failed_uploads = [r for r in upload_results if not r["success"]]
+        if failed_uploads:
+            raise HTTPException(status_code=500, detail=failed_uploads[0]["error"])
+
+        img_links = [r.get("url") or r.get("secure_url") for r in upload_results]
+        results = await workflow.arun_images(
+            images=[f["content"] for f in file_data_list],
+            img_urls=img_links
+        )
+
+        return {"results": [result.model_dump() for result in results]}
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        # Cleanup image.png only if it exists
-        if os.path.exists(IMAGE_PATH):
-            try:
-                os.remove(IMAGE_PATH)
-            except Exception:
-                pass
+
+async def verify_batch_item(input_type: str, value: str, evidence_mode: str) -> VerificationSummary:
+    """Verify one batch entry, answering from the verdict cache when possible."""
+    if input_type == "text":
+        cached = await verdict_cache.get_claim(value)
+        if cached:
+            return cached
+        result = await workflow.arun(
+            input_type="text", raw_input=value, evidence_mode=evidence_mode,
+            near_duplicate=await verdict_cache.get_near_duplicate(value)
+        )
+        await verdict_cache.put(verdict_cache.key_for_text(value), result, claim=value)
+        return result
+
+    image_bytes = await workflow.tool.fetch_image(value)
+    if image_bytes is None:
+        raise ValueError(f"Could not download image from {value}")
+    cache_key = verdict_cache.key_for_image(image_bytes)
+    cached = await verdict_cache.get(cache_key)
+    if cached:
+        return cached
+    # Already public, so the image check reverse-searches the URL itself instead of uploading it
+    result = await workflow.arun(input_type="image", raw_input=value, image_bytes=image_bytes, evidence_mode=evidence_mode)
+    await verdict_cache.put(cache_key, result)
+    return result
+
+
+@router.post("/verify/batch")
+async def verify_batch(request: BatchVerifyRequest):
+    """
+    Verify many text claims and/or image URLs in one request.
+    Results stream back as NDJSON, one line per input in completion order:
+    {"index", "input_type", "input", "result"} or {"index", "input_type", "input", "error"}.
+    """
+    items = [("text", claim) for claim in request.claims] + [("image", url) for url in request.image_urls]
+    if not items:
+        raise HTTPException(status_code=400, detail="No claims or image URLs provided")
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Maximum {settings.BATCH_MAX_ITEMS} items allowed per batch")
+
+    # Identical inputs within the batch are verified once
+    runs = {}
+
+    async def limited_run(input_type: str, value: str) -> VerificationSummary:
+        async with batch_semaphore:
+            return await verify_batch_item(input_type, value, request.evidence_mode)
+
+    async def run_item(index: int, input_type: str, value: str) -> dict:
+        key = (input_type, normalize_claim(value) if input_type == "text" else value.strip())
+        if key not in runs:
+            runs[key] = asyncio.ensure_future(limited_run(input_type, value))
+        line = {"index": index, "input_type": input_type, "input": value}
+        try:
+            result = await asyncio.shield(runs[key])
+            return {**line, "result": result.model_dump()}
+        except Exception as e:
+            return {**line, "error": str(e)}
+
+    async def generate_ndjson():
+        tasks = [asyncio.create_task(run_item(index, *item)) for index, item in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield json.dumps(await next_done) + "\n"
+        finally:
+            # Client went away: stop the remaining verifications
+            for task in tasks:
+                task.cancel()
+            for run in runs.values():
+                run.cancel()
+
+    return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+
+
+@router.get("/ocr/stats")
+async def ocr_stats():
+    """Text-presence gate counters and OCR cache usage for this API process."""
+    engine = workflow.tool.ocr_engine
+    cache = workflow.tool.ocr_cache.memory
+    return {
+        "text_gate": {**engine.gate_stats, "text_threshold": engine.text_threshold},
+        "cache": {"entries": len(cache), "bytes": cache.current_bytes, "hits": cache.hits, "misses": cache.misses}
+    }
+
+
+async def verification_events(
+    input_type: str,
+    raw_input: Optional[str],
+    file_content: Optional[bytes] = None,
+    filename: Optional[str] = None,
+    evidence_mode: str = "sequential",
+    thread_id: Optional[str] = None,
+    deadline_seconds: Optional[float] = None
+):
+    """Progress event dicts for one verification, answering from the verdict cache when possible.
+
+    Shared by the SSE endpoint and the background job worker. A thread_id seen
+    before resumes that verification from its last completed step.
+    """
+    if file_content is not None:  # Case: Image file uploaded
+        # OCR reads the bytes directly; the Cloudinary upload runs inside the image check
+        processed_input = filename
+        detected_type = "image"
+        cache_key = verdict_cache.key_for_image(file_content)
+
+    else:  # Case: Text input
+        if not raw_input:
+            yield {"type": "error", "content": "No input provided"}
+            return
+
+        # Detect proper input type
+        processed_input, detected_type = get_input_with_type(query=raw_input)
+        cache_key = verdict_cache.key_for_text(processed_input)
+
+    is_image = file_content is not None
+    cached = await (verdict_cache.get(cache_key) if is_image else verdict_cache.get_claim(processed_input))
+    if cached:
+        yield {
+            'type': 'complete',
+            'progress': 100,
+            'title': 'Verification Complete',
+            'content': f'Answered from a verification of the same claim {cached.cached_age_seconds:.0f}s ago',
+            'result': cached.model_dump()
+        }
+        return
+
+    async for event in workflow.astream_events(
+        input_type=detected_type,
+        raw_input=processed_input,
+        image_bytes=file_content,
+        image_uploader=make_image_uploader(file_content, filename) if is_image else None,
+        evidence_mode=evidence_mode,
+        near_duplicate=None if is_image else await verdict_cache.get_near_duplicate(processed_input),
+        on_result=partial(verdict_cache.put, cache_key, claim=None if is_image else processed_input),
+        thread_id=thread_id,
+        deadline_seconds=deadline_seconds
+    ):
+        yield event
 
 
 @router.post("/stream-chat")
@@ -77,54 +329,39 @@ async def stream_chat(
     input_type: str = Form(...),
     raw_input: str = Form(None),
     file: UploadFile = File(None),
+    evidence_mode: str = Form("sequential"),
+    request_id: str = Form(None),
+    deadline_seconds: float = Form(None),
     current_user: UserInDB = Depends(get_current_user)  # Authentication required
 ):
     """
     Server-Sent Events endpoint for streaming AI responses.
     Streams verification results token by token in real-time.
+    Reconnecting with the same request_id resumes the verification instead of restarting it.
+    deadline_seconds bounds the run as on /verify.
     """
+    if evidence_mode not in EVIDENCE_MODES:
+        raise HTTPException(status_code=400, detail=f"evidence_mode must be one of {EVIDENCE_MODES}")
+    validate_deadline(deadline_seconds)
+
     
-    def generate_stream():
+    # Read the upload before streaming starts; each request keeps its own copy in memory
+    file_content = await file.read() if file else None
+    # Scoped to the user and the input so a request_id can only resume this user's run of this input
+    thread_id = checkpoint_thread_id(caller_scope(None, current_user), request_id, raw_input, file_content, evidence_mode)
+
+    async def generate_stream():
         try:
-            processed_input = None
-            detected_type = input_type
-            
-            if file:  # Case: Image file uploaded
-                # Always save as "image.png" in src/ so workflow.py can pick it up
-                with open(IMAGE_PATH, "wb") as buffer:
-                    shutil.copyfileobj(file.file, buffer)
-
-                # Upload to Cloudinary (optional, for external URL storage)
-                with open(IMAGE_PATH, "rb") as f:
-                    file_content = f.read()
-
-                # Note: For streaming, we'll use a simpler approach and just use the local file
-                # In production, you might want to handle Cloudinary upload in a separate step
-                processed_input = "image.png"  # Use local path for workflow
-                detected_type = "image"
-                
-            else:  # Case: Text input
-                if not raw_input:
-                    yield f"data: {{\"type\": \"error\", \"content\": \"No input provided\"}}\n\n"
-                    return
-                
-                # Detect proper input type
-                processed_input, detected_type = get_input_with_type(query=raw_input)
-            
-            # Stream the workflow execution
-            for chunk in workflow.stream_response(input_type=detected_type, raw_input=processed_input):
-                yield chunk
+            async for event in verification_events(
+                input_type, raw_input, file_content, file.filename if file else None, evidence_mode, thread_id,
+                deadline_seconds
+            ):
+                yield f"data: {json.dumps(event)}\n\n"
+            # End the stream
+            yield "data: [DONE]\n\n"
                 
         except Exception as e:
             yield f"data: {{\"type\": \"error\", \"content\": \"Error during streaming: {str(e)}\"}}\n\n"
-        
-        finally:
-            # Cleanup image.png only if it exists
-            if os.path.exists(IMAGE_PATH):
-                try:
-                    os.remove(IMAGE_PATH)
-                except Exception:
-                    pass
     
     return StreamingResponse(
         generate_stream(),
@@ -136,3 +373,108 @@ async def stream_chat(
             "Access-Control-Allow-Headers": "*",
         }
     )
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(
+    input_type: str = Form(...),
+    raw_input: str = Form(None),
+    file: UploadFile = File(None),
+    evidence_mode: str = Form("sequential")
+):
+    """
+    Queue a verification for the background workers and return its job id right away.
+    Poll GET /ai/jobs/{job_id} or subscribe to GET /ai/jobs/{job_id}/events for progress.
+    """
+    if evidence_mode not in EVIDENCE_MODES:
+        raise HTTPException(status_code=400, detail=f"evidence_mode must be one of {EVIDENCE_MODES}")
+
+    file_content = None
+    if file:
+        file_content = await file.read()
+        validation = cloudinary_service.validate_file(file.filename, len(file_content))
+        if not validation["valid"]:
+            raise HTTPException(status_code=400, detail=validation["error"])
+    elif not raw_input:
+        raise HTTPException(status_code=400, detail="No input provided")
+
+    try:
+        job_id = await job_queue.enqueue(
+            input_type="image" if file else input_type,
+            raw_input=None if file else raw_input,
+            image_bytes=file_content,
+            filename=file.filename if file else None,
+            evidence_mode=evidence_mode
+        )
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Could not queue verification: {e}")
+
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/ai/jobs/{job_id}",
+        "events_url": f"/ai/jobs/{job_id}/events"
+    }
+
+
+@router.get("/jobs/stats")
+async def job_stats():
+    """Queue depth and recent wait/run times of background verification jobs."""
+    try:
+        return await job_queue.stats()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status, progress events and (once done) the result of a background verification."""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job["job_id"] = job.pop("_id")
+    return job
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Server-Sent Events stream of a background job's progress.
+    Sends the same events as /stream-chat (except summary_delta) and ends when the job finishes.
+    """
+    if await job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def generate_stream():
+        sent = 0
+        attempt = None
+        while True:
+            job = await job_queue.get(job_id)
+            if job is None:
+                yield f"data: {json.dumps({'type': 'error', 'content': 'Job expired'})}\n\n"
+                break
+            if job.get("attempts") != attempt:
+                # A retried attempt starts its progress over
+                attempt, sent = job.get("attempts"), 0
+            for event in job["progress"][sent:]:
+                yield f"data: {json.dumps(event, default=str)}\n\n"
+            sent = len(job["progress"])
+
+            if job["status"] in FINISHED:
+                last = job["progress"][-1] if job["progress"] else {}
+                if job["status"] == FAILED and last.get("type") != "error":
+                    yield f"data: {json.dumps({'type': 'error', 'step': 'error', 'content': job.get('error')})}\n\n"
+                break
+            await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(
+        generate_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Headers": "*",
+        }
+    )
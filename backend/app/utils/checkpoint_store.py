@@ -0,0 +1,243 @@
+"""
+MongoDB checkpoints of verification graph runs, so an interrupted run resumes where it stopped
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Optional, Sequence, Tuple
+
+from bson import Binary
+from pymongo import ReplaceOne, UpdateOne
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from ..core.config import settings
+from ..core.database import get_database
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINTS_COLLECTION = "graph_checkpoints"
+WRITES_COLLECTION = "graph_checkpoint_writes"
+BLOBS_COLLECTION = "graph_checkpoint_blobs"
+
+
+class MongoCheckpointSaver(BaseCheckpointSaver):
+    """LangGraph checkpointer on MongoDB, shared by every API and worker process.
+
+    A checkpoint is written after every graph step. Channel values are stored
+    once per version, so a channel a node did not touch is not written again,
+    and the writes of a node that finished in an unfinished step are kept so a
+    resumed run does not redo it. A TTL index drops a thread's documents
+    CHECKPOINT_TTL_SECONDS after they were written.
+    """
+
+    def __init__(self, ttl_seconds: int = None):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds or settings.CHECKPOINT_TTL_SECONDS
+
+    def _collection(self, name: str):
+        database = get_database()
+        if database is None:
+            raise RuntimeError("Database connection is not available")
+        return database[name]
+
+    def _expires_at(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+
+    async def ensure_indexes(self):
+        try:
+            checkpoints = self._collection(CHECKPOINTS_COLLECTION)
+            await checkpoints.create_index([("thread_id", 1), ("checkpoint_ns", 1), ("checkpoint_id", -1)])
+            writes = self._collection(WRITES_COLLECTION)
+            await writes.create_index([("thread_id", 1), ("checkpoint_ns", 1), ("checkpoint_id", 1)])
+            for name in (CHECKPOINTS_COLLECTION, WRITES_COLLECTION, BLOBS_COLLECTION):
+                collection = self._collection(name)
+                await collection.create_index("thread_id")
+                await collection.create_index("expires_at", expireAfterSeconds=0)
+        except Exception as e:
+            logger.error(f"Checkpoint index creation failed: {e}")
+
+    @staticmethod
+    def _blob_id(thread_id: str, checkpoint_ns: str, channel: str, version) -> str:
+        return f"{thread_id}:{checkpoint_ns}:{channel}:{version}"
+
+    async def _load_blobs(self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> dict:
+        ids = {self._blob_id(thread_id, checkpoint_ns, channel, version): channel for channel, version in versions.items()}
+        channel_values = {}
+        async for document in self._collection(BLOBS_COLLECTION).find({"_id": {"$in": list(ids)}}):
+            if document["type"] != "empty":
+                channel_values[ids[document["_id"]]] = self.serde.loads_typed((document["type"], bytes(document["value"])))
+        return channel_values
+
+    async def _to_tuple(self, document: dict) -> CheckpointTuple:
+        thread_id = document["thread_id"]
+        checkpoint_ns = document["checkpoint_ns"]
+        checkpoint_id = document["checkpoint_id"]
+        checkpoint = self.serde.loads_typed((document["type"], bytes(document["checkpoint"])))
+        channel_values = await self._load_blobs(thread_id, checkpoint_ns, checkpoint["channel_versions"])
+
+        pending_writes = []
+        cursor = self._collection(WRITES_COLLECTION).find(
+            {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}
+        ).sort([("task_id", 1), ("idx", 1)])
+        async for write in cursor:
+            pending_writes.append(
+                (write["task_id"], write["channel"], self.serde.loads_typed((write["type"], bytes(write["value"]))))
+            )
+
+        parent_id = document.get("parent_checkpoint_id")
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self.serde.loads_typed((document["metadata_type"], bytes(document["metadata"]))),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                if parent_id else None
+            ),
+            pending_writes=pending_writes,
+        )
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """The checkpoint named by the config, or the thread's latest one."""
+        query = {
+            "thread_id": config["configurable"]["thread_id"],
+            "checkpoint_ns": config["configurable"].get("checkpoint_ns", ""),
+        }
+        checkpoint_id = get_checkpoint_id(config)
+        if checkpoint_id:
+            query["checkpoint_id"] = checkpoint_id
+        # Checkpoint ids are time-ordered (UUIDv6), so the highest is the latest
+        document = await self._collection(CHECKPOINTS_COLLECTION).find_one(query, sort=[("checkpoint_id", -1)])
+        return await self._to_tuple(document) if document else None
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Checkpoints newest first, optionally of one thread, before a checkpoint or matching metadata."""
+        query = {}
+        if config:
+            query["thread_id"] = config["configurable"]["thread_id"]
+            if config["configurable"].get("checkpoint_ns") is not None:
+                query["checkpoint_ns"] = config["configurable"]["checkpoint_ns"]
+            checkpoint_id = get_checkpoint_id(config)
+            if checkpoint_id:
+                query["checkpoint_id"] = checkpoint_id
+        before_id = get_checkpoint_id(before) if before else None
+        if before_id:
+            query["checkpoint_id"] = {"$lt": before_id}
+
+        async for document in self._collection(CHECKPOINTS_COLLECTION).find(query).sort("checkpoint_id", -1):
+            if limit is not None and limit <= 0:
+                break
+            checkpoint_tuple = await self._to_tuple(document)
+            # Metadata is stored serialized, so it is filtered here rather than in the query
+            if filter and not all(checkpoint_tuple.metadata.get(key) == value for key, value in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a checkpoint and the channel values that changed since its parent."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint = checkpoint.copy()
+        values = checkpoint.pop("channel_values")
+        expires_at = self._expires_at()
+
+        blobs = []
+        for channel, version in new_versions.items():
+            type_, value = self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b"")
+            blob_id = self._blob_id(thread_id, checkpoint_ns, channel, version)
+            blobs.append(ReplaceOne({"_id": blob_id}, {
+                "_id": blob_id, "thread_id": thread_id, "type": type_, "value": Binary(value), "expires_at": expires_at
+            }, upsert=True))
+        if blobs:
+            await self._collection(BLOBS_COLLECTION).bulk_write(blobs, ordered=False)
+
+        type_, serialized = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        document_id = f"{thread_id}:{checkpoint_ns}:{checkpoint['id']}"
+        await self._collection(CHECKPOINTS_COLLECTION).replace_one({"_id": document_id}, {
+            "_id": document_id,
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+            "parent_checkpoint_id": config["configurable"].get("checkpoint_id"),
+            "type": type_,
+            "checkpoint": Binary(serialized),
+            "metadata_type": metadata_type,
+            "metadata": Binary(serialized_metadata),
+            "expires_at": expires_at,
+        }, upsert=True)
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store the writes of a finished node against the checkpoint its step started from."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        expires_at = self._expires_at()
+
+        operations = []
+        for index, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, index)
+            type_, serialized = self.serde.dumps_typed(value)
+            document_id = f"{thread_id}:{checkpoint_ns}:{checkpoint_id}:{task_id}:{idx}"
+            document = {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+                "task_id": task_id,
+                "task_path": task_path,
+                "idx": idx,
+                "channel": channel,
+                "type": type_,
+                "value": Binary(serialized),
+                "expires_at": expires_at,
+            }
+            # Regular writes are recorded once; special ones (errors, interrupts) replace the previous value
+            if idx >= 0:
+                operations.append(UpdateOne({"_id": document_id}, {"$setOnInsert": document}, upsert=True))
+            else:
+                operations.append(ReplaceOne({"_id": document_id}, {"_id": document_id, **document}, upsert=True))
+        if operations:
+            await self._collection(WRITES_COLLECTION).bulk_write(operations, ordered=False)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        for name in (CHECKPOINTS_COLLECTION, WRITES_COLLECTION, BLOBS_COLLECTION):
+            await self._collection(name).delete_many({"thread_id": thread_id})
+
+
+async def attach_checkpointer(workflow):
+    """Make runs given a thread id resumable, unless GRAPH_CHECKPOINTS=false or MongoDB is unavailable."""
+    if not settings.GRAPH_CHECKPOINTS or get_database() is None:
+        return
+    saver = MongoCheckpointSaver()
+    await saver.ensure_indexes()
+    workflow.attach_checkpointer(saver)
@@ -55,7 +55,30 @@ class CloudinaryService:
         resource_type: str = "auto"
     ) -> Dict[str, Any]:
         """
-        Upload file to Cloudinary
+        Upload file to Cloudinary without blocking the event loop
+        
+        Args:
+            file_content: The file content as bytes
+            filename: Original filename
+            folder: Cloudinary folder to store the file
+            resource_type: Type of resource (auto, image, video, raw)
+            
+        Returns:
+            Dict containing upload result and metadata
+        """
+        return await asyncio.to_thread(
+            self.upload_file_sync, file_content, filename, folder, resource_type
+        )
+    
+    def upload_file_sync(
+        self, 
+        file_content: bytes, 
+        filename: str,
+        folder: str = "verihub/uploads",
+        resource_type: str = "auto"
+    ) -> Dict[str, Any]:
+        """
+        Upload file to Cloudinary (blocking; safe to call from worker threads)
         
         Args:
             file_content: The file content as bytes
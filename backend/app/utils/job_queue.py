@@ -0,0 +1,214 @@
+"""
+Durable verification job queue stored in MongoDB and drained by `python -m app.worker`
+"""
+import uuid
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+from ai_agent.src.metrics import registry as metrics_registry
+from ..core.config import settings
+from ..core.database import get_database
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "verification_jobs"
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+FINISHED = (DONE, FAILED)
+
+job_queue_depth = metrics_registry.gauge(
+    "verihub_job_queue_depth", "Verification jobs waiting for or held by a worker.", ("status",)
+)
+job_oldest_queued = metrics_registry.gauge(
+    "verihub_job_oldest_queued_seconds", "Age of the oldest job still waiting for a worker."
+)
+job_wait_seconds = metrics_registry.gauge(
+    "verihub_job_wait_seconds", "Queue wait of jobs finished in the stats window.", ("stat",)
+)
+job_run_seconds = metrics_registry.gauge(
+    "verihub_job_run_seconds", "Run time of jobs finished in the stats window.", ("stat",)
+)
+
+
+class JobQueue:
+    """Verification jobs as MongoDB documents; workers claim them with a renewable lease.
+
+    A job whose worker dies is picked up again once its lease expires, up to
+    JOB_MAX_ATTEMPTS times. Finished jobs are dropped by a TTL index.
+    """
+
+    def __init__(self):
+        self.lease_seconds = settings.JOB_LEASE_SECONDS
+        self.max_attempts = settings.JOB_MAX_ATTEMPTS
+
+    def _collection(self):
+        database = get_database()
+        if database is None:
+            raise RuntimeError("Database connection is not available")
+        return database[COLLECTION_NAME]
+
+    async def ensure_indexes(self):
+        try:
+            collection = self._collection()
+            await collection.create_index([("status", 1), ("created_at", 1)])
+            await collection.create_index("finished_at", expireAfterSeconds=settings.JOB_RESULT_TTL_SECONDS)
+        except Exception as e:
+            logger.error(f"Job queue index creation failed: {e}")
+
+    async def enqueue(
+        self,
+        input_type: str,
+        raw_input: Optional[str],
+        image_bytes: Optional[bytes] = None,
+        filename: Optional[str] = None,
+        evidence_mode: str = "sequential"
+    ) -> str:
+        job_id = uuid.uuid4().hex
+        await self._collection().insert_one({
+            "_id": job_id,
+            "status": QUEUED,
+            "input_type": input_type,
+            "raw_input": raw_input,
+            "image_bytes": image_bytes,
+            "filename": filename,
+            "evidence_mode": evidence_mode,
+            "created_at": datetime.utcnow(),
+            "attempts": 0,
+            "progress": []
+        })
+        return job_id
+
+    async def claim_next(self, worker_id: str) -> Optional[dict]:
+        """Atomically take the oldest queued job, or one whose worker's lease has expired."""
+        now = datetime.utcnow()
+        return await self._collection().find_one_and_update(
+            {
+                "$or": [{"status": QUEUED}, {"status": RUNNING, "lease_until": {"$lt": now}}],
+                "attempts": {"$lt": self.max_attempts}
+            },
+            {
+                "$set": {
+                    "status": RUNNING,
+                    "worker": worker_id,
+                    "started_at": now,
+                    "lease_until": now + timedelta(seconds=self.lease_seconds),
+                    # Drop a previous attempt's events; a retry reports the steps it (re)runs itself
+                    "progress": []
+                },
+                # Set on the first claim only; started_at moves to each retry's start
+                "$min": {"first_started_at": now},
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def fail_abandoned(self) -> int:
+        """Fail running jobs whose lease expired on their last allowed attempt."""
+        now = datetime.utcnow()
+        result = await self._collection().update_many(
+            {"status": RUNNING, "lease_until": {"$lt": now}, "attempts": {"$gte": self.max_attempts}},
+            {
+                "$set": {"status": FAILED, "finished_at": now, "error": "Worker stopped responding"},
+                "$unset": {"image_bytes": ""}
+            }
+        )
+        return result.modified_count
+
+    async def renew_lease(self, job_id: str, worker_id: str) -> bool:
+        """Extend this worker's lease; False when the job is no longer running under it."""
+        result = await self._collection().update_one(
+            {"_id": job_id, "worker": worker_id, "status": RUNNING},
+            {"$set": {"lease_until": datetime.utcnow() + timedelta(seconds=self.lease_seconds)}}
+        )
+        return result.matched_count == 1
+
+    async def append_progress(self, job_id: str, worker_id: str, event: dict):
+        await self._collection().update_one(
+            {"_id": job_id, "worker": worker_id, "status": RUNNING},
+            {
+                "$push": {"progress": event},
+                "$set": {"lease_until": datetime.utcnow() + timedelta(seconds=self.lease_seconds)}
+            }
+        )
+
+    async def _finish(self, job: dict, worker_id: str, status: str, fields: dict):
+        now = datetime.utcnow()
+        # Queue wait ends at the first claim, not at a retry's; run_seconds is the final attempt's
+        first_started_at = job.get("first_started_at", job["started_at"])
+        await self._collection().update_one(
+            {"_id": job["_id"], "worker": worker_id, "status": RUNNING},
+            {
+                "$set": {
+                    "status": status,
+                    "finished_at": now,
+                    "wait_seconds": (first_started_at - job["created_at"]).total_seconds(),
+                    "run_seconds": (now - job["started_at"]).total_seconds(),
+                    **fields
+                },
+                # Uploaded images are only needed while the job runs
+                "$unset": {"image_bytes": "", "lease_until": ""}
+            }
+        )
+
+    async def complete(self, job: dict, worker_id: str, result: dict):
+        await self._finish(job, worker_id, DONE, {"result": result})
+
+    async def fail(self, job: dict, worker_id: str, error: str):
+        await self._finish(job, worker_id, FAILED, {"error": error})
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await self._collection().find_one({"_id": job_id}, {"image_bytes": 0})
+
+    async def stats(self) -> dict:
+        """Queue depth by status plus wait and run times of recently finished jobs, in seconds."""
+        collection = self._collection()
+        now = datetime.utcnow()
+        depth = {
+            QUEUED: await collection.count_documents({"status": QUEUED}),
+            RUNNING: await collection.count_documents({"status": RUNNING})
+        }
+        oldest = await collection.find_one({"status": QUEUED}, {"created_at": 1}, sort=[("created_at", 1)])
+
+        window_start = now - timedelta(seconds=settings.JOB_STATS_WINDOW_SECONDS)
+        recent = {"finished": 0, "wait_avg": 0.0, "wait_max": 0.0, "run_avg": 0.0, "run_max": 0.0}
+        async for row in collection.aggregate([
+            {"$match": {"status": {"$in": list(FINISHED)}, "finished_at": {"$gte": window_start}}},
+            {"$group": {
+                "_id": None,
+                "finished": {"$sum": 1},
+                "wait_avg": {"$avg": "$wait_seconds"},
+                "wait_max": {"$max": "$wait_seconds"},
+                "run_avg": {"$avg": "$run_seconds"},
+                "run_max": {"$max": "$run_seconds"}
+            }}
+        ]):
+            recent.update({key: value for key, value in row.items() if key != "_id"})
+
+        return {
+            "depth": depth,
+            "oldest_queued_seconds": (now - oldest["created_at"]).total_seconds() if oldest else 0.0,
+            "window_seconds": settings.JOB_STATS_WINDOW_SECONDS,
+            "recent": recent
+        }
+
+    async def refresh_metrics(self):
+        """Copy the queue stats into the Prometheus gauges; called before each metrics scrape."""
+        try:
+            stats = await self.stats()
+        except Exception as e:
+            logger.error(f"Job queue stats failed: {e}")
+            return
+        for status, count in stats["depth"].items():
+            job_queue_depth.set(count, status=status)
+        job_oldest_queued.set(stats["oldest_queued_seconds"])
+        for stat in ("avg", "max"):
+            job_wait_seconds.set(stats["recent"][f"wait_{stat}"], stat=stat)
+            job_run_seconds.set(stats["recent"][f"run_{stat}"], stat=stat)
+
+
+# Global instance
+job_queue = JobQueue()
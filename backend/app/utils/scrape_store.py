@@ -0,0 +1,67 @@
+"""
+MongoDB tier for the scrape cache, shared by every API and worker process
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import Binary
+
+from ai_agent.src.scrape_cache import scrape_cache
+from ..core.config import settings
+from ..core.database import get_database
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "scrape_cache"
+
+
+class MongoScrapeStore:
+    """Compressed scrape entries in MongoDB.
+
+    Entries outlive their TTL by SCRAPE_CACHE_STALE_SECONDS so expired pages can
+    still be revalidated with their origin; after that a TTL index drops them.
+    """
+
+    def __init__(self, stale_seconds: int = None):
+        self.stale_seconds = stale_seconds or settings.SCRAPE_CACHE_STALE_SECONDS
+
+    def _collection(self):
+        database = get_database()
+        return database[COLLECTION_NAME] if database is not None else None
+
+    async def ensure_indexes(self):
+        collection = self._collection()
+        if collection is None:
+            return
+        try:
+            await collection.create_index("purge_at", expireAfterSeconds=0)
+        except Exception as e:
+            logger.error(f"Scrape cache index creation failed: {e}")
+
+    async def get(self, key: str) -> Optional[bytes]:
+        collection = self._collection()
+        if collection is None:
+            return None
+        document = await collection.find_one({"_id": key}, {"blob": 1})
+        return bytes(document["blob"]) if document else None
+
+    async def put(self, key: str, blob: bytes, expires_at: float):
+        collection = self._collection()
+        if collection is None:
+            return
+        expires = datetime.utcfromtimestamp(expires_at)
+        await collection.replace_one(
+            {"_id": key},
+            {"_id": key, "blob": Binary(blob), "expires_at": expires, "purge_at": expires + timedelta(seconds=self.stale_seconds)},
+            upsert=True
+        )
+
+
+async def attach_scrape_store():
+    """Back the process-wide scrape cache with MongoDB when SCRAPE_CACHE_BACKEND=mongo."""
+    if settings.SCRAPE_CACHE_BACKEND != "mongo":
+        return
+    store = MongoScrapeStore()
+    await store.ensure_indexes()
+    scrape_cache.store = store
@@ -0,0 +1,182 @@
+"""
+Verified-claim cache: recent verdicts keyed by normalized claim text or image content
+"""
+import json
+import time
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+from pymongo.errors import OperationFailure
+
+from ai_agent.src.cache import LRUCache
+from ai_agent.src.claim_index import ClaimIndex, normalize_claim, contradicts
+from ai_agent.src.models import VerificationSummary
+from ..core.config import settings
+from ..core.database import get_database
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "verdict_cache"
+
+
+class VerdictCache:
+    """Verdicts stored in MongoDB (expired by a TTL index) with an in-process LRU in front.
+
+    Text claims are also indexed by MinHash signature, so the verification of a
+    reworded copy of an already verified claim can start from its evidence (see
+    get_near_duplicate).
+    """
+
+    def __init__(self, ttl_seconds: int = None, max_bytes: int = None, similarity_threshold: float = None):
+        self.ttl_seconds = ttl_seconds or settings.VERDICT_CACHE_TTL_SECONDS
+        self.memory = LRUCache(max_bytes=max_bytes or settings.VERDICT_CACHE_MAX_BYTES)
+        self.index = ClaimIndex(max_entries=settings.CLAIM_INDEX_MAX_ENTRIES)
+        self.similarity_threshold = similarity_threshold or settings.CLAIM_SIMILARITY_THRESHOLD
+        # Lookups across both tiers, for the metrics registry
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for_text(claim: str) -> str:
+        return "text:" + hashlib.sha256(normalize_claim(claim).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def key_for_image(image_bytes: bytes) -> str:
+        return "image:" + hashlib.sha256(image_bytes).hexdigest()
+
+    def _collection(self):
+        database = get_database()
+        return database[COLLECTION_NAME] if database is not None else None
+
+    async def ensure_indexes(self):
+        """Create the TTL index MongoDB uses to drop expired verdicts."""
+        collection = self._collection()
+        if collection is None:
+            return
+        try:
+            try:
+                await collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+            except OperationFailure:
+                # TTL changed since the index was created: update it in place
+                await collection.database.command(
+                    "collMod", COLLECTION_NAME,
+                    index={"keyPattern": {"created_at": 1}, "expireAfterSeconds": self.ttl_seconds}
+                )
+        except Exception as e:
+            logger.error(f"Verdict cache index creation failed: {e}")
+
+    @staticmethod
+    def _size(result: dict) -> int:
+        return len(json.dumps(result, default=str))
+
+    def _age_seconds(self, created_at: datetime) -> float:
+        return (datetime.utcnow() - created_at).total_seconds()
+
+    def _as_cached(self, result: dict, created_at: datetime) -> VerificationSummary:
+        summary = VerificationSummary(**result)
+        summary.cached = True
+        summary.cached_age_seconds = round(self._age_seconds(created_at), 3)
+        return summary
+
+    async def load_index(self):
+        """Rebuild the near-duplicate index from the signatures stored with unexpired verdicts."""
+        collection = self._collection()
+        if collection is None:
+            return
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        try:
+            cursor = collection.find({"minhash": {"$exists": True}, "created_at": {"$gt": cutoff}}, {"minhash": 1})
+            async for document in cursor:
+                self.index.add(
+                    document["_id"], np.frombuffer(document["minhash"], dtype=np.uint32),
+                    expires_at=time.time() + self.ttl_seconds - self._age_seconds(document["created_at"])
+                )
+            logger.info(f"Claim index loaded with {len(self.index)} verified claims")
+        except Exception as e:
+            logger.error(f"Claim index load failed: {e}")
+
+    async def _lookup(self, key: str) -> Optional[VerificationSummary]:
+        entry = self.memory.get(key)
+        if entry is not None and self._age_seconds(entry[1]) < self.ttl_seconds:
+            return self._as_cached(*entry)
+
+        collection = self._collection()
+        if collection is not None:
+            try:
+                document = await collection.find_one({"_id": key})
+            except Exception as e:
+                logger.error(f"Verdict cache read failed: {e}")
+                document = None
+            # The TTL monitor only runs once a minute, so check expiry here as well
+            if document and self._age_seconds(document["created_at"]) < self.ttl_seconds:
+                self.memory.put(key, (document["result"], document["created_at"]), self._size(document["result"]))
+                return self._as_cached(document["result"], document["created_at"])
+        return None
+
+    async def get(self, key: str) -> Optional[VerificationSummary]:
+        """Return a cached verdict younger than the TTL, or None."""
+        result = await self._lookup(key)
+        if result:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return result
+
+    async def get_claim(self, claim: str) -> Optional[VerificationSummary]:
+        """Return the cached verdict of this exact (normalized) text claim, or None."""
+        return await self.get(self.key_for_text(claim))
+
+    async def get_near_duplicate(self, claim: str) -> Optional[VerificationSummary]:
+        """Return the verdict of the most similar verified claim, or None.
+
+        Only a starting point: the workflow re-checks its evidence against the
+        new claim (see Workflow.arun near_duplicate) rather than returning it.
+        Candidates that negate the claim or state other numbers are skipped
+        without that re-check.
+        """
+        for key, similarity in self.index.query(self.index.signature(claim), self.similarity_threshold):
+            result = await self._lookup(key)
+            if result is None:
+                # Expired or evicted since it was indexed
+                self.index.remove(key)
+                continue
+            if result.text_check is None or contradicts(claim, result.raw_input):
+                continue
+            result.matched_claim = result.raw_input
+            result.match_similarity = round(similarity, 3)
+            return result
+        return None
+
+    async def put(self, key: str, result: VerificationSummary, claim: Optional[str] = None):
+        """Store a fresh verdict; runs that produced no verdict at all, or only a partial one, are not cached.
+
+        Pass the claim text to make the verdict reusable for near-duplicate claims.
+        """
+        if result.cached or result.deadline_exceeded or (result.text_check is None and result.img_check is None):
+            return
+
+        # Timings describe the original run, not the cached answer
+        data = result.model_dump(exclude={"cached", "cached_age_seconds", "matched_claim", "match_similarity", "timings"})
+        created_at = datetime.utcnow()
+        self.memory.put(key, (data, created_at), self._size(data))
+
+        document = {"_id": key, "result": data, "created_at": created_at}
+        if claim:
+            signature = self.index.signature(claim)
+            self.index.add(key, signature, expires_at=time.time() + self.ttl_seconds)
+            document["minhash"] = signature.tobytes()
+
+        collection = self._collection()
+        if collection is None:
+            return
+        try:
+            await collection.replace_one({"_id": key}, document, upsert=True)
+        except Exception as e:
+            logger.error(f"Verdict cache write failed: {e}")
+
+
+# Global instance
+verdict_cache = VerdictCache()
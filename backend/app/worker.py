@@ -0,0 +1,170 @@
+"""
+Background verification worker: `python -m app.worker`
+
+Starts WORKER_PROCESSES processes; each claims jobs from the MongoDB job queue
+and runs up to WORKER_CONCURRENCY of them at once on its own event loop.
+"""
+import os
+import time
+import signal
+import socket
+import asyncio
+import logging
+import multiprocessing
+
+from app.core.config import settings
+from app.core.database import connect_to_mongo, close_mongo_connection
+from ai_agent.src.ocr_engine import ocr_engine
+from app.utils.verdict_cache import verdict_cache
+from app.utils.job_queue import job_queue
+from app.utils.scrape_store import attach_scrape_store
+from app.utils.checkpoint_store import attach_checkpointer
+from app.routes.verify import verification_events, workflow
+
+logger = logging.getLogger(__name__)
+
+
+async def _keep_lease(job_id: str, worker_id: str, job_run: asyncio.Task):
+    """Renew the job's lease while it runs, and cancel the run once the lease is lost.
+
+    Past that point another worker may already be running the job, so this one stops.
+    """
+    # Nodes can run longer than the lease between two progress events
+    interval = job_queue.lease_seconds / 3
+    renewed_at = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if not await job_queue.renew_lease(job_id, worker_id):
+                logger.error(f"Job {job_id} is no longer leased to {worker_id}, cancelling it")
+                break
+            renewed_at = time.monotonic()
+        except Exception as e:
+            if time.monotonic() + interval - renewed_at >= job_queue.lease_seconds:
+                logger.error(f"Could not renew the lease of job {job_id} before it expires, cancelling it: {e}")
+                break
+            logger.warning(f"Lease renewal of job {job_id} failed, retrying: {e}")
+    job_run.cancel()
+
+
+async def _run_events(job: dict, worker_id: str) -> tuple:
+    """Stream the verification into the job's progress; returns (result, error)."""
+    result = None
+    error = None
+    try:
+        async for event in verification_events(
+            job["input_type"], job["raw_input"], job.get("image_bytes"), job.get("filename"), job["evidence_mode"],
+            thread_id=f"job:{job['_id']}"
+        ):
+            # Summary tokens would mean a write per token; the complete event carries the full summary
+            if event.get("type") == "summary_delta":
+                continue
+            await job_queue.append_progress(job["_id"], worker_id, event)
+            if event.get("type") == "complete":
+                result = event["result"]
+            elif event.get("type") == "error":
+                error = event.get("content")
+    except Exception as e:
+        error = f"Error during verification: {e}"
+    return result, error
+
+
+async def run_job(job: dict, worker_id: str):
+    """Run one claimed job, persisting its progress events and final result.
+
+    The job id is the graph's thread id, so a job retried after its worker died
+    continues from the last step that worker completed.
+    """
+    job_run = asyncio.create_task(_run_events(job, worker_id))
+    heartbeat = asyncio.create_task(_keep_lease(job["_id"], worker_id, job_run))
+    try:
+        result, error = await job_run
+    except asyncio.CancelledError:
+        if not heartbeat.done():
+            raise
+        # The lease was lost: the job's outcome belongs to whichever worker holds it now
+        logger.warning(f"Job {job['_id']} cancelled on {worker_id} after losing its lease")
+        return
+    finally:
+        heartbeat.cancel()
+
+    try:
+        if result is not None:
+            await job_queue.complete(job, worker_id, result)
+        else:
+            await job_queue.fail(job, worker_id, error or "Verification produced no result")
+    except Exception as e:
+        # The lease expires and another worker retries the job
+        logger.error(f"Could not record outcome of job {job['_id']}: {e}")
+
+
+async def worker_loop(worker_id: str):
+    await connect_to_mongo()
+    await verdict_cache.load_index()
+    await attach_scrape_store()
+    await attach_checkpointer(workflow)
+    await asyncio.to_thread(ocr_engine.start)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    slots = asyncio.Semaphore(settings.WORKER_CONCURRENCY)
+    running = set()
+    print(f"Worker {worker_id} ready: up to {settings.WORKER_CONCURRENCY} concurrent job(s)")
+
+    while not stop.is_set():
+        await slots.acquire()
+        try:
+            await job_queue.fail_abandoned()
+            job = await job_queue.claim_next(worker_id)
+        except Exception as e:
+            logger.error(f"Job queue unavailable: {e}")
+            job = None
+        if job is None:
+            slots.release()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        task = asyncio.create_task(run_job(job, worker_id))
+        running.add(task)
+        task.add_done_callback(running.discard)
+        task.add_done_callback(lambda _: slots.release())
+
+    # Let jobs already claimed finish before exiting
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
+    ocr_engine.shutdown()
+    await asyncio.to_thread(workflow.tool.image_hash_index.flush)
+    await workflow.tool.aclose()
+    await close_mongo_connection()
+
+
+def run_worker(index: int):
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(worker_loop(f"{socket.gethostname()}-{os.getpid()}-{index}"))
+
+
+def main():
+    if settings.WORKER_PROCESSES <= 1:
+        run_worker(0)
+        return
+
+    # spawn: each worker builds its own event loop, HTTP clients and OCR pool
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=run_worker, args=(index,)) for index in range(settings.WORKER_PROCESSES)]
+    for process in processes:
+        process.start()
+    # Forward SIGTERM so every child drains its running jobs; Ctrl+C already reaches the whole group
+    signal.signal(signal.SIGTERM, lambda *_: [process.terminate() for process in processes])
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
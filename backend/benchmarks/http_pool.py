@@ -0,0 +1,184 @@
+"""Per-call latency of the pooled upstream client against a connection per call.
+
+Calls benchmarks.stub_server (over TLS with a throwaway self-signed
+certificate, unless --no-tls) through three clients:
+
+  new_connection  a fresh httpx.AsyncClient per call, which is what the bare
+                  requests.get calls and the SerpAPI/Firecrawl SDKs amounted to
+  pooled_plain    one keep-alive httpx.AsyncClient with the pool limits of create_client()
+  pooled          create_client() itself, the client VerificationService shares,
+                  which adds HostLimitedTransport's per-host cap
+
+Each client makes --calls requests one after another (per-call latency) and
+then --calls requests with --concurrency in flight (throughput). The stub
+answers at once, so what is measured is connection setup plus client overhead.
+--handshake-ms adds a delay to every new connection, standing in for the
+network round trips of a TCP+TLS handshake with a remote upstream.
+
+    cd backend && python -m benchmarks.http_pool [--handshake-ms 0 30] [--json out.json]
+"""
+import os
+import ssl
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+import httpx
+
+from ai_agent.src.http_pool import create_client
+from .stub_server import StubServer, rewrite_hook
+
+
+def self_signed_certificate(directory: str):
+    """(certificate path, key path) for 127.0.0.1, made with the openssl CLI."""
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run([
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+        "-keyout", key, "-out", cert, "-subj", "/CN=localhost", "-addext", "subjectAltName=IP:127.0.0.1",
+    ], check=True, capture_output=True)
+    return cert, key
+
+
+def server_context(cert: str, key: str) -> ssl.SSLContext:
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    # The stub only speaks HTTP/1.1, so don't let ALPN pick h2
+    context.set_alpn_protocols(["http/1.1"])
+    return context
+
+
+def pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "40")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60")),
+    )
+
+
+class Clients:
+    """Builds each benchmarked client, all pointed at the stub server."""
+
+    def __init__(self, port: int, scheme: str, verify):
+        self.hooks = {"request": [rewrite_hook(port, scheme)]}
+        self.verify = verify
+
+    def new_connection(self):
+        return httpx.AsyncClient(verify=self.verify, event_hooks=self.hooks)
+
+    def pooled_plain(self):
+        transport = httpx.AsyncHTTPTransport(limits=pool_limits(), verify=self.verify, retries=1)
+        return httpx.AsyncClient(transport=transport, event_hooks=self.hooks)
+
+    def pooled(self):
+        # create_client() verifies against SSL_CERT_FILE, set to the stub's certificate in main()
+        client = create_client()
+        client.event_hooks = self.hooks
+        return client
+
+
+async def call_fresh(clients: Clients, url: str):
+    async with clients.new_connection() as client:
+        (await client.get(url)).raise_for_status()
+
+
+async def measure(server: StubServer, clients: Clients, mode: str, calls: int, concurrency: int) -> dict:
+    url = "https://api.upstream.test/v1/search"
+    shared = None if mode == "new_connection" else getattr(clients, mode)()
+
+    async def call():
+        if shared is None:
+            await call_fresh(clients, url)
+        else:
+            (await shared.get(url)).raise_for_status()
+
+    try:
+        await call()  # connection warm-up, not counted
+        connections = server.connections
+        durations = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            await call()
+            durations.append(time.perf_counter() - start)
+        sequential_connections = server.connections - connections
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited():
+            async with semaphore:
+                await call()
+        connections = server.connections
+        start = time.perf_counter()
+        await asyncio.gather(*(limited() for _ in range(calls)))
+        elapsed = time.perf_counter() - start
+    finally:
+        if shared is not None:
+            await shared.aclose()
+
+    return {
+        "mode": mode,
+        "mean_ms": round(statistics.mean(durations) * 1000, 2),
+        "p50_ms": round(statistics.median(durations) * 1000, 2),
+        "p95_ms": round(sorted(durations)[int(0.95 * len(durations))] * 1000, 2),
+        "connections": sequential_connections,
+        "concurrent_per_second": round(calls / elapsed, 1),
+        "concurrent_connections": server.connections - connections,
+    }
+
+
+async def run(args, cert: str, key: str) -> list:
+    rows = []
+    for handshake_ms in args.handshake_ms:
+        server = StubServer(connect_delay=handshake_ms / 1000)
+        port = await server.start(ssl_context=server_context(cert, key) if cert else None)
+        # Built once and shared, so new_connection pays for the connection only and not
+        # for loading a CA bundle per client (a further ~30 ms per fresh httpx client)
+        verify = ssl.create_default_context(cafile=cert) if cert else ssl.create_default_context()
+        clients = Clients(port, "https" if cert else "http", verify)
+        try:
+            for mode in ("new_connection", "pooled_plain", "pooled"):
+                row = await measure(server, clients, mode, args.calls, args.concurrency)
+                row.update({"tls": bool(cert), "handshake_ms": handshake_ms})
+                print(json.dumps(row), file=sys.stderr)
+                rows.append(row)
+        finally:
+            await server.stop()
+    return rows
+
+
+def print_table(rows: list):
+    columns = ["tls", "handshake_ms", "mode", "mean_ms", "p50_ms", "p95_ms", "connections",
+               "concurrent_per_second", "concurrent_connections"]
+    widths = [max(len(column), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--handshake-ms", type=float, nargs="+", default=[0, 30],
+                        help="extra delay on every new connection, one run per value")
+    parser.add_argument("--no-tls", action="store_true", help="plain HTTP instead of TLS")
+    parser.add_argument("--json", help="write the rows to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = (None, None) if args.no_tls else self_signed_certificate(directory)
+        if cert:
+            os.environ["SSL_CERT_FILE"] = cert
+        rows = asyncio.run(run(args, cert, key))
+
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"rows": rows, "args": vars(args)}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Throughput of one worker process as concurrent clients are added.
+
+Everything runs on one event loop against benchmarks.stub_server, with fixed
+per-upstream latencies, and a fake chat model that sleeps for a fixed time
+per call. The stages measured are:
+
+  pooled client  VerificationService.fact_check through the shared keep-alive client
+  scrape_pages   ranked pages scraped concurrently vs. one at a time
+  workflow       whole text verifications (sequential and speculative evidence modes),
+                 each with its own claim so no cache short-circuits the run
+
+For each level of concurrency the script reports throughput, p50/p95
+latency and how many connections the stub server accepted. A blocked event
+loop would show up as flat throughput.
+
+    cd backend && python -m benchmarks.load_test [--clients 1 4 16 64] [--json out.json]
+
+Rate limits are disabled and the per-upstream and per-host concurrency caps
+raised (unless set in the environment), so the numbers measure the app rather
+than the limits configured for the real APIs. Every upstream is served from
+the stub's one host here, so the default per-host cap would throttle them all
+together.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+
+os.environ.setdefault("UPSTREAM_CONCURRENCY", "256")
+os.environ.setdefault("HTTP_MAX_PER_HOST", "100")
+for _upstream in ("serpapi", "firecrawl", "factcheck", "x_api"):
+    os.environ.setdefault(f"{_upstream.upper()}_RATE_PER_SECOND", "0")
+for _name in ("SERPAPI_KEY", "FIRECRAWL_API_KEY", "X_BEARER_TOKEN", "FACTCHECK_API_KEY", "GOOGLE_API_KEY"):
+    os.environ.setdefault(_name, "load-test")
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+from ai_agent.src.workflow import Workflow
+from ai_agent.src.models import TextCheck
+from ai_agent.src.http_pool import create_client
+from ai_agent.src.scrape_cache import ScrapeCache
+from .stub_server import StubServer, rewrite_hook
+
+
+class FakeStructuredModel:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.latency)
+        return TextCheck(claim="claim", verified_status="true", confidence_score=0.8)
+
+
+class FakeChatModel:
+    """Chat model that answers after `latency` seconds, like a remote LLM."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.latency)
+        return AIMessage(content="city council budget")
+
+    def with_structured_output(self, schema):
+        return FakeStructuredModel(self.latency)
+
+    async def astream(self, messages):
+        await asyncio.sleep(self.latency)
+        for word in ("The claim ", "is supported ", "by the sources."):
+            yield AIMessageChunk(content=word)
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def drive(clients: int, total: int, call) -> dict:
+    """Run `total` calls of call(i) from `clients` concurrent clients, each issuing its calls back to back."""
+    latencies = []
+    counter = iter(range(total))
+
+    async def client():
+        for i in counter:
+            start = time.perf_counter()
+            await call(i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    return {
+        "clients": clients,
+        "calls": total,
+        "seconds": round(elapsed, 3),
+        "per_second": round(total / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+    }
+
+
+async def run(args) -> dict:
+    server = StubServer(latency={
+        "serpapi": args.search_latency,
+        "factcheck": args.search_latency,
+        "x_api": args.search_latency,
+        "firecrawl": args.scrape_latency,
+    })
+    port = await server.start()
+
+    workflow = Workflow()
+    workflow.llm = workflow.ocr_llm = FakeChatModel(args.llm_latency)
+    tool = workflow.tool
+    client = create_client(timeout=30)
+    client.event_hooks = {"request": [rewrite_hook(port)]}
+    tool._http_clients[asyncio.get_running_loop()] = client
+
+    def measured(stage: str, result: dict, connections_before: int) -> dict:
+        result["stage"] = stage
+        result["connections"] = server.connections - connections_before
+        print(json.dumps(result), file=sys.stderr)
+        return result
+
+    rows = []
+    run_id = 0
+    try:
+        for clients in args.clients:
+            before = server.connections
+            result = await drive(clients, args.calls, lambda i: tool.fact_check(f"load test claim {clients}-{i}"))
+            rows.append(measured("pooled_client", result, before))
+
+        for concurrency in (1, tool.SCRAPE_CONCURRENCY):
+            tool.scrape_cache = ScrapeCache(directory="")
+            before = server.connections
+            urls = [f"https://news.test/scrape/{concurrency}/{i}" for i in range(10)]
+
+            async def scrape(i, concurrency=concurrency):
+                await tool.scrape_pages(urls, max_success=5, concurrency=concurrency)
+            result = await drive(1, 1, scrape)
+            rows.append(measured(f"scrape_pages(concurrency={concurrency})", result, before))
+
+        for mode in ("sequential", "speculative"):
+            for clients in args.clients:
+                run_id += 1
+                before = server.connections
+                total = max(args.verifications, clients)
+
+                async def verify(i, run_id=run_id, mode=mode):
+                    claim = f"Claim {run_id}-{i}: the Springfield city council approved a new road repair budget"
+                    await workflow.arun(input_type="text", raw_input=claim, evidence_mode=mode)
+                result = await drive(clients, total, verify)
+                rows.append(measured(f"workflow({mode})", result, before))
+    finally:
+        await tool.aclose()
+        await server.stop()
+    return {"rows": rows, "stub_requests": server.requests}
+
+
+def print_table(rows: list):
+    columns = ["stage", "clients", "calls", "seconds", "per_second", "p50_ms", "p95_ms", "connections"]
+    widths = [max(len(column), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--calls", type=int, default=200, help="fact_check calls per pooled-client level")
+    parser.add_argument("--verifications", type=int, default=64, help="workflow runs per level")
+    parser.add_argument("--search-latency", type=float, default=0.08, help="SerpAPI/FactCheck/X response time (s)")
+    parser.add_argument("--scrape-latency", type=float, default=0.3, help="Firecrawl response time (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.4, help="time per LLM call (s)")
+    parser.add_argument("--json", help="write the rows to this file")
+    args = parser.parse_args()
+
+    # The workflow prints progress for every call; keep stdout for the table
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = asyncio.run(run(args))
+    print_table(results["rows"])
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**results, "args": vars(args)}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
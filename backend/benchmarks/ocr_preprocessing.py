@@ -0,0 +1,265 @@
+"""OCR latency and text recall with and without the NumPy preprocessing stage.
+
+Renders phone-sized screenshots with known text (light, dark and low-contrast
+themes, at several font sizes, some with an EXIF rotation) and OCRs each one
+twice through the same EasyOCR reader the worker pool uses:
+
+  raw           encoded upload bytes straight into EasyOCR (the old run_ocr path)
+  preprocessed  preprocess_image() once, then the in-memory array into EasyOCR
+
+Recall is the fraction of ground-truth words found in the OCR output. Extra
+images can be added with --images DIR, where each image has a sidecar .txt
+holding its expected text.
+
+    cd backend && python -m benchmarks.ocr_preprocessing [--rounds 3] [--json out.json]
+
+If the EasyOCR model weights can't be loaded (e.g. no network to download
+them), the CRAFT text detector is built with untrained weights instead and only
+its latency is reported: the network does the same work either way, so the
+detection timings hold, but recall can't be measured. Detection dominates
+EasyOCR's cost on large screenshots.
+"""
+import io
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+from PIL import Image, ImageDraw, ImageFont
+
+from ai_agent.src import ocr_engine
+from ai_agent.src.image_preprocessing import preprocess_image, load_image
+
+PHONE_SIZE = (1170, 2532)
+THEMES = {
+    "light": ((255, 255, 255), (20, 20, 20)),
+    "dark": ((16, 16, 20), (235, 235, 235)),
+    "low_contrast": ((205, 205, 205), (130, 130, 130)),
+}
+FONT_SIZES = (42, 64, 96)
+CLAIMS = [
+    "BREAKING: City council votes to ban all gas stoves starting next January",
+    "NASA confirms the Artemis launch has been delayed until late September",
+    "Scientists report drinking three cups of coffee a day doubles your lifespan",
+    "The new bridge toll will rise to twenty dollars for every car from Monday",
+]
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def words(text: str) -> list:
+    return _WORD_RE.findall(text.lower())
+
+
+def recall(expected: str, found: str) -> float:
+    """Fraction of expected words (with multiplicity) present in the OCR output."""
+    remaining = {}
+    for word in words(found):
+        remaining[word] = remaining.get(word, 0) + 1
+    expected_words = words(expected)
+    hits = 0
+    for word in expected_words:
+        if remaining.get(word):
+            remaining[word] -= 1
+            hits += 1
+    return hits / len(expected_words) if expected_words else 1.0
+
+
+def render_screenshot(text: str, theme: str, font_size: int, rotate: bool) -> bytes:
+    """A phone screenshot holding `text` wrapped to the screen width, encoded as PNG (JPEG with EXIF when rotated)."""
+    background, ink = THEMES[theme]
+    image = Image.new("RGB", PHONE_SIZE, background)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=font_size)
+
+    lines, line = [], ""
+    for word in text.split():
+        candidate = f"{line} {word}".strip()
+        if draw.textlength(candidate, font=font) > PHONE_SIZE[0] - 120:
+            lines.append(line)
+            candidate = word
+        line = candidate
+    lines.append(line)
+
+    y = 320
+    for line in lines:
+        draw.text((60, y), line, fill=ink, font=font)
+        y += int(font_size * 1.6)
+
+    buffer = io.BytesIO()
+    if rotate:
+        # Stored sideways with an EXIF tag, the way some phones save screenshots
+        image = image.transpose(Image.Transpose.ROTATE_90)
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        image.save(buffer, format="JPEG", quality=90, exif=exif)
+    else:
+        image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def synthetic_samples() -> list:
+    samples = []
+    for i, (theme, font_size) in enumerate((t, s) for t in THEMES for s in FONT_SIZES):
+        text = CLAIMS[i % len(CLAIMS)]
+        rotate = i % 3 == 2
+        name = f"{theme}-{font_size}px{'-exif' if rotate else ''}"
+        samples.append((name, render_screenshot(text, theme, font_size, rotate), text))
+    return samples
+
+
+def directory_samples(directory: str) -> list:
+    samples = []
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        truth = os.path.join(directory, stem + ".txt")
+        if ext.lower() in (".png", ".jpg", ".jpeg", ".webp") and os.path.exists(truth):
+            with open(os.path.join(directory, name), "rb") as f:
+                data = f.read()
+            with open(truth, encoding="utf-8") as f:
+                samples.append((name, data, f.read()))
+    return samples
+
+
+def timed(fn, *args, rounds: int):
+    """(median seconds, last result) over `rounds` calls."""
+    durations, result = [], None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn(*args)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations), result
+
+
+def load_reader(torch_threads: int):
+    """Initialize EasyOCR in this process the way a pool worker does; returns an error string on failure."""
+    try:
+        ocr_engine._init_worker(["en"], torch_threads)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def load_untrained_detector():
+    """EasyOCR's CRAFT detector with random weights, or None when EasyOCR isn't installed."""
+    try:
+        from easyocr.craft import CRAFT
+    except ImportError:
+        return None
+    detector = CRAFT()
+    detector.eval()
+    return detector
+
+
+def detect(detector, image):
+    """The detection pass EasyOCR runs in readtext(), with its default thresholds and canvas size."""
+    from easyocr.detection import test_net
+    from easyocr.utils import reformat_input
+
+    img, _ = reformat_input(image)
+    return test_net(2560, 1.0, detector, img, 0.7, 0.4, 0.4, False, "cpu")
+
+
+def run(samples: list, rounds: int, ocr: bool, detector=None) -> list:
+    rows = []
+    for name, data, truth in samples:
+        source_size = load_image(data).size
+        preprocess_seconds, array = timed(preprocess_image, data, rounds=rounds)
+        row = {
+            "image": name,
+            "bytes": len(data),
+            "input_px": f"{source_size[0]}x{source_size[1]}",
+            "ocr_px": f"{array.shape[1]}x{array.shape[0]}",
+            "pixel_ratio": round(array.size / (source_size[0] * source_size[1]), 3),
+            "preprocess_ms": round(preprocess_seconds * 1000, 1),
+        }
+        if ocr:
+            raw_seconds, raw_text = timed(ocr_engine._read_text, data, rounds=rounds)
+            ocr_seconds, text = timed(ocr_engine._read_text, array, rounds=rounds)
+            row.update({
+                "raw_ocr_ms": round(raw_seconds * 1000, 1),
+                "preprocessed_ms": round((preprocess_seconds + ocr_seconds) * 1000, 1),
+                "raw_recall": round(recall(truth, raw_text), 3),
+                "preprocessed_recall": round(recall(truth, text), 3),
+            })
+        elif detector is not None:
+            raw_seconds, _ = timed(detect, detector, data, rounds=rounds)
+            detect_seconds, _ = timed(detect, detector, array, rounds=rounds)
+            row.update({
+                "raw_detect_ms": round(raw_seconds * 1000, 1),
+                "preprocessed_detect_ms": round((preprocess_seconds + detect_seconds) * 1000, 1),
+            })
+        rows.append(row)
+    return rows
+
+
+def print_table(rows: list):
+    columns = list(rows[0])
+    widths = [max(len(column), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+def summarize(rows: list) -> dict:
+    summary = {
+        "images": len(rows),
+        "median_preprocess_ms": statistics.median(row["preprocess_ms"] for row in rows),
+        "median_pixel_ratio": statistics.median(row["pixel_ratio"] for row in rows),
+    }
+    if "raw_ocr_ms" in rows[0]:
+        summary.update({
+            "median_raw_ocr_ms": statistics.median(row["raw_ocr_ms"] for row in rows),
+            "median_preprocessed_ms": statistics.median(row["preprocessed_ms"] for row in rows),
+            "mean_raw_recall": round(statistics.mean(row["raw_recall"] for row in rows), 3),
+            "mean_preprocessed_recall": round(statistics.mean(row["preprocessed_recall"] for row in rows), 3),
+        })
+    if "raw_detect_ms" in rows[0]:
+        summary.update({
+            "median_raw_detect_ms": statistics.median(row["raw_detect_ms"] for row in rows),
+            "median_preprocessed_detect_ms": statistics.median(row["preprocessed_detect_ms"] for row in rows),
+        })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3, help="timed calls per image; the median is reported")
+    parser.add_argument("--images", help="directory of extra images with sidecar .txt ground truth")
+    parser.add_argument("--torch-threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--skip-ocr", action="store_true", help="only time the preprocessing stage")
+    parser.add_argument("--json", help="write the rows and summary to this file")
+    args = parser.parse_args()
+
+    samples = synthetic_samples()
+    if args.images:
+        samples += directory_samples(args.images)
+
+    detector = None
+    ocr_error = "skipped (--skip-ocr)" if args.skip_ocr else load_reader(args.torch_threads)
+    if ocr_error:
+        print(f"OCR not run: {ocr_error}", file=sys.stderr)
+        if not args.skip_ocr:
+            detector = load_untrained_detector()
+            if detector is not None:
+                print("Timing the text detector with untrained weights (latency only, no recall)", file=sys.stderr)
+
+    rows = run(samples, args.rounds, ocr=not ocr_error, detector=detector)
+    summary = summarize(rows)
+    print_table(rows)
+    print()
+    print(json.dumps(summary, indent=2))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "rows": rows,
+                "summary": summary,
+                "ocr_error": ocr_error,
+                "untrained_detector": detector is not None,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
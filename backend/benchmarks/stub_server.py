@@ -0,0 +1,99 @@
+"""Local HTTP/1.1 keep-alive server standing in for every upstream VerificationService calls.
+
+Answers by path, after an optional per-request latency, with the JSON shapes
+SerpAPI, Firecrawl, the FactCheck API and the X API return. A connection
+setup delay can be added to model the TCP+TLS handshake round trips a remote
+upstream costs before the first byte. Point a client at it with
+`rewrite_hook(port)`, which sends every request to the stub whatever host it
+names.
+"""
+import json
+import asyncio
+from urllib.parse import urlsplit, parse_qs
+import httpx
+
+
+class StubServer:
+    def __init__(self, latency: dict = None, connect_delay: float = 0.0, news_results: int = 8):
+        # Seconds before answering, per upstream name (see _route); missing names answer at once
+        self.latency = latency or {}
+        self.connect_delay = connect_delay
+        self.news_results = news_results
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    async def start(self, port: int = 0, ssl_context=None) -> int:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", port, ssl=ssl_context)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            if self.connect_delay:
+                await asyncio.sleep(self.connect_delay)
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                self.requests += 1
+                upstream, payload = self._route(method, target, body)
+                if self.latency.get(upstream):
+                    await asyncio.sleep(self.latency[upstream])
+                data = json.dumps(payload).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+                    + f"content-length: {len(data)}\r\n\r\n".encode()
+                    + (b"" if method == "HEAD" else data)
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _route(self, method: str, target: str, body: bytes):
+        """(upstream name, response JSON) for one request."""
+        parts = urlsplit(target)
+        params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        path = parts.path
+        if path.endswith("/search.json"):
+            if params.get("engine") == "google_reverse_image":
+                return "serpapi", {"image_results": [
+                    {"title": f"Match {i}", "link": f"https://pages.test/{abs(hash(params.get('image_url')))}/{i}"}
+                    for i in range(self.news_results)
+                ]}
+            query = params.get("q", "")
+            return "serpapi", {"news_results": [
+                {"title": f"{query} ({i})", "link": f"https://news.test/{abs(hash(query))}/{i}", "source": {"name": "Stub"}}
+                for i in range(self.news_results)
+            ]}
+        if path.endswith("/v2/scrape"):
+            url = json.loads(body or b"{}").get("url", "")
+            markdown = "\n\n".join(f"Paragraph {i} of {url} about the claim." for i in range(20))
+            return "firecrawl", {"success": True, "data": {"markdown": markdown, "metadata": {"sourceURL": url}}}
+        if path.endswith("claims:search"):
+            return "factcheck", {}
+        if path.endswith("/tweets/search/recent"):
+            return "x_api", {"data": []}
+        return "origin", {}
+
+
+def rewrite_hook(port: int, scheme: str = "http"):
+    """httpx request hook sending every request to the stub server on `port`, whatever its URL."""
+    async def rewrite(request: httpx.Request):
+        request.url = request.url.copy_with(scheme=scheme, host="127.0.0.1", port=port)
+    return rewrite
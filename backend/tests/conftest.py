@@ -0,0 +1,5 @@
+import os
+
+# VerificationService and the chat models refuse to start without keys; tests never reach the real APIs
+for name in ("SERPAPI_KEY", "FIRECRAWL_API_KEY", "X_BEARER_TOKEN", "FACTCHECK_API_KEY", "GOOGLE_API_KEY"):
+    os.environ.setdefault(name, "test")
@@ -0,0 +1,158 @@
+"""Many image verifications at once through one Workflow and a real OCR worker pool.
+
+Upstream APIs are answered by an httpx mock transport and the chat models by
+FakeChatModel; OCR runs in spawned worker processes with WidthReader standing
+in for EasyOCR, which "reads" an image's width back as its text. Each result
+must carry its own image's text, and the OCR cache must see one miss per
+image the first time and one hit per image the second.
+"""
+import re
+import io
+import asyncio
+import httpx
+import numpy as np
+import pytest
+from PIL import Image
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from ai_agent.src.workflow import Workflow
+from ai_agent.src.models import ImageCheck, TextCheck
+from ai_agent.src.ocr_engine import OCREngine
+from ai_agent.src.ocr_cache import OCRCache
+from ai_agent.src.image_hash_index import ImageHashIndex
+from ai_agent.src.scrape_cache import ScrapeCache
+
+CONCURRENT_VERIFICATIONS = 12
+# Preprocessing never rescales an image this short, so its width reaches the reader unchanged
+IMAGE_HEIGHT = 32
+_CLAIM_RE = re.compile(r"claim \d+")
+
+
+class WidthReader:
+    """Stands in for easyocr.Reader in the pool workers."""
+
+    def __init__(self, languages: list):
+        self.languages = languages
+
+    def detect(self, img, text_threshold=None):
+        height, width = img.shape[:2]
+        return [[[0, width, 0, height]]], [[]]
+
+    def recognize(self, img_cv_grey, horizontal_list, free_list):
+        return [(horizontal_list[0], f"claim {img_cv_grey.shape[1]}", 0.99)]
+
+    def readtext(self, image):
+        return [(None, f"claim {image.shape[1]}", 0.99)]
+
+
+class FakeStructuredModel:
+    def __init__(self, schema):
+        self.schema = schema
+
+    async def ainvoke(self, messages):
+        claim = _claim_in(messages)
+        if self.schema is ImageCheck:
+            return ImageCheck(img_url="", extracted_text=claim, img_found=True, match_status="match")
+        return TextCheck(claim=claim, verified_status="false", confidence_score=0.9)
+
+
+class FakeChatModel:
+    """Answers every prompt with the "claim N" text it was given."""
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(0.01)
+        return AIMessage(content=_claim_in(messages))
+
+    def with_structured_output(self, schema):
+        return FakeStructuredModel(schema)
+
+    async def astream(self, messages):
+        for word in ("Summary", " of ", _claim_in(messages)):
+            yield AIMessageChunk(content=word)
+
+
+def _claim_in(messages) -> str:
+    match = _CLAIM_RE.search(messages[-1].content)
+    return match.group(0) if match else ""
+
+
+def _upstream(request: httpx.Request) -> httpx.Response:
+    host = request.url.host
+    if host == "serpapi.com":
+        image = request.url.params.get("image_url", "")
+        if image:
+            return httpx.Response(200, json={"image_results": [
+                {"title": f"Page about {image}", "link": f"https://news.test/{image.rsplit('/', 1)[-1]}"}
+            ]})
+        return httpx.Response(200, json={"news_results": []})
+    if host == "api.firecrawl.dev":
+        return httpx.Response(200, json={"success": True, "data": {"markdown": "Article text.", "metadata": {}}})
+    if host == "factchecktools.googleapis.com":
+        query = request.url.params.get("query", "")
+        return httpx.Response(200, json={"claims": [
+            {"text": query, "claimReview": [{"publisher": {"name": "Checker"}, "textualRating": "False"}]}
+        ]})
+    return httpx.Response(200)
+
+
+def _image(width: int) -> bytes:
+    """Random noise, so no two test images share a perceptual hash."""
+    pixels = np.random.default_rng(width).integers(0, 256, (IMAGE_HEIGHT, width), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="module")
+def ocr_engine():
+    engine = OCREngine(workers=2, torch_threads=1, reader_factory=WidthReader)
+    engine.start()
+    yield engine
+    engine.shutdown()
+
+
+@pytest.fixture
+def workflow(ocr_engine):
+    workflow = Workflow()
+    workflow.llm = workflow.ocr_llm = FakeChatModel()
+    workflow.tool.ocr_engine = ocr_engine
+    workflow.tool.ocr_cache = OCRCache(max_bytes=1024 * 1024)
+    workflow.tool.image_hash_index = ImageHashIndex()
+    workflow.tool.scrape_cache = ScrapeCache()
+    workflow.tool.SCRAPE_REVALIDATE = False
+    return workflow
+
+
+def test_concurrent_image_verifications_keep_their_own_results(workflow, ocr_engine):
+    widths = [100 + 7 * i for i in range(CONCURRENT_VERIFICATIONS)]
+    images = {width: _image(width) for width in widths}
+
+    async def verify_all():
+        loop = asyncio.get_running_loop()
+        workflow.tool._http_clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(_upstream))
+        try:
+            return await asyncio.gather(*(
+                workflow.arun(input_type="image", raw_input=f"https://img.test/{width}.png", image_bytes=images[width])
+                for width in widths
+            ))
+        finally:
+            await workflow.tool.aclose()
+
+    checked_before = ocr_engine.gate_stats["images_checked"]
+    first = asyncio.run(verify_all())
+    cache = workflow.tool.ocr_cache.memory
+    assert (cache.hits, cache.misses) == (0, CONCURRENT_VERIFICATIONS)
+    assert ocr_engine.gate_stats["images_checked"] - checked_before == CONCURRENT_VERIFICATIONS
+
+    second = asyncio.run(verify_all())
+    assert (cache.hits, cache.misses) == (CONCURRENT_VERIFICATIONS, CONCURRENT_VERIFICATIONS)
+    # Every second-round image was served from the cache, not the pool
+    assert ocr_engine.gate_stats["images_checked"] - checked_before == CONCURRENT_VERIFICATIONS
+
+    for results, ocr_tool in ((first, "ocr"), (second, "ocr_cache")):
+        for width, result in zip(widths, results):
+            assert result.raw_input == f"https://img.test/{width}.png"
+            assert result.img_check.extracted_text == f"claim {width}"
+            assert result.text_check.claim == f"claim {width}"
+            assert result.reasoned_summary == f"Summary of claim {width}"
+            assert ocr_tool in result.tools_used
@@ -0,0 +1,47 @@
+"""Speculative evidence: losing sources are cancelled and awaited, and every source's time is recorded."""
+import asyncio
+
+from ai_agent.src.workflow import Workflow
+from ai_agent.src.models import TextCheck
+
+
+def test_losers_are_cancelled_before_the_node_returns_and_all_branches_are_timed():
+    workflow = Workflow()
+    cleaned_up = []
+
+    async def confident(state):
+        await asyncio.sleep(0.01)
+        return {
+            "text_check": TextCheck(claim=state.raw_input, verified_status="true", confidence_score=0.9),
+            "result_from": "fact_check_api",
+            "tools_used": state.tools_used + ["fact_check_api"],
+        }
+
+    async def slow(state):
+        try:
+            await asyncio.sleep(30)
+        finally:
+            cleaned_up.append("twitter_node")
+
+    async def also_slow(state):
+        try:
+            await asyncio.sleep(30)
+        finally:
+            cleaned_up.append("google_news_node")
+
+    workflow._fact_check_node = confident
+    workflow._twitter_node = slow
+    workflow._google_news_node = also_slow
+
+    state = workflow._initial_state("text", "The city council approved a new budget", evidence_mode="speculative")
+
+    async def run():
+        update = await workflow._evidence_fanout_node(state)
+        # Checked before asyncio.run would cancel and finish any task left pending
+        return update, sorted(cleaned_up)
+    update, cleaned_up_on_return = asyncio.run(run())
+
+    assert update["result_from"] == "fact_check_api"
+    assert cleaned_up_on_return == ["google_news_node", "twitter_node"]
+    assert set(update["timings"]) >= {"fact_check_node", "twitter_node", "google_news_node"}
+    assert update["timings"]["twitter_node"] < 5
@@ -0,0 +1,76 @@
+"""fetch_image refuses URLs that reach non-public addresses, on the first hop or after a redirect."""
+import asyncio
+import httpx
+import pytest
+
+from ai_agent.src.tools import VerificationService
+
+PUBLIC = "http://93.184.216.34"
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+def fetch(url: str, handler, max_bytes: int = None):
+    """(downloaded bytes or None, URLs the transport was asked for)."""
+    requested = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        return handler(request)
+
+    async def run():
+        service = VerificationService()
+        if max_bytes is not None:
+            service.MAX_IMAGE_DOWNLOAD_BYTES = max_bytes
+        service._http_clients[asyncio.get_running_loop()] = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        try:
+            return await service.fetch_image(url)
+        finally:
+            await service.aclose()
+
+    return asyncio.run(run()), requested
+
+
+def image(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, headers={"content-type": "image/png"}, content=PNG)
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/a.png",
+    "http://localhost:8000/a.png",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://10.0.0.7/a.png",
+    "http://[::1]/a.png",
+    "http://[::ffff:192.168.1.1]/a.png",
+    "file:///etc/passwd",
+])
+def test_non_public_urls_are_never_requested(url):
+    content, requested = fetch(url, image)
+    assert content is None
+    assert requested == []
+
+
+def test_redirect_to_a_private_address_is_refused():
+    def redirect(request):
+        if request.url.host == "93.184.216.34":
+            return httpx.Response(302, headers={"location": "http://169.254.169.254/latest/meta-data/"})
+        return image(request)
+
+    content, requested = fetch(f"{PUBLIC}/a.png", redirect)
+    assert content is None
+    assert requested == [f"{PUBLIC}/a.png"]
+
+
+def test_public_redirects_are_followed():
+    def redirect(request):
+        if request.url.path == "/a.png":
+            return httpx.Response(301, headers={"location": "/b.png"})
+        return image(request)
+
+    content, requested = fetch(f"{PUBLIC}/a.png", redirect)
+    assert content == PNG
+    assert requested == [f"{PUBLIC}/a.png", f"{PUBLIC}/b.png"]
+
+
+def test_oversized_images_are_refused():
+    content, _ = fetch(f"{PUBLIC}/a.png", image, max_bytes=16)
+    assert content is None
@@ -0,0 +1,29 @@
+"""Index snapshots are written in the background after a batch of puts, not once per put."""
+import os
+import time
+
+from ai_agent.src.image_hash_index import ImageHashIndex
+
+RESULTS = [{"title": "Original post", "link": "https://news.test/a"}]
+
+
+def test_puts_are_snapshotted_together_after_the_save_interval(tmp_path):
+    index = ImageHashIndex(directory=str(tmp_path), save_seconds=0.2)
+    for i in range(5):
+        index.put((i, i), RESULTS)
+    snapshot = os.path.join(str(tmp_path), "index.npz")
+    assert not os.path.exists(snapshot)
+
+    deadline = time.monotonic() + 5
+    while not os.path.exists(snapshot) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(ImageHashIndex(directory=str(tmp_path))) == 5
+
+
+def test_flush_writes_pending_entries_at_once(tmp_path):
+    index = ImageHashIndex(directory=str(tmp_path), save_seconds=3600)
+    index.put((1, 1), RESULTS)
+    index.flush()
+
+    reloaded = ImageHashIndex(directory=str(tmp_path))
+    assert reloaded.get((1, 1)) == RESULTS
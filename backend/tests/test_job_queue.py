@@ -0,0 +1,40 @@
+"""Queue wait is measured to a job's first claim, so a retry does not count its earlier attempts as waiting."""
+import asyncio
+from datetime import datetime, timedelta
+
+from app.utils.job_queue import JobQueue, DONE
+
+
+class RecordingCollection:
+    def __init__(self):
+        self.updates = []
+
+    async def update_one(self, query, update):
+        self.updates.append(update)
+
+
+def finish(monkeypatch, job: dict) -> dict:
+    collection = RecordingCollection()
+    queue = JobQueue()
+    monkeypatch.setattr(queue, "_collection", lambda: collection)
+    asyncio.run(queue.complete(job, "worker-a", {"verdict": "true"}))
+    assert collection.updates[0]["$set"]["status"] == DONE
+    return collection.updates[0]["$set"]
+
+
+def test_retried_job_waits_only_until_its_first_claim(monkeypatch):
+    created_at = datetime.utcnow() - timedelta(seconds=600)
+    fields = finish(monkeypatch, {
+        "_id": "job-1",
+        "created_at": created_at,
+        "first_started_at": created_at + timedelta(seconds=5),
+        "started_at": created_at + timedelta(seconds=300)
+    })
+    assert fields["wait_seconds"] == 5
+    assert 299 <= fields["run_seconds"] <= 301
+
+
+def test_jobs_claimed_before_first_started_at_fall_back_to_started_at(monkeypatch):
+    created_at = datetime.utcnow() - timedelta(seconds=60)
+    fields = finish(monkeypatch, {"_id": "job-1", "created_at": created_at, "started_at": created_at + timedelta(seconds=5)})
+    assert fields["wait_seconds"] == 5
@@ -0,0 +1,23 @@
+"""Cache hits and misses are exported as Prometheus counters."""
+from ai_agent.src.cache import LRUCache
+from ai_agent.src.metrics import registry
+
+
+def _samples(name: str) -> dict:
+    lines = registry.render().splitlines()
+    return {line.split(" ")[0]: float(line.split(" ")[1]) for line in lines if line.startswith(name + "{")}
+
+
+def test_cache_lookups_render_as_counters():
+    cache = LRUCache(max_bytes=1024)
+    registry.register_cache("test_metrics", cache)
+    cache.put("a", b"1", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    rendered = registry.render()
+    assert "# TYPE verihub_cache_hits_total counter" in rendered
+    assert "# TYPE verihub_cache_misses_total counter" in rendered
+    assert _samples("verihub_cache_hits_total")['verihub_cache_hits_total{cache="test_metrics"}'] == 2
+    assert _samples("verihub_cache_misses_total")['verihub_cache_misses_total{cache="test_metrics"}'] == 1
@@ -0,0 +1,73 @@
+"""Batched OCR goes through the same text-detection gate as single images and tells failures from text-free images."""
+import asyncio
+import numpy as np
+import pytest
+
+from ai_agent.src.tools import VerificationService
+from ai_agent.src.ocr_engine import OCREngine
+from ai_agent.src.ocr_cache import OCRCache
+
+
+class InkReader:
+    """Stands in for easyocr.Reader: an image has text where it has dark pixels."""
+
+    def __init__(self, languages: list):
+        self.languages = languages
+
+    def detect(self, imgs, text_threshold=None, reformat=True):
+        horizontal = [[[0, 1, 0, 1]] if img.min() < 128 else [] for img in imgs]
+        return horizontal, [[] for _ in imgs]
+
+    def recognize(self, img_cv_grey, horizontal_list, free_list):
+        return [(horizontal_list[0], f"ink at {int(np.argmin(img_cv_grey))}", 0.99)]
+
+
+class BrokenReader(InkReader):
+    def detect(self, imgs, text_threshold=None, reformat=True):
+        raise RuntimeError("detector crashed")
+
+
+def _engine(reader_factory) -> OCREngine:
+    engine = OCREngine(workers=1, torch_threads=1, reader_factory=reader_factory)
+    engine.start()
+    return engine
+
+
+@pytest.fixture
+def service():
+    service = VerificationService()
+    service.ocr_cache = OCRCache(max_bytes=1024 * 1024)
+    yield service
+    service.ocr_engine.shutdown()
+
+
+def _blank(width: int) -> np.ndarray:
+    return np.full((32, width), 255, dtype=np.uint8)
+
+
+def _inked(width: int, at: int) -> np.ndarray:
+    image = _blank(width)
+    image[0, at] = 0
+    return image
+
+
+def test_batched_ocr_skips_recognition_on_text_free_images(service):
+    service.ocr_engine = _engine(InkReader)
+    texts = asyncio.run(service.run_ocr_batch([_inked(40, 5), _blank(48), None]))
+
+    assert texts == ["ink at 5", "", None]
+    assert service.ocr_engine.gate_stats == {"images_checked": 2, "images_without_text": 1, "images_failed": 0}
+    # Text-free images are cached as "" like any other result, so neither is checked again
+    assert asyncio.run(service.run_ocr_batch([_inked(40, 5), _blank(48)])) == ["ink at 5", ""]
+    assert service.ocr_engine.gate_stats["images_checked"] == 2
+
+
+def test_batched_ocr_failures_are_not_reported_as_no_text(service):
+    service.ocr_engine = _engine(BrokenReader)
+    texts = asyncio.run(service.run_ocr_batch([_inked(40, 5), _blank(48)]))
+
+    assert texts == [None, None]
+    assert service.ocr_engine.gate_stats == {"images_checked": 0, "images_without_text": 0, "images_failed": 2}
+    # Failures are not cached, so the next pass tries again
+    assert asyncio.run(service.run_ocr_batch([_blank(48)])) == [None]
+    assert service.ocr_engine.gate_stats["images_failed"] == 3
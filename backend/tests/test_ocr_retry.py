@@ -0,0 +1,86 @@
+"""The second OCR pass reads a different image than the first, failed OCR is not retried, and text-free results are cached."""
+import io
+import asyncio
+import numpy as np
+import pytest
+from PIL import Image
+from langchain_core.messages import AIMessage
+
+from ai_agent.src.workflow import Workflow
+from ai_agent.src.ocr_engine import OCREngine
+from ai_agent.src.ocr_cache import OCRCache
+
+WIDTH = 120
+
+
+class SmallTextReader:
+    """Stands in for easyocr.Reader: always finds a text region, but only reads images twice the upload's width."""
+
+    def __init__(self, languages: list):
+        self.languages = languages
+
+    def _text(self, image) -> str:
+        return "claim" if image.shape[1] >= 2 * WIDTH else ""
+
+    def detect(self, img, text_threshold=None):
+        if img.max() == img.min():
+            return [[]], [[]]
+        return [[[0, 1, 0, 1]]], [[]]
+
+    def recognize(self, img_cv_grey, horizontal_list, free_list):
+        return [(horizontal_list[0], self._text(img_cv_grey), 0.5)]
+
+    def readtext(self, image):
+        return [(None, self._text(image), 0.5)]
+
+
+class EchoModel:
+    async def ainvoke(self, messages):
+        return AIMessage(content="claim")
+
+
+def _image(blank: bool = False) -> bytes:
+    pixels = np.random.default_rng(0).integers(0, 256, (32, WIDTH), dtype=np.uint8)
+    if blank:
+        pixels[:] = 255
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def workflow():
+    workflow = Workflow()
+    workflow.ocr_llm = EchoModel()
+    workflow.tool.ocr_cache = OCRCache(max_bytes=1024 * 1024)
+    workflow.tool.ocr_engine = OCREngine(workers=1, torch_threads=1, reader_factory=SmallTextReader)
+    yield workflow
+    workflow.tool.ocr_engine.shutdown()
+
+
+def _claim_branch(workflow: Workflow, image_bytes) -> tuple:
+    state = workflow._initial_state("image", "https://img.test/a.png")
+    return asyncio.run(workflow._image_claim_branch(state, image_bytes, {}))
+
+
+def test_unread_text_is_retried_on_an_upscaled_copy(workflow):
+    extracted_text, _, tools_used = _claim_branch(workflow, _image())
+    assert extracted_text == "claim"
+    assert tools_used == ["ocr", "2nd_ocr"]
+
+
+def test_failed_ocr_is_reported_and_not_retried(workflow):
+    extracted_text, _, tools_used = _claim_branch(workflow, b"not an image")
+    assert extracted_text == ""
+    assert tools_used == ["ocr", "ocr_failed"]
+
+
+def test_text_free_image_is_served_from_cache_next_time(workflow):
+    assert _claim_branch(workflow, _image(blank=True))[2] == ["ocr", "text_gate"]
+    assert _claim_branch(workflow, _image(blank=True))[2] == ["ocr_cache"]
+
+
+def test_unread_text_caches_the_retry_result(workflow):
+    _claim_branch(workflow, _image())
+    extracted_text, _, tools_used = _claim_branch(workflow, _image())
+    assert (extracted_text, tools_used) == ("claim", ["ocr_cache"])
@@ -0,0 +1,33 @@
+"""The disk tier of the scrape cache stays bounded by age and size."""
+import os
+import time
+import asyncio
+
+from ai_agent.src.scrape_cache import DiskScrapeStore
+
+
+def stored_keys(store: DiskScrapeStore) -> set:
+    return {os.path.basename(path)[:-len(".bin")] for path, _ in store.disk.entries()}
+
+
+def test_purged_entries_are_swept_at_startup(tmp_path):
+    store = DiskScrapeStore(str(tmp_path), stale_seconds=60)
+    now = time.time()
+    asyncio.run(store.put("aa-purged", b"x" * 10, expires_at=now - 120))
+    asyncio.run(store.put("bb-stale", b"x" * 10, expires_at=now - 30))
+    asyncio.run(store.put("cc-fresh", b"x" * 10, expires_at=now + 30))
+
+    assert stored_keys(DiskScrapeStore(str(tmp_path), stale_seconds=60)) == {"bb-stale", "cc-fresh"}
+
+
+def test_writes_past_the_size_cap_evict_the_soonest_to_purge(tmp_path):
+    store = DiskScrapeStore(str(tmp_path), max_bytes=1000, stale_seconds=0)
+    now = time.time()
+    for i in range(12):
+        asyncio.run(store.put(f"{i:02d}-page", b"x" * 100, expires_at=now + 60 + i))
+
+    kept = stored_keys(store)
+    assert sum(os.path.getsize(path) for path, _ in store.disk.entries()) <= 1000
+    # The latest-expiring pages survive
+    assert {"11-page", "10-page"} <= kept
+    assert "00-page" not in kept
@@ -0,0 +1,65 @@
+"""The LLM-written query fallback only runs when the built query found nothing, not when the search was refused."""
+import asyncio
+import pytest
+from langchain_core.messages import AIMessage
+
+from ai_agent.src import workflow as workflow_module
+from ai_agent.src.workflow import Workflow
+from ai_agent.src.llm_cache import LLMCache
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return AIMessage(content="llm query")
+
+
+@pytest.fixture
+def workflow(monkeypatch):
+    monkeypatch.setattr(workflow_module, "build_x_query", lambda claim: ("built query", 1.0))
+    monkeypatch.setattr(workflow_module, "build_news_query", lambda claim: ("built query", 1.0))
+    workflow = Workflow()
+    workflow.llm = CountingModel()
+    workflow.llm_cache = LLMCache(directory="")
+    return workflow
+
+
+def run_node(workflow, node: str, first_result, admits: bool = True) -> list:
+    """Queries the node searched with, the first search answering first_result and later ones nothing."""
+    queries = []
+
+    async def search(query):
+        queries.append(query)
+        return first_result if len(queries) == 1 else []
+    workflow.tool.search_tweets = workflow.tool.search_google_news = search
+    workflow.tool.upstream_admits = lambda name, key=None: admits
+
+    state = workflow._initial_state("text", "The city council approved a new budget")
+    asyncio.run(getattr(workflow, node)(state))
+    return queries
+
+
+@pytest.mark.parametrize("node", ["_twitter_node", "_google_news_node"])
+def test_empty_results_fall_back_to_a_second_query(workflow, node):
+    queries = run_node(workflow, node, [])
+    assert len(queries) == 2
+
+
+@pytest.mark.parametrize("node", ["_twitter_node", "_google_news_node"])
+def test_refused_or_failed_searches_are_not_retried(workflow, node):
+    assert run_node(workflow, node, None) == ["built query"]
+    assert workflow.llm.calls == 0
+
+
+@pytest.mark.parametrize("node", ["_twitter_node", "_google_news_node"])
+def test_no_fallback_while_the_upstream_would_refuse_it(workflow, node):
+    assert run_node(workflow, node, [], admits=False) == ["built query"]
+    assert workflow.llm.calls == 0
+
+
+def test_twitter_fallback_spends_one_llm_call(workflow):
+    assert run_node(workflow, "_twitter_node", []) == ["built query", "llm query"]
+    assert workflow.llm.calls == 1
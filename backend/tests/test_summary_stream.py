@@ -0,0 +1,38 @@
+"""A summary stream that fails part way keeps the text already streamed as the final summary."""
+import asyncio
+from langchain_core.messages import AIMessageChunk
+
+from ai_agent.src import workflow as workflow_module
+from ai_agent.src.workflow import Workflow
+from ai_agent.src.llm_cache import LLMCache
+
+
+class BreakingModel:
+    def __init__(self, chunks: list):
+        self.chunks = chunks
+
+    async def astream(self, messages):
+        for chunk in self.chunks:
+            yield AIMessageChunk(content=chunk)
+        raise ConnectionError("stream dropped")
+
+
+def summarize(monkeypatch, chunks: list) -> tuple:
+    deltas = []
+    monkeypatch.setattr(workflow_module, "get_stream_writer", lambda: lambda event: deltas.append(event["summary_delta"]))
+    workflow = Workflow()
+    workflow.llm = BreakingModel(chunks)
+    workflow.llm_cache = LLMCache(directory="")
+    state = workflow._initial_state("text", "The city council approved a new budget")
+    return asyncio.run(workflow._summary_node(state)), deltas
+
+
+def test_partial_summary_matches_the_streamed_deltas(monkeypatch):
+    update, deltas = summarize(monkeypatch, ["The claim ", "is supported"])
+    assert update["reasoned_summary"] == "".join(deltas) == "The claim is supported"
+
+
+def test_summary_without_any_delta_falls_back_to_the_error_text(monkeypatch):
+    update, deltas = summarize(monkeypatch, [])
+    assert deltas == []
+    assert update["reasoned_summary"] == "Could not generate summary due to processing error."
@@ -0,0 +1,25 @@
+"""Rate limits are totals for the deployment, split between the processes that each keep their own buckets."""
+from ai_agent.src.upstream import UpstreamGovernor
+
+
+def test_each_process_gets_an_equal_share_of_the_rate(monkeypatch):
+    monkeypatch.setenv("SERPAPI_RATE_PER_SECOND", "6")
+    monkeypatch.setenv("SERPAPI_BURST", "9")
+    bucket = UpstreamGovernor(processes=3)._bucket(("serpapi", "key"))
+    assert (bucket.rate, bucket.burst) == (2.0, 3)
+
+
+def test_process_count_defaults_to_web_plus_worker_processes(monkeypatch):
+    monkeypatch.delenv("UPSTREAM_PROCESSES", raising=False)
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+    monkeypatch.setenv("WORKER_PROCESSES", "3")
+    assert UpstreamGovernor().processes == 5
+    monkeypatch.setenv("UPSTREAM_PROCESSES", "4")
+    assert UpstreamGovernor().processes == 4
+
+
+def test_every_share_can_make_a_call(monkeypatch):
+    monkeypatch.setenv("X_API_BURST", "5")
+    bucket = UpstreamGovernor(processes=8)._bucket(("x_api", "key"))
+    assert bucket.burst == 1
+    assert bucket.reserve(max_wait=0) == 0
@@ -0,0 +1,64 @@
+"""Reworded claims reuse an earlier verdict as a starting point; negated or renumbered ones do not."""
+import time
+import asyncio
+import numpy as np
+import pytest
+
+from app.utils.verdict_cache import VerdictCache
+from ai_agent.src.claim_index import ClaimIndex
+from ai_agent.src.models import VerificationSummary, TextCheck
+
+CLAIM = "The Prime Minister announced a new tax on sugary drinks starting next year"
+
+
+@pytest.fixture
+def cache():
+    # No MongoDB connection: the in-process tier and index only
+    cache = VerdictCache()
+    verdict = VerificationSummary(
+        input_type="text", raw_input=CLAIM, result_from="google_news",
+        text_check=TextCheck(claim=CLAIM, verified_status="true", confidence_score=0.9)
+    )
+    asyncio.run(cache.put(cache.key_for_text(CLAIM), verdict, claim=CLAIM))
+    return cache
+
+
+@pytest.mark.parametrize("paraphrase", [
+    "The Prime Minister announces new taxes on sugary drinks starting next year",
+    "Prime Minister has announced a new sugary drinks tax starting next year",
+])
+def test_paraphrases_find_the_earlier_verdict(cache, paraphrase):
+    match = asyncio.run(cache.get_near_duplicate(paraphrase))
+    assert match is not None
+    assert match.matched_claim == CLAIM
+
+
+@pytest.mark.parametrize("claim", [
+    "The Prime Minister did not announce a new tax on sugary drinks starting next year",
+    "The Prime Minister announced a new tax on sugary drinks starting in 2030",
+])
+def test_negated_or_renumbered_claims_miss(cache, claim):
+    assert asyncio.run(cache.get_near_duplicate(claim)) is None
+
+
+def test_index_drops_removed_and_expired_rows_instead_of_growing():
+    index = ClaimIndex(max_entries=1000)
+    signature = index.signature(CLAIM)
+    for i in range(5000):
+        index.add(f"key-{i % 10}", signature)
+    index.add("expired", signature, expires_at=time.time() - 1)
+
+    assert len(index) == 11
+    assert len(index._signatures) <= 64
+    assert "expired" not in [key for key, _ in index.query(signature, threshold=0.5, limit=20)]
+
+
+def test_index_keeps_the_latest_expiring_entries_beyond_max_entries():
+    index = ClaimIndex(max_entries=100)
+    now = time.time()
+    for i in range(1000):
+        index.add(f"key-{i}", index.signature(f"claim number {i}"), expires_at=now + 60 + i)
+
+    assert len(index._signatures) <= 256
+    live = [key for key in index._keys if key is not None]
+    assert "key-999" in live and "key-0" not in live
@@ -0,0 +1,67 @@
+"""A job whose lease can no longer be renewed is cancelled instead of running on next to its retry."""
+import asyncio
+import pytest
+
+from app import worker
+
+
+class FakeJobQueue:
+    lease_seconds = 0.3
+
+    def __init__(self, renewals: list):
+        # Outcome of each renew_lease call in turn: True, False, or an exception to raise
+        self.renewals = renewals
+        self.progress = []
+        self.finished = []
+
+    async def renew_lease(self, job_id, worker_id):
+        outcome = self.renewals.pop(0) if self.renewals else True
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def append_progress(self, job_id, worker_id, event):
+        self.progress.append(event)
+
+    async def complete(self, job, worker_id, result):
+        self.finished.append(("done", result))
+
+    async def fail(self, job, worker_id, error):
+        self.finished.append(("failed", error))
+
+
+JOB = {"_id": "job-1", "input_type": "text", "raw_input": "claim", "evidence_mode": "sequential"}
+
+
+def run(monkeypatch, renewals: list, steps: int) -> FakeJobQueue:
+    queue = FakeJobQueue(renewals)
+    monkeypatch.setattr(worker, "job_queue", queue)
+
+    async def verification_events(*args, **kwargs):
+        for step in range(steps):
+            await asyncio.sleep(0.05)
+            yield {"type": "step_start", "step": step}
+        yield {"type": "complete", "result": {"verdict": "true"}}
+    monkeypatch.setattr(worker, "verification_events", verification_events)
+
+    asyncio.run(worker.run_job(JOB, "worker-a"))
+    return queue
+
+
+def test_job_is_cancelled_when_another_worker_holds_the_lease(monkeypatch):
+    queue = run(monkeypatch, [False], steps=20)
+    assert queue.finished == []
+    assert len(queue.progress) < 20
+
+
+def test_job_is_cancelled_when_the_lease_expires_unrenewed(monkeypatch):
+    queue = run(monkeypatch, [ConnectionError("mongo down")] * 3, steps=20)
+    assert queue.finished == []
+    assert len(queue.progress) < 20
+
+
+@pytest.mark.parametrize("renewals", [[], [ConnectionError("blip"), True, True, True, True, True]])
+def test_job_survives_renewals_and_transient_failures(monkeypatch, renewals):
+    queue = run(monkeypatch, renewals, steps=8)
+    assert queue.finished == [("done", {"verdict": "true"})]
+    assert len(queue.progress) == 9
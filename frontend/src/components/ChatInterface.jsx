@@ -173,13 +173,17 @@ const ChatInterface = () => {
       const reader = response.body.getReader();
       const decoder = new TextDecoder();
       let accumulatedContent = '';
+      let summaryContent = '';
+      let buffer = '';
 
       while (true) {
         const { value, done } = await reader.read();
         if (done) break;
 
-        const chunk = decoder.decode(value, { stream: true });
-        const lines = chunk.split('\n');
+        // Summary tokens arrive as many small events; keep partial lines for the next read
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
 
         for (const line of lines) {
           if (line.startsWith('data: ')) {
@@ -225,6 +229,16 @@ const ChatInterface = () => {
                   )
                 );
                 
+              } else if (parsed.type === 'summary_delta') {
+                summaryContent += parsed.content;
+                setConversation((prev) =>
+                  prev.map((msg) =>
+                    msg.id === assistantMessageId
+                      ? { ...msg, content: accumulatedContent + `\nVerification Summary: ${summaryContent}` }
+                      : msg
+                  )
+                );
+
               } else if (parsed.type === 'step_complete') {
                 setCurrentStatus(parsed.content);
                 setCurrentProgress(parsed.progress || 0);
@@ -140,13 +140,17 @@ const Verification = () => {
       const decoder = new TextDecoder();
       let accumulatedContent = '';
       let finalResult = null;
+      let summaryContent = '';
+      let buffer = '';
 
       while (true) {
         const { value, done } = await reader.read();
         if (done) break;
 
-        const chunk = decoder.decode(value, { stream: true });
-        const lines = chunk.split('\n');
+        // Summary tokens arrive as many small events; keep partial lines for the next read
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
 
         for (const line of lines) {
           if (line.startsWith('data: ')) {
@@ -199,6 +203,10 @@ const Verification = () => {
                   )
                 );
                 
+              } else if (parsed.type === 'summary_delta') {
+                summaryContent += parsed.content;
+                setStreamingResult(accumulatedContent + `\nVerification Summary: ${summaryContent}`);
+
               } else if (parsed.type === 'step_complete') {
                 setCurrentStatus(parsed.content);
                 setCurrentProgress(parsed.progress || 0);